@@ -201,4 +201,42 @@ MATHESAR_MANIFEST_LOCATION = os.path.join(MATHESAR_UI_BUILD_LOCATION, 'manifest.
 MATHESAR_CLIENT_DEV_URL = 'http://localhost:3000'
 MATHESAR_CAPTURE_UNHANDLED_EXCEPTION = decouple_config('CAPTURE_UNHANDLED_EXCEPTION', default=True)
 
+# When enabled, database objects are only reflected by the reflect_db_objects
+# management command, and not while serving requests.
+MATHESAR_BACKGROUND_REFLECTION = decouple_config('BACKGROUND_REFLECTION', default=False, cast=bool)
+
+# Connection pool settings for the engines used to access user databases
+MATHESAR_ENGINE_POOL_SIZE = decouple_config('ENGINE_POOL_SIZE', default=5, cast=int)
+MATHESAR_ENGINE_MAX_OVERFLOW = decouple_config('ENGINE_MAX_OVERFLOW', default=10, cast=int)
+MATHESAR_ENGINE_POOL_RECYCLE = decouple_config('ENGINE_POOL_RECYCLE', default=1800, cast=int)
+MATHESAR_ENGINE_POOL_PRE_PING = decouple_config('ENGINE_POOL_PRE_PING', default=True, cast=bool)
+
+# Number of threads of each process running import jobs in the background. With
+# 0, import jobs are run within the request creating them.
+MATHESAR_IMPORT_WORKERS = decouple_config('IMPORT_WORKERS', default=2, cast=int)
+
+# Results of records queries are kept in their own cache, which defaults to a
+# per-process local memory cache limited by the total size of its values. Set
+# RECORDS_CACHE_BACKEND and RECORDS_CACHE_LOCATION to share it between
+# processes instead, e.g. with Memcached. Either way, changes to records made
+# by one process invalidate the results cached by the others, as the version
+# of each table's records is kept in the database.
+MATHESAR_RECORDS_CACHE_BACKEND = decouple_config(
+    'RECORDS_CACHE_BACKEND', default='mathesar.utils.cache.ByteBudgetLocMemCache'
+)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'records': {
+        'BACKEND': MATHESAR_RECORDS_CACHE_BACKEND,
+        'LOCATION': decouple_config('RECORDS_CACHE_LOCATION', default='mathesar_records'),
+        'TIMEOUT': decouple_config('RECORDS_CACHE_TIMEOUT', default=300, cast=int),
+    },
+}
+if MATHESAR_RECORDS_CACHE_BACKEND == 'mathesar.utils.cache.ByteBudgetLocMemCache':
+    CACHES['records']['OPTIONS'] = {
+        'MAX_BYTES': decouple_config('RECORDS_CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int),
+    }
+
 STATICFILES_DIRS = [MATHESAR_UI_BUILD_LOCATION]
@@ -0,0 +1,28 @@
+import warnings
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import MetaData, Table
+
+# System catalog tables reflected so far, kept per engine. Reflecting a table
+# takes several catalog queries of its own, so we only do it once.
+_catalog_metadata = WeakKeyDictionary()
+_catalog_lock = Lock()
+
+
+def get_catalog_table(name, engine):
+    """
+    Returns the pg_catalog table with the given name (e.g. "pg_class"),
+    reflecting it on first use with the engine.
+    """
+    key = f"pg_catalog.{name}"
+    metadata = _catalog_metadata.get(engine)
+    if metadata is not None and key in metadata.tables:
+        return metadata.tables[key]
+    with _catalog_lock:
+        metadata = _catalog_metadata.setdefault(engine, MetaData())
+        if key not in metadata.tables:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="Did not recognize type")
+                Table(name, metadata, schema="pg_catalog", autoload_with=engine)
+        return metadata.tables[key]
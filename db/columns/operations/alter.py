@@ -10,7 +10,9 @@ from db.columns.operations.select import (
     get_column_attnum_from_name, get_column_default, get_column_name_from_attnum,
 )
 from db.columns.utils import get_mathesar_column_with_engine, get_type_options
-from db.tables.operations.select import get_oid_from_table, reflect_table_from_oid
+from db.tables.operations.select import (
+    get_oid_from_table, invalidate_reflected_table, reflect_table_from_oid,
+)
 from db.types.base import get_db_type_name
 from db.types.operations.cast import get_supported_alter_column_types, get_cast_function_name
 from db.utils import execute_statement
@@ -92,6 +94,7 @@ def alter_column_type(
     """
 
     execute_statement(engine, DDL(alter_stmt), connection)
+    invalidate_reflected_table(table_oid, engine)
 
     if default is not None:
         cast_stmt = f"{cast_function_name}({default_text})"
@@ -144,6 +147,7 @@ def change_column_nullable(table_oid, column_attum, engine, connection, nullable
     ctx = MigrationContext.configure(connection)
     op = Operations(ctx)
     op.alter_column(table.name, column.name, nullable=nullable, schema=table.schema)
+    invalidate_reflected_table(table_oid, engine)
 
 
 def set_column_default(table_oid, column_attnum, engine, connection, default):
@@ -155,6 +159,7 @@ def set_column_default(table_oid, column_attnum, engine, connection, default):
         ctx = MigrationContext.configure(connection)
         op = Operations(ctx)
         op.alter_column(table.name, column.name, schema=table.schema, server_default=default_clause)
+        invalidate_reflected_table(table_oid, engine)
     except DataError as e:
         if (type(e.orig) == InvalidTextRepresentation):
             raise InvalidDefaultError
@@ -169,6 +174,7 @@ def rename_column(table_oid, column_attnum, engine, connection, new_name):
     ctx = MigrationContext.configure(connection)
     op = Operations(ctx)
     op.alter_column(table.name, column.name, new_column_name=new_name, schema=table.schema)
+    invalidate_reflected_table(table_oid, engine)
 
 
 def _check_type_option_equivalence(type_options_1, type_options_2):
@@ -233,3 +239,4 @@ def batch_update_columns(table_oid, engine, column_data_list):
         _batch_update_column_types(table_oid, column_data_list, conn, engine)
         _batch_alter_table_rename_columns(table, column_data_list, conn)
         _batch_alter_table_drop_columns(table, column_data_list, conn)
+        invalidate_reflected_table(table_oid, engine)
@@ -16,7 +16,7 @@ from db.columns.utils import get_mathesar_column_with_engine
 from db.constraints.operations.create import copy_constraint
 from db.constraints.operations.select import get_column_constraints
 from db.constraints import utils as constraint_utils
-from db.tables.operations.select import reflect_table_from_oid
+from db.tables.operations.select import invalidate_reflected_table, reflect_table_from_oid
 from db.types.operations.cast import get_supported_alter_column_types
 from db import constants
 
@@ -58,6 +58,7 @@ def create_column(engine, table_oid, column_data):
             ctx = MigrationContext.configure(conn)
             op = Operations(ctx)
             op.add_column(table.name, column, schema=table.schema)
+        invalidate_reflected_table(table_oid, engine)
     except DataError as e:
         if type(e.orig) == InvalidTextRepresentation:
             raise InvalidDefaultError
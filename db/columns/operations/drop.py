@@ -2,7 +2,7 @@ from alembic.migration import MigrationContext
 from alembic.operations import Operations
 
 from db.columns.operations.select import get_column_name_from_attnum
-from db.tables.operations.select import reflect_table_from_oid
+from db.tables.operations.select import invalidate_reflected_table, reflect_table_from_oid
 
 
 def drop_column(table_oid, column_attnum, engine):
@@ -13,3 +13,4 @@ def drop_column(table_oid, column_attnum, engine):
         ctx = MigrationContext.configure(conn)
         op = Operations(ctx)
         op.drop_column(table.name, column.name, schema=table.schema)
+        invalidate_reflected_table(table_oid, engine)
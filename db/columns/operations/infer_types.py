@@ -1,4 +1,6 @@
+import itertools
 import logging
+import re
 
 from sqlalchemy import VARCHAR, TEXT, Text
 from sqlalchemy.exc import DatabaseError
@@ -13,6 +15,8 @@ from db.types import base
 logger = logging.getLogger(__name__)
 
 MAX_INFERENCE_DAG_DEPTH = 100
+# Number of rows classified at a time when inferring types from text values.
+INFERENCE_BATCH_SIZE = 10000
 
 TYPE_INFERENCE_DAG = {
     base.PostgresType.BOOLEAN.value: [],
@@ -39,6 +43,67 @@ TYPE_INFERENCE_DAG = {
 }
 
 
+# Checks of whether a text value can be copied into a column of each type as
+# it is.  Values are only accepted if Postgres reads them the same way as
+# Mathesar's cast from text does, so only types which can be checked that way
+# are inferred from text values.
+_BOOLEAN_VALUES = frozenset(['1', '0', 'on', 'off', 't', 'f', 'true', 'false', 'y', 'n', 'yes', 'no'])
+_NUMERIC_PATTERN = re.compile(r'[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?', re.ASCII)
+VALUE_TYPE_CHECKS = {
+    base.PostgresType.BOOLEAN.value: lambda value: value.lower() in _BOOLEAN_VALUES,
+    base.PostgresType.NUMERIC.value: lambda value: _NUMERIC_PATTERN.fullmatch(value) is not None,
+}
+
+
+def infer_column_types_from_rows(
+        rows, num_columns, batch_size=INFERENCE_BATCH_SIZE,
+        type_inference_dag=TYPE_INFERENCE_DAG, value_type_checks=VALUE_TYPE_CHECKS
+):
+    """
+    Infers the types of the columns of rows of text values in one pass, e.g.
+    while reading a CSV file, without a database.  Rows are classified a batch
+    at a time: each distinct value of a column in the batch is checked once
+    against the types the column may still have, and types which fail a check
+    are ruled out.  Empty values and None are NULL, which fits every type.
+    Reading stops once no column may have a type other than text.
+
+    Returns the type of each column, found by walking down the
+    type_inference_dag from text for as long as a child type is still
+    possible, like infer_column_type does with casts.
+    """
+    candidates = [set(value_type_checks) for _ in range(num_columns)]
+    rows = iter(rows)
+    while any(candidates):
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        for index, column_candidates in enumerate(candidates):
+            if not column_candidates:
+                continue
+            values = {row[index] for row in batch if index < len(row)}
+            values.difference_update(['', None])
+            for type_str in list(column_candidates):
+                check = value_type_checks[type_str]
+                if not all(check(value) for value in values):
+                    column_candidates.discard(type_str)
+    return [
+        _get_inferred_type(column_candidates, type_inference_dag)
+        for column_candidates in candidates
+    ]
+
+
+def _get_inferred_type(candidates, type_inference_dag):
+    type_str = base.PostgresType.TEXT.value
+    for _ in range(MAX_INFERENCE_DAG_DEPTH + 1):
+        next_type_str = next(
+            (child for child in type_inference_dag.get(type_str, []) if child in candidates), None
+        )
+        if next_type_str is None:
+            return type_str
+        type_str = next_type_str
+    raise DagCycleError("The type_inference_dag likely has a cycle")
+
+
 def _get_reverse_type_map(engine):
     supported_types = get_supported_alter_column_types(engine)
     reverse_type_map = {v: k for k, v in supported_types.items()}
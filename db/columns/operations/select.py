@@ -1,8 +1,9 @@
 import warnings
 
 from pglast import Node, parse_sql
-from sqlalchemy import MetaData, Table, and_, asc, cast, select, text
+from sqlalchemy import and_, asc, cast, select, text
 
+from db.catalog import get_catalog_table
 from db.columns.exceptions import DynamicDefaultWarning
 from db.tables.operations.select import reflect_table_from_oid
 from db.utils import execute_statement
@@ -18,9 +19,7 @@ DYNAMIC_NODE_TAGS = {"SQLValueFunction", "FuncCall"}
 
 
 def _get_columns_attnum_from_names(table_oid, column_names, engine, connection_to_use=None):
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_attribute = Table("pg_attribute", MetaData(), autoload_with=engine)
+    pg_attribute = get_catalog_table("pg_attribute", engine)
     sel = select(pg_attribute.c.attnum).where(
         and_(
             pg_attribute.c.attrelid == table_oid,
@@ -47,9 +46,7 @@ def get_column_attnum_from_name(table_oid, column_name, engine, connection_to_us
 
 
 def get_column_attnums_from_table(table_oid, engine, connection_to_use=None):
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_attribute = Table("pg_attribute", MetaData(), autoload_with=engine)
+    pg_attribute = get_catalog_table("pg_attribute", engine)
     sel = select(pg_attribute.c.attnum).where(
         and_(
             pg_attribute.c.attrelid == table_oid,
@@ -64,9 +61,7 @@ def get_column_attnums_from_table(table_oid, engine, connection_to_use=None):
 
 
 def _get_columns_name_from_attnums(table_oid, attnums, engine, connection_to_use=None):
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_attribute = Table("pg_attribute", MetaData(), autoload_with=engine)
+    pg_attribute = get_catalog_table("pg_attribute", engine)
     sel = select(pg_attribute.c.attname).where(
         and_(
             pg_attribute.c.attrelid == table_oid,
@@ -92,6 +87,53 @@ def get_column_name_from_attnum(table_oid, attnum, engine, connection_to_use=Non
     return execute_statement(engine, statement, connection_to_use).scalar()
 
 
+def get_column_names_by_attnum(table_oid, engine, connection_to_use=None):
+    """
+    Returns a dict mapping the attnum of each column of the table to its name,
+    using a single catalog query.
+    """
+    pg_attribute = get_catalog_table("pg_attribute", engine)
+    sel = select(pg_attribute.c.attnum, pg_attribute.c.attname).where(
+        and_(
+            pg_attribute.c.attrelid == table_oid,
+            # Ignore system columns
+            pg_attribute.c.attnum > 0,
+            # Ignore removed columns
+            pg_attribute.c.attisdropped.is_(False)
+        )
+    )
+    results = execute_statement(engine, sel, connection_to_use).fetchall()
+    return {attnum: name for attnum, name in results}
+
+
+def get_column_default_dicts(table_oid, engine, connection_to_use=None):
+    """
+    Returns a dict mapping the attnum of each column of the table to the
+    column's default dict (see get_column_default_dict).  Unlike calling
+    get_column_default_dict for each column, all the static defaults are
+    evaluated in a single query, and no warning is raised for dynamic ones.
+    """
+    table = reflect_table_from_oid(table_oid, engine, connection_to_use)
+    column_names = get_column_names_by_attnum(table_oid, engine, connection_to_use)
+    default_dicts = {}
+    static_default_exprs = {}
+    for attnum, column_name in column_names.items():
+        column = table.columns[column_name]
+        if column.server_default is None:
+            default_dicts[attnum] = None
+        elif _is_default_expr_dynamic(column.server_default):
+            default_dicts[attnum] = {"value": str(column.server_default.arg), "is_dynamic": True}
+        else:
+            static_default_exprs[attnum] = cast(text(str(column.server_default.arg)), column.type)
+    if static_default_exprs:
+        default_values = execute_statement(
+            engine, select(*static_default_exprs.values()), connection_to_use
+        ).first()
+        for attnum, default_value in zip(static_default_exprs, default_values):
+            default_dicts[attnum] = {"value": default_value, "is_dynamic": False}
+    return default_dicts
+
+
 def get_column_default_dict(table_oid, attnum, engine, connection_to_use=None):
     table = reflect_table_from_oid(table_oid, engine, connection_to_use)
     column_name = get_column_name_from_attnum(table_oid, attnum, engine, connection_to_use)
@@ -14,7 +14,8 @@ access hints on what composition of functions and parameters should be valid.
 
 from abc import ABC, abstractmethod
 
-from sqlalchemy import column, not_, and_, or_, func, literal
+from sqlalchemy import bindparam, column, not_, and_, or_, func, literal
+from sqlalchemy.sql.elements import BindParameter
 
 from db.functions import hints
 from db.functions.exceptions import BadDBFunctionFormat
@@ -24,6 +25,25 @@ def sa_call_sql_function(function_name, *parameters):
     return getattr(func, function_name)(*parameters)
 
 
+LIKE_ESCAPE_CHAR = '\\'
+
+
+def _get_like_pattern(prefix='', string=None, suffix=''):
+    """
+    Returns a LIKE pattern matching the given string with the given prefix
+    and suffix wildcards.  If the string is a literal, the pattern is built
+    here, with the string's wildcards escaped, so that Postgres sees a constant
+    pattern.  That lets the planner estimate the pattern's selectivity, and
+    turn a constant prefix into an index range scan where the index allows.
+    """
+    if isinstance(string, BindParameter) and isinstance(string.value, str):
+        escaped = string.value
+        for char in (LIKE_ESCAPE_CHAR, '%', '_'):
+            escaped = escaped.replace(char, LIKE_ESCAPE_CHAR + char)
+        return literal(prefix + escaped + suffix)
+    return func.concat(prefix, string, suffix)
+
+
 # NOTE: this class is abstract.
 class DBFunction(ABC):
     id = None
@@ -72,6 +92,23 @@ class DBFunction(ABC):
         return None
 
 
+class LiteralParameter:
+    """
+    Stands in for the primitive of a Literal whose value is only given when the query is executed,
+    so that the query can be reused for other values.  The type of the parameter is taken from the
+    given sample value.
+    """
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, LiteralParameter) and self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+
 class Literal(DBFunction):
     id = 'literal'
     name = 'as literal'
@@ -82,6 +119,8 @@ class Literal(DBFunction):
 
     @staticmethod
     def to_sa_expression(primitive):
+        if isinstance(primitive, LiteralParameter):
+            return bindparam(primitive.name, primitive.value)
         return literal(primitive)
 
 
@@ -159,6 +198,38 @@ class Equal(DBFunction):
         return value1 == value2
 
 
+class LesserOrEqual(DBFunction):
+    id = 'lesser_or_equal'
+    name = 'is lesser or equal to'
+    hints = tuple([
+        hints.returns(hints.boolean),
+        hints.parameter_count(2),
+        hints.all_parameters(hints.comparable),
+        hints.mathesar_filter,
+        hints.use_this_alias_when("is before or same as", hints.point_in_time),
+    ])
+
+    @staticmethod
+    def to_sa_expression(value1, value2):
+        return value1 <= value2
+
+
+class GreaterOrEqual(DBFunction):
+    id = 'greater_or_equal'
+    name = 'is greater or equal to'
+    hints = tuple([
+        hints.returns(hints.boolean),
+        hints.parameter_count(2),
+        hints.all_parameters(hints.comparable),
+        hints.mathesar_filter,
+        hints.use_this_alias_when("is before or same as", hints.point_in_time),
+    ])
+
+    @staticmethod
+    def to_sa_expression(value1, value2):
+        return value1 >= value2
+
+
 class Greater(DBFunction):
     id = 'greater'
     name = 'is greater than'
@@ -241,8 +312,8 @@ class StartsWith(DBFunction):
 
     @staticmethod
     def to_sa_expression(string, prefix):
-        pattern = func.concat(prefix, '%')
-        return string.like(pattern)
+        pattern = _get_like_pattern(string=prefix, suffix='%')
+        return string.like(pattern, escape=LIKE_ESCAPE_CHAR)
 
 
 class Contains(DBFunction):
@@ -256,8 +327,8 @@ class Contains(DBFunction):
 
     @staticmethod
     def to_sa_expression(string, sub_string):
-        pattern = func.concat('%', sub_string, '%')
-        return string.like(pattern)
+        pattern = _get_like_pattern(prefix='%', string=sub_string, suffix='%')
+        return string.like(pattern, escape=LIKE_ESCAPE_CHAR)
 
 
 class StartsWithCaseInsensitive(DBFunction):
@@ -272,8 +343,8 @@ class StartsWithCaseInsensitive(DBFunction):
 
     @staticmethod
     def to_sa_expression(string, prefix):
-        pattern = func.concat(prefix, '%')
-        return string.ilike(pattern)
+        pattern = _get_like_pattern(string=prefix, suffix='%')
+        return string.ilike(pattern, escape=LIKE_ESCAPE_CHAR)
 
 
 class ContainsCaseInsensitive(DBFunction):
@@ -288,8 +359,8 @@ class ContainsCaseInsensitive(DBFunction):
 
     @staticmethod
     def to_sa_expression(string, sub_string):
-        pattern = func.concat('%', sub_string, '%')
-        return string.ilike(pattern)
+        pattern = _get_like_pattern(prefix='%', string=sub_string, suffix='%')
+        return string.ilike(pattern, escape=LIKE_ESCAPE_CHAR)
 
 
 class ToLowercase(DBFunction):
@@ -2,6 +2,7 @@ from db.functions.base import DBFunction
 from db.functions.exceptions import ReferencedColumnsDontExist
 from db.functions.packed import DBFunctionPacked
 from db.functions.operations.deserialize import get_db_function_from_ma_function_spec
+from db.functions.operations.optimize import optimize_db_function
 
 
 def apply_db_function_spec_as_filter(relation, ma_function_spec):
@@ -11,6 +12,7 @@ def apply_db_function_spec_as_filter(relation, ma_function_spec):
 
 def apply_db_function_as_filter(relation, db_function):
     _assert_that_all_referenced_columns_exist(relation, db_function)
+    db_function = optimize_db_function(db_function)
     sa_expression = _db_function_to_sa_expression(db_function)
     relation = relation.filter(sa_expression)
     return relation
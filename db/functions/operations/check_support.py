@@ -1,7 +1,8 @@
 from enum import Enum
 
-from sqlalchemy import select, Table, MetaData
+from sqlalchemy import select
 
+from db.catalog import get_catalog_table
 from db.functions.known_db_functions import known_db_functions
 
 
@@ -20,13 +21,13 @@ def get_supported_db_functions(engine):
 
 # TODO consider caching
 def _get_functions_defined_on_database(engine):
-    metadata = MetaData()
-    pg_proc = Table('pg_proc', metadata, autoload_with=engine, schema='pg_catalog')
+    pg_proc = get_catalog_table('pg_proc', engine)
     select_statement = select(pg_proc.c.proname)
-    return tuple(
-        function_name
-        for function_name, in engine.connect().execute(select_statement)
-    )
+    with engine.connect() as conn:
+        return tuple(
+            function_name
+            for function_name, in conn.execute(select_statement)
+        )
 
 
 def _are_db_function_dependencies_satisfied(db_function, functions_on_database):
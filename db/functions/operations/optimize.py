@@ -0,0 +1,125 @@
+"""
+Rewrites DBFunction trees into equivalent trees that Postgres can plan better. The rewrites keep
+SQL's three-valued logic intact: each one gives the same result as the original expression for
+NULL inputs too.
+"""
+
+from db.functions.base import (
+    And, DBFunction, Empty, Equal, Greater, GreaterOrEqual, Lesser, LesserOrEqual, Literal, Not, Or, ToLowercase
+)
+from db.functions.packed import DBFunctionPacked
+
+
+# Maps a strict comparison to the comparison that also accepts equal values.
+_OR_EQUAL_COMPARISONS = {
+    Lesser: LesserOrEqual,
+    Greater: GreaterOrEqual,
+}
+
+
+def optimize_db_function(db_function_or_literal):
+    """
+    Returns an equivalent DBFunction tree, where packed DBFunctions are unpacked, nested And and
+    Or DBFunctions are flattened, duplicate operands are dropped, literal-only expressions are
+    folded, and `a < b OR a = b` becomes `a <= b` (and likewise for `>`). Postgres can use an
+    index for `a <= b`, but usually not for the OR.
+    """
+    if isinstance(db_function_or_literal, DBFunctionPacked):
+        return optimize_db_function(db_function_or_literal.unpack())
+    elif not isinstance(db_function_or_literal, DBFunction) or isinstance(db_function_or_literal, Literal):
+        return db_function_or_literal
+    db_function = db_function_or_literal
+    parameters = [optimize_db_function(parameter) for parameter in db_function.parameters]
+    db_function_subclass = type(db_function)
+    if db_function_subclass in (And, Or):
+        return _optimize_boolean_operation(db_function_subclass, parameters)
+    elif db_function_subclass is Not:
+        return _optimize_not(parameters)
+    elif db_function_subclass is Empty and _is_literal(parameters[0]):
+        return Literal([_get_literal_value(parameters[0]) is None])
+    elif db_function_subclass is ToLowercase and _is_ascii_string_literal(parameters[0]):
+        # Only ASCII strings are folded, since Python and Postgres may
+        # lowercase other characters differently.
+        return Literal([_get_literal_value(parameters[0]).lower()])
+    return db_function_subclass(parameters)
+
+
+def _optimize_boolean_operation(db_function_subclass, parameters):
+    # The value that decides the operation whatever the other operands are,
+    # and the value that doesn't change its result.
+    absorbing_value = db_function_subclass is Or
+    neutral_value = not absorbing_value
+    operands = []
+    for parameter in _flatten(db_function_subclass, parameters):
+        if _is_boolean_literal(parameter):
+            if _get_literal_value(parameter) == absorbing_value:
+                return Literal([absorbing_value])
+            continue
+        if parameter not in operands:
+            operands.append(parameter)
+    if db_function_subclass is Or:
+        operands = _collapse_or_equal_comparisons(operands)
+    if len(operands) == 0:
+        return Literal([neutral_value])
+    elif len(operands) == 1:
+        return operands[0]
+    return db_function_subclass(operands)
+
+
+def _flatten(db_function_subclass, parameters):
+    for parameter in parameters:
+        if type(parameter) is db_function_subclass:
+            yield from _flatten(db_function_subclass, parameter.parameters)
+        else:
+            yield parameter
+
+
+def _collapse_or_equal_comparisons(operands):
+    """
+    Replaces each pair of a strict comparison and an Equal of the same values in the operands
+    of an Or with the corresponding non-strict comparison.
+    """
+    collapsed = list(operands)
+    for operand in operands:
+        or_equal_subclass = _OR_EQUAL_COMPARISONS.get(type(operand))
+        if or_equal_subclass is None or operand not in collapsed:
+            continue
+        equal = Equal(operand.parameters)
+        swapped_equal = Equal(list(reversed(operand.parameters)))
+        for matching_equal in (equal, swapped_equal):
+            if matching_equal in collapsed:
+                collapsed.remove(matching_equal)
+                index = collapsed.index(operand)
+                collapsed[index] = or_equal_subclass(operand.parameters)
+                break
+    return collapsed
+
+
+def _optimize_not(parameters):
+    if len(parameters) == 1:
+        parameter = parameters[0]
+        if _is_boolean_literal(parameter):
+            return Literal([not _get_literal_value(parameter)])
+        if type(parameter) is Not and len(parameter.parameters) == 1:
+            return parameter.parameters[0]
+    return Not(parameters)
+
+
+def _is_literal(parameter):
+    return type(parameter) is Literal and len(parameter.parameters) == 1
+
+
+def _get_literal_value(parameter):
+    return parameter.parameters[0]
+
+
+def _is_boolean_literal(parameter):
+    return _is_literal(parameter) and isinstance(_get_literal_value(parameter), bool)
+
+
+def _is_ascii_string_literal(parameter):
+    return (
+        _is_literal(parameter)
+        and isinstance(_get_literal_value(parameter), str)
+        and _get_literal_value(parameter).isascii()
+    )
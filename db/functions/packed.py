@@ -1,14 +1,13 @@
 """
-Here we define DBFunction subclasses that are defined in terms of other DBFunction subclasses
-(these DBFunctions are packages or combinations of other DBFunctions). We do this to workaround
-Mathesar filters not supporting composition.
+Here we define the base class of DBFunction subclasses that are defined in terms of other DBFunction
+subclasses (these DBFunctions are packages or combinations of other DBFunctions). We do this to
+workaround Mathesar filters not supporting composition. Its concrete subclasses are defined next to
+the types they work on, e.g. in db/types/email.py.
 """
 
 from abc import abstractmethod
 
-from db.functions.base import DBFunction, Or, Lesser, Equal, Greater
-
-from db.functions import hints
+from db.functions.base import DBFunction
 
 
 class DBFunctionPacked(DBFunction):
@@ -28,43 +27,3 @@ class DBFunctionPacked(DBFunction):
         a DBFunction in terms of other DBFunctions.
         """
         pass
-
-
-class LesserOrEqual(DBFunctionPacked):
-    id = 'lesser_or_equal'
-    name = 'is lesser or equal to'
-    hints = tuple([
-        hints.returns(hints.boolean),
-        hints.parameter_count(2),
-        hints.all_parameters(hints.comparable),
-        hints.mathesar_filter,
-        hints.use_this_alias_when("is before or same as", hints.point_in_time),
-    ])
-
-    def unpack(self):
-        param0 = self.parameters[0]
-        param1 = self.parameters[1]
-        return Or([
-            Lesser([param0, param1]),
-            Equal([param0, param1]),
-        ])
-
-
-class GreaterOrEqual(DBFunctionPacked):
-    id = 'greater_or_equal'
-    name = 'is greater or equal to'
-    hints = tuple([
-        hints.returns(hints.boolean),
-        hints.parameter_count(2),
-        hints.all_parameters(hints.comparable),
-        hints.mathesar_filter,
-        hints.use_this_alias_when("is before or same as", hints.point_in_time),
-    ])
-
-    def unpack(self):
-        param0 = self.parameters[0]
-        param1 = self.parameters[1]
-        return Or([
-            Greater([param0, param1]),
-            Equal([param0, param1]),
-        ])
@@ -1,11 +1,13 @@
 from sqlalchemy import text
 
 from db import engine
+from db.tables import data_versions
 from db.types import install
 
 
 def create_mathesar_database(
         user_database, username, password, hostname, root_database, port,
+        track_data_versions=False,
 ):
     root_db_engine = engine.create_future_engine(
         username, password, hostname, root_database, port,
@@ -17,12 +19,16 @@ def create_mathesar_database(
         username, password, hostname, user_database, port
     )
     install.install_mathesar_on_database(user_db_engine)
+    if track_data_versions:
+        data_versions.install(user_db_engine)
 
 
 def install_mathesar_on_preexisting_database(
-        username, password, hostname, database, port,
+        username, password, hostname, database, port, track_data_versions=False,
 ):
     user_db_engine = engine.create_future_engine(
         username, password, hostname, database, port
     )
     install.install_mathesar_on_database(user_db_engine)
+    if track_data_versions:
+        data_versions.install(user_db_engine)
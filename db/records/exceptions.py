@@ -16,3 +16,19 @@ class InvalidGroupType(Exception):
 
 class UndefinedFunction(Exception):
     pass
+
+
+class BadCursorFormat(Exception):
+    pass
+
+
+class BadDuplicateFormat(Exception):
+    pass
+
+
+class BadAggregateFormat(Exception):
+    pass
+
+
+class AggregateFieldNotFound(FieldNotFound):
+    pass
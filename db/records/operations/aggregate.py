@@ -0,0 +1,112 @@
+from enum import Enum
+
+from sqlalchemy import func, select
+
+from db.records import exceptions as records_exceptions
+from db.records.operations import group
+
+
+class AggregateFunction(Enum):
+    COUNT = 'count'
+    SUM = 'sum'
+    AVG = 'avg'
+    MIN = 'min'
+    MAX = 'max'
+
+
+AGGREGATE_FUNCTIONS = {
+    AggregateFunction.COUNT.value: func.count,
+    AggregateFunction.SUM.value: func.sum,
+    AggregateFunction.AVG.value: func.avg,
+    AggregateFunction.MIN.value: func.min,
+    AggregateFunction.MAX.value: func.max,
+}
+
+
+class Aggregate:
+    def __init__(self, function, column=None):
+        self._function = function
+        self._column = column
+
+    @property
+    def function(self):
+        return self._function
+
+    @property
+    def column(self):
+        return self._column
+
+    def validate(self):
+        if self.function not in AGGREGATE_FUNCTIONS:
+            raise records_exceptions.BadAggregateFormat(
+                f'function "{self.function}" is invalid. valid functions are: '
+                + ', '.join([f"'{af.value}'" for af in AggregateFunction])
+            )
+        if self.column is None and self.function != AggregateFunction.COUNT.value:
+            raise records_exceptions.BadAggregateFormat(
+                f'function "{self.function}" requires a column'
+            )
+        if self.column is not None and not isinstance(self.column, str):
+            raise records_exceptions.BadAggregateFormat(
+                f"Aggregate column {self.column} must be a string."
+            )
+
+    def get_validated_expression(self, table):
+        self.validate()
+        if self.column is None:
+            # count without a column counts all records of the group.
+            return func.count(1)
+        if self.column not in table.columns:
+            raise records_exceptions.AggregateFieldNotFound(
+                f"Aggregate col {self.column} not found in {table}."
+            )
+        return AGGREGATE_FUNCTIONS[self.function](table.columns[self.column])
+
+
+def _get_aggregate_label(index):
+    return f'__mathesar_aggregate_{index}'
+
+
+def get_aggregate_query(table, group_by, aggregates, limit=None, offset=None):
+    """
+    Returns a query giving the group id and the values of the aggregates for
+    each group of the records of the table, ordered by group id.  Groups are
+    found as for get_group_augmented_records_query, and the aggregates are
+    computed with a single GROUP BY, paginated over the groups.
+
+    Args:
+        table:       SQLAlchemy table object
+        group_by:    group.GroupBy object giving args for grouping
+        aggregates:  list of Aggregate objects
+        limit:       int, gives number of groups to return
+        offset:      int, gives number of groups to skip
+    """
+    grouped_cte = group.get_group_augmented_records_query(table, group_by).cte('aggregate_cte')
+    group_id_col = grouped_cte.columns[group.MATHESAR_GROUP_ID]
+    aggregate_exprs = [
+        aggregate.get_validated_expression(grouped_cte).label(_get_aggregate_label(i))
+        for i, aggregate in enumerate(aggregates)
+    ]
+    return select(group_id_col, *aggregate_exprs).group_by(group_id_col).order_by(
+        group_id_col
+    ).limit(limit).offset(offset)
+
+
+def get_group_count_query(table, group_by):
+    """
+    Returns a query giving the number of groups of the records of the table.
+    """
+    grouped_cte = group.get_group_augmented_records_query(table, group_by).cte('aggregate_cte')
+    return select(func.count(func.distinct(grouped_cte.columns[group.MATHESAR_GROUP_ID])))
+
+
+def extract_aggregates(row, num_aggregates):
+    """
+    Returns the group id and the list of aggregate values of a row returned by
+    the query of get_aggregate_query.
+    """
+    mapping = row._mapping
+    return (
+        mapping[group.MATHESAR_GROUP_ID],
+        [mapping[_get_aggregate_label(i)] for i in range(num_aggregates)],
+    )
@@ -1,7 +1,10 @@
+from copy import copy
+from decimal import Decimal
 from enum import Enum
-import json
 import logging
-from sqlalchemy import select, func, and_, case, literal
+from sqlalchemy import select, func, case, cast, literal, true, Integer, Numeric
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.sql.elements import Grouping
 
 from db.records import exceptions as records_exceptions
 from db.records.operations import calculation
@@ -9,7 +12,12 @@ from db.records.utils import create_col_objects
 
 logger = logging.getLogger(__name__)
 
+MATHESAR_GROUP_ID = '__mathesar_group_id'
 MATHESAR_GROUP_METADATA = '__mathesar_group_metadata'
+# Columns of the grouped records holding the 'pretty' bounds of their group,
+# for the grouping modes that define them.
+GEQ_BOUND = '__mathesar_group_geq_bound'
+LT_BOUND = '__mathesar_group_lt_bound'
 
 
 class GroupMode(Enum):
@@ -37,6 +45,7 @@ class GroupBy:
         self._mode = mode
         self._num_groups = num_groups
         self._ranged = bool(mode != GroupMode.DISTINCT.value)
+        self._boundaries = None
 
     @property
     def columns(self):
@@ -54,6 +63,31 @@ class GroupBy:
     def ranged(self):
         return self._ranged
 
+    @property
+    def boundaries(self):
+        return self._boundaries
+
+    @property
+    def uses_boundaries(self):
+        """
+        Whether groups can be assigned using precomputed boundaries, see
+        get_group_boundaries_query.
+        """
+        return (
+            self.mode == GroupMode.MAGNITUDE.value
+            or (self.mode == GroupMode.PERCENTILE.value and len(self.columns) == 1)
+        )
+
+    def with_boundaries(self, boundaries):
+        """
+        Returns a copy of this GroupBy which assigns records to groups using
+        the given boundaries, as returned by get_group_boundaries_query,
+        instead of computing them over all records.
+        """
+        group_by = copy(self)
+        group_by._boundaries = boundaries
+        return group_by
+
     def validate(self):
         group_modes = {group_mode.value for group_mode in GroupMode}
         if self.mode not in group_modes:
@@ -90,41 +124,120 @@ class GroupBy:
         return create_col_objects(table, self.columns)
 
 
-class GroupingWindowDefinition:
-    def __init__(self, partition_by, order_by):
-        self._partition_by = partition_by
-        self._order_by = tuple(order_by)
-        self._range = (None, None)
-
-    @property
-    def partition_by(self):
-        return self._partition_by
-
-    @property
-    def order_by(self):
-        return self._order_by
+def get_group_augmented_records_query(table, group_by):
+    """
+    Returns a query for the records of the table, each augmented with the id of
+    the group it belongs to.  The metadata of the groups is fetched separately,
+    using get_group_summary_query.
 
-    @property
-    def range_(self):
-        return self._range
+    Args:
+        table:      SQLAlchemy table object
+        group_by:   GroupBy object giving args for grouping
+    """
+    grouped_cte = _get_grouped_select(table, group_by).cte('grouped_cte')
+    return select(
+        *[col for col in grouped_cte.columns if col.name in table.columns],
+        grouped_cte.columns[MATHESAR_GROUP_ID],
+    )
 
 
-def get_group_augmented_records_query(table, group_by):
+def get_group_summary_query(table, group_by, group_ids):
     """
-    Returns counts by specified groupings
+    Returns a query giving the metadata of the given groups, with one row per
+    group.  The count and bounds are found with aggregates over the grouped
+    records, instead of window functions evaluated for every record.
 
     Args:
         table:      SQLAlchemy table object
         group_by:   GroupBy object giving args for grouping
+        group_ids:  ids of the groups to summarize, as returned with the
+                    records by get_group_augmented_records_query
     """
+    grouping_column_names = [
+        col.name for col in group_by.get_validated_group_by_columns(table)
+    ]
+    grouped_cte = _get_grouped_select(table, group_by).cte('grouped_cte')
+    group_id_col = grouped_cte.columns[MATHESAR_GROUP_ID]
+    grouping_cols = [grouped_cte.columns[name] for name in grouping_column_names]
+    bound_cols = [
+        col for col in grouped_cte.columns if col.name in (GEQ_BOUND, LT_BOUND)
+    ]
+    in_groups = group_id_col.in_(group_ids)
+
+    counts_cte = select(
+        group_id_col,
+        func.count(1).label(GroupMetadataField.COUNT.value),
+        *[func.min(col).label(col.name) for col in bound_cols],
+    ).where(in_groups).group_by(group_id_col).cte('counts_cte')
+    # The first and last values of a group are those of its first and last
+    # records when ordered by the grouping columns.
+    first_cte = select(group_id_col, *grouping_cols).where(in_groups).distinct(
+        group_id_col
+    ).order_by(group_id_col, *grouping_cols).cte('first_cte')
+    last_cte = select(group_id_col, *grouping_cols).where(in_groups).distinct(
+        group_id_col
+    ).order_by(group_id_col, *[col.desc() for col in grouping_cols]).cte('last_cte')
+
+    def _get_values_object(cte):
+        return func.json_build_object(
+            *[
+                part for name in grouping_column_names
+                for part in (literal(str(name)), cte.columns[name])
+            ]
+        )
+
+    def _get_bound_object(bound_name):
+        if bound_name not in counts_cte.columns:
+            return None
+        return func.json_build_object(
+            literal(str(grouping_column_names[0])), counts_cte.columns[bound_name]
+        )
+
+    counts_group_id_col = counts_cte.columns[MATHESAR_GROUP_ID]
+    group_metadata = func.json_build_object(
+        literal(GroupMetadataField.GROUP_ID.value),
+        counts_group_id_col,
+        literal(GroupMetadataField.COUNT.value),
+        counts_cte.columns[GroupMetadataField.COUNT.value],
+        literal(GroupMetadataField.FIRST_VALUE.value),
+        _get_values_object(first_cte),
+        literal(GroupMetadataField.LAST_VALUE.value),
+        _get_values_object(last_cte),
+        # These values are 'pretty' bounds. What 'pretty' means depends on the
+        # grouping mode, and so they're computed with the grouped records.
+        literal(GroupMetadataField.LEQ_VALUE.value),
+        None,
+        literal(GroupMetadataField.GEQ_VALUE.value),
+        _get_bound_object(GEQ_BOUND),
+        literal(GroupMetadataField.LT_VALUE.value),
+        _get_bound_object(LT_BOUND),
+        literal(GroupMetadataField.GT_VALUE.value),
+        None,
+    ).label(MATHESAR_GROUP_METADATA)
+    return select(group_metadata).select_from(
+        counts_cte.join(
+            first_cte, first_cte.columns[MATHESAR_GROUP_ID] == counts_group_id_col
+        ).join(
+            last_cte, last_cte.columns[MATHESAR_GROUP_ID] == counts_group_id_col
+        )
+    ).order_by(counts_group_id_col)
+
+
+def _get_grouped_select(table, group_by):
     grouping_columns = group_by.get_validated_group_by_columns(table)
 
-    if group_by.mode == GroupMode.PERCENTILE.value:
+    if group_by.mode == GroupMode.PERCENTILE.value and group_by.boundaries is not None:
+        query = _get_percentile_boundaries_group_select(
+            table, grouping_columns, group_by.boundaries
+        )
+    elif group_by.mode == GroupMode.PERCENTILE.value:
         query = _get_percentile_range_group_select(
             table, grouping_columns, group_by.num_groups
         )
     elif group_by.mode == GroupMode.MAGNITUDE.value:
-        query = _get_tens_powers_range_group_select(table, grouping_columns)
+        query = _get_tens_powers_range_group_select(
+            table, grouping_columns, group_by.boundaries
+        )
     elif group_by.mode == GroupMode.DISTINCT.value:
         query = _get_distinct_group_select(table, grouping_columns)
     else:
@@ -133,168 +246,147 @@ def get_group_augmented_records_query(table, group_by):
 
 
 def _get_distinct_group_select(table, grouping_columns):
-    window_def = GroupingWindowDefinition(
-        order_by=grouping_columns, partition_by=grouping_columns
-    )
-
-    group_id_expr = func.dense_rank().over(
-        order_by=window_def.order_by, range_=window_def.range_
-    )
-    return select(
-        table,
-        _get_group_metadata_definition(window_def, grouping_columns, group_id_expr)
-    )
-
+    group_id_expr = func.dense_rank().over(order_by=grouping_columns)
+    return select(table, group_id_expr.label(MATHESAR_GROUP_ID))
 
-def _get_tens_powers_range_group_select(table, grouping_columns):
-    EXTREMA_DIFF = 'extrema_difference'
-    POWER = 'power'
-    RAW_ID = 'raw_id'
 
+def _get_tens_powers_range_group_select(table, grouping_columns, boundaries=None):
     assert len(grouping_columns) == 1
     grouping_column = grouping_columns[0]
-    diff_cte = calculation.get_extrema_diff_select(
-        table, grouping_column, EXTREMA_DIFF
-    ).cte('diff_cte')
-    power_cte = calculation.get_offset_order_of_magnitude_select(
-        diff_cte, diff_cte.columns[EXTREMA_DIFF], POWER
-    ).cte('power_cte')
-    raw_id_cte = calculation.divide_by_power_of_ten_select(
-        power_cte,
-        power_cte.columns[grouping_column.name],
-        power_cte.columns[POWER],
-        RAW_ID
-    ).cte('raw_id_cte')
-    cte_main_col_list = [
-        col for col in raw_id_cte.columns if col.name == grouping_column.name
-    ]
-    window_def = GroupingWindowDefinition(
-        order_by=cte_main_col_list, partition_by=raw_id_cte.columns[RAW_ID]
-    )
-
-    group_id_expr = func.dense_rank().over(
-        order_by=window_def.partition_by, range_=window_def.range_
+    if boundaries is not None:
+        # The extrema were found beforehand, so the width of the groups is
+        # computed here and the records can be grouped in a single pass.
+        min_value, max_value = boundaries
+        if min_value is None or max_value == min_value:
+            power = 0
+        else:
+            power = calculation.get_offset_order_of_magnitude(max_value - min_value)
+        min_expr = literal(min_value, grouping_column.type)
+        max_expr = literal(max_value, grouping_column.type)
+        power_expr = literal(power, Integer)
+        width_expr = cast(literal(Decimal(10) ** power), Numeric)
+        from_clause = table
+    else:
+        MIN = 'min'
+        MAX = 'max'
+        POWER = 'power'
+        extrema_cte = select(
+            func.min(grouping_column).label(MIN), func.max(grouping_column).label(MAX)
+        ).cte('extrema_cte')
+        extrema_diff = extrema_cte.columns[MAX] - extrema_cte.columns[MIN]
+        power_cte = select(
+            extrema_cte,
+            func.coalesce(
+                cast(func.floor(func.log(func.nullif(extrema_diff, 0))) - 1, Integer), 0
+            ).label(POWER)
+        ).cte('power_cte')
+        min_expr = power_cte.columns[MIN]
+        max_expr = power_cte.columns[MAX]
+        power_expr = power_cte.columns[POWER]
+        width_expr = func.pow(literal(10.0), power_expr)
+        from_clause = table.join(power_cte, true())
+
+    def _get_raw_id_expr(value_expr):
+        return cast(func.floor(value_expr / width_expr), Integer)
+
+    raw_id_expr = _get_raw_id_expr(grouping_column)
+    min_raw_id_expr = _get_raw_id_expr(min_expr)
+    # Group ids count the groups from the one of the smallest value, so they
+    # can be found without ranking the records.  Records with a NULL value
+    # are in the group after the one of the largest value.
+    group_id_expr = func.coalesce(
+        raw_id_expr - min_raw_id_expr + 1,
+        _get_raw_id_expr(max_expr) - min_raw_id_expr + 2,
+        1,
     )
 
     def _get_pretty_bound_expr(id_offset):
-        raw_id_col = raw_id_cte.columns[RAW_ID]
-        power_col = raw_id_cte.columns[POWER]
-        power_expr = func.pow(literal(10.0), power_col)
+        bound_expr = (raw_id_expr + id_offset) * width_expr
         return case(
-            (power_col >= 0, func.trunc((raw_id_col + id_offset) * power_expr)),
-            else_=func.trunc(
-                (raw_id_col + id_offset) * power_expr,
-                ((-1) * power_col)
-            )
+            (power_expr >= 0, func.trunc(bound_expr)),
+            else_=func.trunc(bound_expr, ((-1) * power_expr))
         )
 
-    geq_expr = func.json_build_object(
-        grouping_column.name, _get_pretty_bound_expr(0)
-    )
-    lt_expr = func.json_build_object(
-        grouping_column.name, _get_pretty_bound_expr(1)
-    )
     return select(
-        *[col for col in raw_id_cte.columns if col.name in table.columns],
-        _get_group_metadata_definition(
-            window_def,
-            cte_main_col_list,
-            group_id_expr,
-            geq_expr=geq_expr,
-            lt_expr=lt_expr,
-        )
-    )
+        table,
+        group_id_expr.label(MATHESAR_GROUP_ID),
+        _get_pretty_bound_expr(0).label(GEQ_BOUND),
+        _get_pretty_bound_expr(1).label(LT_BOUND),
+    ).select_from(from_clause)
 
 
 def _get_percentile_range_group_select(table, columns, num_groups):
-    column_names = [col.name for col in columns]
-    # cume_dist is a PostgreSQL function that calculates the cumulative
-    # distribution.
+    # A record is in group i + 1 if the fraction of records sorting before or
+    # with it is in (i / num_groups, (i + 1) / num_groups], i.e. its group is
+    # the ceiling of that fraction times num_groups.  This is the cumulative
+    # distribution, computed with integer arithmetic to avoid rounding errors.
     # See https://www.postgresql.org/docs/13/functions-window.html
-    CUME_DIST = 'cume_dist'
-    RANGE_ID = 'range_id'
-    cume_dist_cte = select(
-        table,
-        func.cume_dist().over(order_by=columns).label(CUME_DIST)
-    ).cte()
-    ranges = [
-        (
-            and_(
-                cume_dist_cte.columns[CUME_DIST] > i / num_groups,
-                cume_dist_cte.columns[CUME_DIST] <= (i + 1) / num_groups
-            ),
-            i + 1
-        )
-        for i in range(num_groups)
-    ]
-
-    ranges_cte = select(
-        *[col for col in cume_dist_cte.columns if col.name != CUME_DIST],
-        case(*ranges).label(RANGE_ID)
-    ).cte()
-    ranges_aggregation_cols = [
-        col for col in ranges_cte.columns if col.name in column_names
-    ]
-    window_def = GroupingWindowDefinition(
-        order_by=ranges_aggregation_cols,
-        partition_by=ranges_cte.columns[RANGE_ID]
+    num_preceding_or_peer = func.count(1).over(order_by=columns)
+    num_records = func.count(1).over()
+    group_id_expr = (
+        (num_preceding_or_peer * num_groups + num_records - 1) / num_records
     )
-    group_id_expr = window_def.partition_by
+    return select(table, cast(group_id_expr, Integer).label(MATHESAR_GROUP_ID))
 
-    return select(
-        *[col for col in ranges_cte.columns if col.name in table.columns],
-        _get_group_metadata_definition(
-            window_def, ranges_aggregation_cols, group_id_expr
-        )
-    )
 
+def get_group_boundaries_query(table, group_by):
+    """
+    Returns a query giving the boundaries of the groups of the grouping, which
+    can be passed to GroupBy.with_boundaries so that records are assigned to
+    groups with a single lookup.  For a single column percentile grouping,
+    these are the lower bound and id of each group, ordered by group id.  For
+    a magnitude grouping, these are the extrema of the column, which can be
+    found using an index.
 
-def _get_group_metadata_definition(
-        window_def,
-        grouping_columns,
-        group_id_expr,
-        leq_expr=None,
-        geq_expr=None,
-        lt_expr=None,
-        gt_expr=None,
-):
-    col_key_value_tuples = (
-        (literal(str(col.name)), col) for col in grouping_columns
+    Args:
+        table:      SQLAlchemy table object
+        group_by:   GroupBy object giving args for grouping
+    """
+    assert group_by.uses_boundaries
+    grouping_column = group_by.get_validated_group_by_columns(table)[0]
+    if group_by.mode == GroupMode.MAGNITUDE.value:
+        return select(func.min(grouping_column), func.max(grouping_column))
+    grouped_cte = _get_percentile_range_group_select(
+        table, [grouping_column], group_by.num_groups
+    ).cte('grouped_cte')
+    group_id_col = grouped_cte.columns[MATHESAR_GROUP_ID]
+    grouping_col = grouped_cte.columns[grouping_column.name]
+    return select(grouping_col, group_id_col).distinct(group_id_col).order_by(
+        group_id_col, grouping_col
     )
-    col_key_value_list = [
-        col_part for col_tuple in col_key_value_tuples for col_part in col_tuple
-    ]
-    inner_grouping_object = func.json_build_object(*col_key_value_list)
 
-    return func.json_build_object(
-        literal(GroupMetadataField.GROUP_ID.value),
-        group_id_expr,
-        literal(GroupMetadataField.COUNT.value),
-        func.count(1).over(partition_by=window_def.partition_by),
-        literal(GroupMetadataField.FIRST_VALUE.value),
-        func.first_value(inner_grouping_object).over(
-            partition_by=window_def.partition_by,
-            order_by=window_def.order_by,
-            range_=window_def.range_,
-        ),
-        literal(GroupMetadataField.LAST_VALUE.value),
-        func.last_value(inner_grouping_object).over(
-            partition_by=window_def.partition_by,
-            order_by=window_def.order_by,
-            range_=window_def.range_,
-        ),
-        # These values are 'pretty' bounds. What 'pretty' means is based
-        # on the caller, and so these expressions need to be defined by
-        # that caller.
-        literal(GroupMetadataField.LEQ_VALUE.value),
-        leq_expr,
-        literal(GroupMetadataField.GEQ_VALUE.value),
-        geq_expr,
-        literal(GroupMetadataField.LT_VALUE.value),
-        lt_expr,
-        literal(GroupMetadataField.GT_VALUE.value),
-        gt_expr,
-    ).label(MATHESAR_GROUP_METADATA)
+
+def _get_percentile_boundaries_group_select(table, columns, boundaries):
+    assert len(columns) == 1
+    column = columns[0]
+    # NULLs sort after all other values, so they're all in the last group,
+    # whose lower bound is only NULL if it has nothing but NULLs.
+    lower_bounds = [bound for bound, _ in boundaries if bound is not None]
+    lower_bound_group_ids = [group_id for bound, group_id in boundaries if bound is not None]
+    null_group_id = boundaries[-1][1] if boundaries else None
+
+    if lower_bounds:
+        # width_bucket does a binary search of the lower bounds.  Values below
+        # the first lower bound (only possible if the records changed after
+        # the boundaries were found) are put in the first group.
+        bucket_expr = func.greatest(
+            func.width_bucket(column, cast(array(lower_bounds), ARRAY(column.type))), 1
+        )
+        group_id_expr = case(
+            (column.is_(None), literal(null_group_id, Integer)),
+            else_=Grouping(cast(array(lower_bound_group_ids), ARRAY(Integer)))[bucket_expr],
+        )
+    else:
+        group_id_expr = literal(null_group_id, Integer)
+    return select(table, group_id_expr.label(MATHESAR_GROUP_ID))
+
+
+def get_group_ids(records):
+    """
+    Returns the distinct ids of the groups of the given grouped records, in
+    order of first appearance.
+    """
+    return list(dict.fromkeys(record._mapping[MATHESAR_GROUP_ID] for record in records))
 
 
 def extract_group_metadata(
@@ -302,38 +394,22 @@ def extract_group_metadata(
 ):
     """
     This function takes an iterable of record dictionaries with record data and
-    record metadata, and moves the group metadata from the data section to the
-    metadata section.
+    record metadata, and moves the group id from the data section to the
+    metadata section.  It returns the records, and the ids of their groups in
+    order of first appearance (or None if the records aren't grouped).
     """
-    def _get_record_pieces(record):
-        data = {
-            k: v for k, v in record[data_key].items()
-            if k != MATHESAR_GROUP_METADATA
-        }
-        group_metadata = record[data_key].get(MATHESAR_GROUP_METADATA, {})
-        if group_metadata:
+    records = []
+    group_ids = {}
+    for record in record_dictionaries:
+        data = dict(record[data_key])
+        metadata = record.get(metadata_key)
+        if MATHESAR_GROUP_ID in data:
+            group_id = data.pop(MATHESAR_GROUP_ID)
             metadata = (
-                record.get(metadata_key, {})
-                | {
-                    GroupMetadataField.GROUP_ID.value: group_metadata.get(
-                        GroupMetadataField.GROUP_ID.value
-                    )
-                }
+                (metadata or {})
+                | {GroupMetadataField.GROUP_ID.value: group_id}
             )
-        else:
-            metadata = record.get(metadata_key)
-        return (
-            {data_key: data, metadata_key: metadata},
-            group_metadata if group_metadata else None
-        )
-
-    record_tup, group_tup = zip(
-        *(_get_record_pieces(record) for record in record_dictionaries)
-    )
-
-    reduced_groups = sorted(
-        [json.loads(blob) for blob in set([json.dumps(group) for group in group_tup])],
-        key=lambda x: x[GroupMetadataField.GROUP_ID.value] if x else None
-    )
+            group_ids[group_id] = None
+        records.append({data_key: data, metadata_key: metadata})
 
-    return list(record_tup), reduced_groups if reduced_groups != [None] else None
+    return records, list(group_ids) if group_ids else None
@@ -1,4 +1,4 @@
-import tempfile
+import codecs
 
 from psycopg2 import sql
 
@@ -27,8 +27,66 @@ def insert_record_or_records(table, engine, record_data):
     return None
 
 
-def insert_records_from_csv(table, engine, csv_filename, column_names, header, delimiter=None, escape=None, quote=None, encoding=None):
-    with open(csv_filename, "r", encoding=encoding) as csv_file:
+class _ProgressReader:
+    """
+    Wraps a binary file, calling the progress callback with the number of
+    bytes read from it after each read.
+    """
+    def __init__(self, file, progress_callback):
+        self._file = file
+        self._progress_callback = progress_callback
+
+    def read(self, size=-1):
+        contents = self._file.read(size)
+        self._progress_callback(self._file.tell())
+        return contents
+
+
+class _TranscodingReader:
+    """
+    Wraps a binary file in the source encoding, returning its contents in the
+    target encoding.  The contents are transcoded as they're read, so that
+    COPY doesn't wait for the whole file to be converted, and no converted
+    copy of the file is written.
+    """
+    def __init__(self, file, source_encoding, target_encoding):
+        self._file = file
+        self._decoder = codecs.getincrementaldecoder(source_encoding)()
+        # TODO: Raise an exception instead of silently replacing the characters
+        self._encoder = codecs.getincrementalencoder(target_encoding)("replace")
+        self._buffer = bytearray()
+        self._finished = False
+
+    def read(self, size=-1):
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            contents = self._file.read(max(size, READ_SIZE))
+            self._finished = not contents
+            self._buffer += self._encoder.encode(
+                self._decoder.decode(contents, final=self._finished), final=self._finished
+            )
+        if size < 0:
+            size = len(self._buffer)
+        contents = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return contents
+
+
+def insert_records_from_csv(
+        table, engine, csv_filename, column_names, header, delimiter=None, escape=None, quote=None, encoding=None,
+        progress_callback=None
+):
+    """
+    Copies the records of the CSV file into the table.  If given, the progress
+    callback is called with the number of bytes of the file processed so far
+    as they're copied; an exception raised by it aborts the copy.
+    """
+    conversion_encoding, sql_encoding = get_sql_compatible_encoding(encoding)
+    with open(csv_filename, "rb") as csv_file:
+        if progress_callback is not None:
+            csv_file = _ProgressReader(csv_file, progress_callback)
+        if codecs.lookup(encoding).name != conversion_encoding:
+            # File needs to be converted to compatible database supported encoding
+            csv_file = _TranscodingReader(csv_file, encoding, conversion_encoding)
         with engine.begin() as conn:
             cursor = conn.connection.cursor()
             # We should convert our entire query to sql.SQL class in order to keep its original header's name
@@ -40,7 +98,6 @@ def insert_records_from_csv(table, engine, csv_filename, column_names, header, d
             formatted_columns = sql.SQL(",").join(
                 sql.Identifier(column_name) for column_name in column_names
             )
-            conversion_encoding, sql_encoding = get_sql_compatible_encoding(encoding)
             copy_sql = sql.SQL(
                 "COPY {relation} ({formatted_columns}) FROM STDIN CSV {header} {delimiter} {escape} {quote} {encoding}"
             ).format(
@@ -59,16 +116,4 @@ def insert_records_from_csv(table, engine, csv_filename, column_names, header, d
                 ),
                 encoding=sql.SQL(f"ENCODING '{sql_encoding}'" if sql_encoding else ""),
             )
-            if conversion_encoding == encoding:
-                cursor.copy_expert(copy_sql, csv_file)
-            else:
-                # File needs to be converted to compatible database supported encoding
-                with tempfile.SpooledTemporaryFile(mode='wb+', encoding=conversion_encoding) as temp_file:
-                    while True:
-                        # TODO: Raise an exception instead of silently replacing the characters
-                        contents = csv_file.read(READ_SIZE).encode(conversion_encoding, "replace")
-                        if not contents:
-                            break
-                        temp_file.write(contents)
-                    temp_file.seek(0)
-                    cursor.copy_expert(copy_sql, temp_file)
+            cursor.copy_expert(copy_sql, csv_file)
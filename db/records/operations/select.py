@@ -1,33 +1,231 @@
-from sqlalchemy import select, func
+import json
+from collections import OrderedDict
+from threading import Lock
+
+from sqlalchemy import (
+    Column, and_, bindparam, cast, false, func, literal, or_, select, tuple_, values
+)
+from sqlalchemy.types import NullType
 from sqlalchemy_filters import apply_sort
+from sqlalchemy_filters.exceptions import BadSortFormat
 
+from db.functions.base import (
+    Equal, Greater, GreaterOrEqual, Lesser, LesserOrEqual, Literal, LiteralParameter
+)
 from db.functions.operations.apply import apply_db_function_spec_as_filter
 from db.columns.base import MathesarColumn
-from db.records.operations import group
+from db.records import exceptions as records_exceptions
+from db.records.operations import aggregate, group
+from db.records.utils import create_col_objects
 from db.tables.utils import get_primary_key_column
 from db.types.operations.cast import get_column_cast_expression
 from db.utils import execute_query
 
 
-def _get_duplicate_only_cte(table, duplicate_columns):
-    DUPLICATE_LABEL = "_is_dupe"
-    duplicate_flag_cte = (
-        select(
-            *table.c,
-            (func.count(1).over(partition_by=duplicate_columns) > 1).label(DUPLICATE_LABEL),
-        ).select_from(table)
-    ).cte()
-    return select(duplicate_flag_cte).where(duplicate_flag_cte.c[DUPLICATE_LABEL]).cte()
+DUPLICATE_COUNT = '__mathesar_duplicate_count'
+
+# Compiled records queries are kept in the info of the reflected table they
+# query, keyed by the shape of the query (see _get_records_query_shape).  The
+# compiled queries refer to the table, so keeping them anywhere else would
+# keep the table alive.  This way they're freed along with it, e.g. once the
+# table is reflected again because its columns changed.
+COMPILED_RECORDS_QUERIES_INFO_KEY = 'mathesar_compiled_records_queries'
+_compiled_records_queries_lock = Lock()
+COMPILED_RECORDS_QUERIES_MAX_SIZE = 100
+
+LIMIT_PARAMETER = 'mathesar_limit'
+OFFSET_PARAMETER = 'mathesar_offset'
+LITERAL_PARAMETER_PREFIX = 'mathesar_literal_'
+# Literals compared against other values are passed as parameters of the
+# compiled query.  Other literals may change the SQL itself (e.g. the pattern
+# of a LIKE), so they are part of the shape of the query instead.
+_PARAMETRIZED_LITERAL_PARENT_IDS = {
+    Equal.id, Greater.id, Lesser.id, GreaterOrEqual.id, LesserOrEqual.id
+}
+_PARAMETRIZED_LITERAL_TYPES = (int, float, str)
+
+
+def _get_duplicate_keys_query(table, duplicate_columns):
+    """
+    Returns a query for the values of the given columns that appear in more
+    than one row, along with the number of rows they appear in.  Postgres can
+    answer this with a hash aggregate (or an index scan, if a matching index
+    exists), rather than sorting all rows to compute a window count.
+    """
+    if not duplicate_columns:
+        raise records_exceptions.BadDuplicateFormat('At least one column is needed to find duplicates.')
+    columns = create_col_objects(table, duplicate_columns)
+    return (
+        select(*columns, func.count(1).label(DUPLICATE_COUNT))
+        .group_by(*columns)
+        .having(func.count(1) > 1)
+    )
+
+
+def _get_key_match_expr(column, key_column, cast_key=False):
+    if cast_key:
+        # Postgres can't infer the type of a VALUES column holding only NULLs.
+        key_column = cast(key_column, column.type)
+    # GROUP BY puts NULLs together, so they have to match each other here too.
+    if column.nullable:
+        return column.is_not_distinct_from(key_column)
+    return column == key_column
 
 
-def _sort_and_filter(query, order_by, filter):
+def _get_duplicate_only_cte(table, duplicate_columns, duplicate_keys=None):
+    """
+    Returns a CTE of the rows of the table whose values of the given columns
+    are duplicated.  If duplicate_keys, a list of the duplicated values, is
+    given, it's used instead of finding the duplicated values again.
+    """
+    columns = create_col_objects(table, duplicate_columns)
+    if duplicate_keys is None:
+        keys = _get_duplicate_keys_query(table, duplicate_columns).cte('duplicate_keys_cte')
+    elif len(duplicate_keys) == 0:
+        return select(table).where(false()).cte()
+    else:
+        keys = (
+            values(*[Column(col.name, col.type) for col in columns], name='duplicate_keys')
+            .data([tuple(key) for key in duplicate_keys])
+        )
+    join_condition = and_(
+        *[_get_key_match_expr(col, keys.columns[col.name], duplicate_keys is not None) for col in columns]
+    )
+    return select(table).select_from(table.join(keys, join_condition)).cte()
+
+
+def _sort_and_filter(query, order_by, filter, cursor=None):
     if order_by is not None:
         query = apply_sort(query, order_by)
     if filter is not None:
         query = apply_db_function_spec_as_filter(query, filter)
+    if cursor is not None:
+        query = query.where(_get_seek_predicate(query, order_by, cursor))
     return query
 
 
+def _get_sort_field_name(sort_spec):
+    try:
+        field = sort_spec['field']
+    except (TypeError, KeyError):
+        raise BadSortFormat('`field` and `direction` are mandatory attributes.')
+    return field.name if isinstance(field, Column) else field
+
+
+def get_unique_order_by(table, order_by):
+    """
+    Returns the given order_by extended with tie-breaking fields, so that it
+    defines a total ordering of the records of the table. The primary key
+    columns are used as tie-breakers if there are any, and all columns otherwise.
+    """
+    if len(table.primary_key.columns) > 0:
+        tie_breaking_columns = table.primary_key.columns
+    else:
+        tie_breaking_columns = table.columns
+    ordered_fields = {_get_sort_field_name(sort_spec) for sort_spec in order_by}
+    return list(order_by) + [
+        {'field': str(col.name), 'direction': 'asc'}
+        for col in tie_breaking_columns
+        if col.name not in ordered_fields
+    ]
+
+
+def _get_seek_predicate(query, order_by, cursor):
+    """
+    Returns a predicate selecting the rows that come strictly after the row
+    described by the cursor, according to the given order_by.  This lets
+    Postgres seek directly to the start of a page (using an index if possible)
+    instead of scanning and discarding all previous rows as OFFSET does.
+
+    Args:
+        query:     SQLAlchemy select the predicate will be applied to
+        order_by:  list of sort dictionaries; must define a total ordering
+        cursor:    list of values of the order_by fields for the last row
+                   of the previous page
+    """
+    if not isinstance(cursor, list) or len(cursor) != len(order_by):
+        raise records_exceptions.BadCursorFormat(
+            'Cursor must be a list with one value per ordering field.'
+        )
+    columns = [
+        query.selected_columns[_get_sort_field_name(sort_spec)] for sort_spec in order_by
+    ]
+    directions = {sort_spec.get('direction') for sort_spec in order_by}
+    nulls_ordered = any(
+        sort_spec.get('nullsfirst') or sort_spec.get('nullslast') for sort_spec in order_by
+    )
+    if (
+            len(directions) == 1
+            and not nulls_ordered
+            and all(not column.nullable for column in columns)
+            and all(value is not None for value in cursor)
+    ):
+        # A row value comparison can be answered by a single multicolumn
+        # index range scan, so we prefer it whenever NULLs can't get in the way.
+        value_exprs = [
+            _get_cursor_value_expr(column, value) for column, value in zip(columns, cursor)
+        ]
+        if len(columns) == 1:
+            column_tuple, value_tuple = columns[0], value_exprs[0]
+        else:
+            column_tuple, value_tuple = tuple_(*columns), tuple_(*value_exprs)
+        if directions == {'asc'}:
+            return column_tuple > value_tuple
+        else:
+            return column_tuple < value_tuple
+
+    seek_terms = []
+    equal_terms = []
+    for sort_spec, column, value in zip(order_by, columns, cursor):
+        seek_terms.append(and_(*equal_terms, _get_after_value_expr(column, sort_spec, value)))
+        equal_terms.append(_get_equal_value_expr(column, value))
+    return or_(*seek_terms)
+
+
+def _get_cursor_value_expr(column, value):
+    # Cursor values are JSON primitives, so we let Postgres cast them to the
+    # column type rather than relying on python side type processing.
+    if isinstance(column.type, NullType):
+        return literal(value)
+    return cast(literal(value), column.type)
+
+
+def _get_equal_value_expr(column, value):
+    if value is None:
+        return column.is_(None)
+    return column == _get_cursor_value_expr(column, value)
+
+
+def _get_after_value_expr(column, sort_spec, value):
+    ascending = sort_spec.get('direction') == 'asc'
+    # Postgres treats NULL as larger than any value, so NULLs come last in
+    # ascending order and first in descending order by default.
+    if sort_spec.get('nullsfirst'):
+        nulls_first = True
+    elif sort_spec.get('nullslast'):
+        nulls_first = False
+    else:
+        nulls_first = not ascending
+
+    if value is None:
+        return column.isnot(None) if nulls_first else false()
+    value_expr = _get_cursor_value_expr(column, value)
+    after_expr = column > value_expr if ascending else column < value_expr
+    if nulls_first or not column.nullable:
+        return after_expr
+    return or_(after_expr, column.is_(None))
+
+
+def _get_grouping_target(table, filter, duplicate_only, duplicate_keys=None):
+    if duplicate_only:
+        select_target = _get_duplicate_only_cte(table, duplicate_only, duplicate_keys)
+    else:
+        select_target = table
+    if filter is not None:
+        select_target = _sort_and_filter(select(select_target), None, filter).cte()
+    return select_target
+
+
 def get_query(
     table,
     limit,
@@ -36,19 +234,23 @@ def get_query(
     filter=None,
     columns_to_select=None,
     group_by=None,
-    duplicate_only=None
+    duplicate_only=None,
+    cursor=None,
+    duplicate_keys=None,
 ):
-    if duplicate_only:
-        select_target = _get_duplicate_only_cte(table, duplicate_only)
-    else:
-        select_target = table
-
     if isinstance(group_by, group.GroupBy):
+        # The records are filtered before they're grouped, and the grouped
+        # records are then sorted and paginated.  This way the seek predicate
+        # doesn't restrict the rows the groups are computed over.
+        select_target = _get_grouping_target(table, filter, duplicate_only, duplicate_keys)
         selectable = group.get_group_augmented_records_query(select_target, group_by)
+        selectable = _sort_and_filter(selectable, order_by, None, cursor=cursor)
     else:
-        selectable = select(select_target)
-
-    selectable = _sort_and_filter(selectable, order_by, filter)
+        if duplicate_only:
+            select_target = _get_duplicate_only_cte(table, duplicate_only, duplicate_keys)
+        else:
+            select_target = table
+        selectable = _sort_and_filter(select(select_target), order_by, filter, cursor=cursor)
 
     if columns_to_select:
         selectable = selectable.cte()
@@ -75,6 +277,8 @@ def get_records(
     filter=None,
     group_by=None,
     duplicate_only=None,
+    cursor=None,
+    duplicate_keys=None,
 ):
     """
     Returns annotated records from a table.
@@ -93,6 +297,11 @@ def get_records(
         group_by:        group.GroupBy object
         duplicate_only:  list of column names; only rows that have duplicates across those rows
                          will be returned
+        cursor:          list of values of the (tie-broken, see get_unique_order_by) order_by
+                         fields for the last row of the previous page; only rows after it will
+                         be returned.  Should be used instead of offset for deep pagination.
+        duplicate_keys:  list of the duplicated values of the duplicate_only columns, as returned
+                         by get_duplicate_groups; saves finding them again for each page.
     """
     if not order_by:
         # Set default ordering if none was requested
@@ -104,17 +313,263 @@ def get_records(
             # If there aren't primary keys, order by all columns
             order_by = [{'field': col, 'direction': 'asc'}
                         for col in table.columns]
+    if cursor is not None:
+        # The cursor values are part of the query, so it isn't worth caching.
+        order_by = get_unique_order_by(table, order_by)
+        query = get_query(
+            table=table,
+            limit=limit,
+            offset=offset,
+            order_by=order_by,
+            filter=filter,
+            group_by=group_by,
+            duplicate_only=duplicate_only,
+            cursor=cursor,
+            duplicate_keys=duplicate_keys,
+        )
+        return execute_query(engine, query)
 
-    query = get_query(
-        table=table,
-        limit=limit,
-        offset=offset,
-        order_by=order_by,
-        filter=filter,
-        group_by=group_by,
-        duplicate_only=duplicate_only
+    literal_parameters = {}
+    parametrized_filter = _parametrize_filter(filter, literal_parameters)
+    shape = _get_records_query_shape(
+        engine, limit, offset, order_by, parametrized_filter, group_by, duplicate_only,
+        duplicate_keys
+    )
+
+    def _get_parametrized_query():
+        return get_query(
+            table=table,
+            limit=None if limit is None else bindparam(LIMIT_PARAMETER, limit),
+            offset=None if offset is None else bindparam(OFFSET_PARAMETER, offset),
+            order_by=order_by,
+            filter=parametrized_filter,
+            group_by=group_by,
+            duplicate_only=duplicate_only,
+            duplicate_keys=duplicate_keys,
+        )
+
+    compiled_query = _get_compiled_records_query(engine, table, shape, _get_parametrized_query)
+    parameters = {
+        parameter.name: parameter.value for parameter in literal_parameters.values()
+    }
+    if limit is not None:
+        parameters[LIMIT_PARAMETER] = limit
+    if offset is not None:
+        parameters[OFFSET_PARAMETER] = offset
+    return execute_query(engine, compiled_query, parameters=parameters)
+
+
+def _parametrize_filter(spec, literal_parameters):
+    """
+    Returns a copy of the filter spec in which the literals compared against
+    other values are replaced by LiteralParameter placeholders, which are
+    collected in literal_parameters.  Equal values share a placeholder, so that
+    the filter optimizer can still tell they're equal.
+    """
+    if not isinstance(spec, dict) or len(spec) != 1:
+        return spec
+    db_function_id, raw_parameters = next(iter(spec.items()))
+    if not isinstance(raw_parameters, list):
+        return spec
+    if db_function_id in _PARAMETRIZED_LITERAL_PARENT_IDS:
+        parametrize = _parametrize_literal
+    else:
+        parametrize = _parametrize_filter
+    return {
+        db_function_id: [
+            parametrize(raw_parameter, literal_parameters) for raw_parameter in raw_parameters
+        ]
+    }
+
+
+def _parametrize_literal(spec, literal_parameters):
+    raw_parameters = spec.get(Literal.id) if isinstance(spec, dict) and len(spec) == 1 else None
+    if (
+            not isinstance(raw_parameters, list)
+            or len(raw_parameters) != 1
+            or type(raw_parameters[0]) not in _PARAMETRIZED_LITERAL_TYPES
+    ):
+        return _parametrize_filter(spec, literal_parameters)
+    value = raw_parameters[0]
+    key = (type(value).__name__, value)
+    if key not in literal_parameters:
+        literal_parameters[key] = LiteralParameter(
+            f'{LITERAL_PARAMETER_PREFIX}{len(literal_parameters)}', value
+        )
+    return {Literal.id: [literal_parameters[key]]}
+
+
+def _get_records_query_shape(
+    engine, limit, offset, order_by, filter, group_by, duplicate_only, duplicate_keys
+):
+    return json.dumps(
+        [
+            engine.dialect.name, limit is None, offset is None, order_by, filter,
+            group_by, duplicate_only, duplicate_keys,
+        ],
+        sort_keys=True,
+        default=_get_query_shape_value,
     )
-    return execute_query(engine, query)
+
+
+def _get_query_shape_value(obj):
+    if isinstance(obj, LiteralParameter):
+        return {'parameter': obj.name, 'type': type(obj.value).__name__}
+    elif isinstance(obj, group.GroupBy):
+        return [obj.columns, obj.mode, obj.num_groups, obj.boundaries]
+    elif isinstance(obj, Column):
+        return obj.name
+    return str(obj)
+
+
+def _get_compiled_records_query(engine, table, shape, build_query):
+    with _compiled_records_queries_lock:
+        compiled_queries = table.info.setdefault(COMPILED_RECORDS_QUERIES_INFO_KEY, OrderedDict())
+        compiled_query = compiled_queries.get(shape)
+        if compiled_query is not None:
+            compiled_queries.move_to_end(shape)
+            return compiled_query
+    compiled_query = build_query().compile(dialect=engine.dialect)
+    with _compiled_records_queries_lock:
+        compiled_queries[shape] = compiled_query
+        if len(compiled_queries) > COMPILED_RECORDS_QUERIES_MAX_SIZE:
+            # Evict the least recently used query
+            compiled_queries.popitem(last=False)
+    return compiled_query
+
+
+def get_group_summaries(
+    table,
+    engine,
+    group_by,
+    group_ids,
+    filter=None,
+    duplicate_only=None,
+):
+    """
+    Returns the metadata of the given groups of the records of a table, ordered
+    by group id.  The filter and duplicate_only arguments must match those used
+    to get the grouped records.
+
+    Args:
+        table:           SQLAlchemy table object
+        engine:          SQLAlchemy engine object
+        group_by:        group.GroupBy object
+        group_ids:       ids of the groups, as returned with the grouped records
+        filter:          a dictionary with one key-value pair, where the key is the filter id and
+                         the value is a list of parameters; supports composition/nesting.
+        duplicate_only:  list of column names; only rows that have duplicates across those rows
+                         are grouped
+    """
+    if not group_ids:
+        return []
+    select_target = _get_grouping_target(table, filter, duplicate_only)
+    query = group.get_group_summary_query(select_target, group_by, group_ids)
+    return [
+        row._mapping[group.MATHESAR_GROUP_METADATA] for row in execute_query(engine, query)
+    ]
+
+
+def get_group_boundaries(
+    table,
+    engine,
+    group_by,
+    filter=None,
+    duplicate_only=None,
+):
+    """
+    Returns the boundaries of the groups of the records of a table, which can
+    be passed to group.GroupBy.with_boundaries.  For a single column
+    percentile grouping, these are [lower bound, group id] pairs.  For a
+    magnitude grouping, these are the minimum and maximum of the column.
+
+    Args:
+        table:           SQLAlchemy table object
+        engine:          SQLAlchemy engine object
+        group_by:        group.GroupBy object
+        filter:          a dictionary with one key-value pair, where the key is the filter id and
+                         the value is a list of parameters; supports composition/nesting.
+        duplicate_only:  list of column names; only rows that have duplicates across those rows
+                         are grouped
+    """
+    select_target = _get_grouping_target(table, filter, duplicate_only)
+    query = group.get_group_boundaries_query(select_target, group_by)
+    result = execute_query(engine, query)
+    if group_by.mode == group.GroupMode.MAGNITUDE.value:
+        return list(result[0])
+    return [list(row) for row in result]
+
+
+def get_aggregates(
+    table,
+    engine,
+    group_by,
+    aggregates,
+    limit=None,
+    offset=None,
+    filter=None,
+    duplicate_only=None,
+):
+    """
+    Returns the values of the aggregates for each group of the records of a
+    table, as a list of (group id, list of aggregate values) tuples ordered by
+    group id.
+
+    Args:
+        table:           SQLAlchemy table object
+        engine:          SQLAlchemy engine object
+        group_by:        group.GroupBy object
+        aggregates:      list of aggregate.Aggregate objects
+        limit:           int, gives number of groups to return
+        offset:          int, gives number of groups to skip
+        filter:          a dictionary with one key-value pair, where the key is the filter id and
+                         the value is a list of parameters; supports composition/nesting.
+        duplicate_only:  list of column names; only rows that have duplicates across those rows
+                         are grouped
+    """
+    select_target = _get_grouping_target(table, filter, duplicate_only)
+    query = aggregate.get_aggregate_query(
+        select_target, group_by, aggregates, limit=limit, offset=offset
+    )
+    return [
+        aggregate.extract_aggregates(row, len(aggregates))
+        for row in execute_query(engine, query)
+    ]
+
+
+def get_group_count(table, engine, group_by, filter=None, duplicate_only=None):
+    select_target = _get_grouping_target(table, filter, duplicate_only)
+    query = aggregate.get_group_count_query(select_target, group_by)
+    return execute_query(engine, query)[0][0]
+
+
+def get_duplicate_groups(table, engine, duplicate_columns, limit=None, offset=None):
+    """
+    Returns the groups of rows of a table that share the values of the given
+    columns, as a list of (list of values, number of rows) tuples.  Larger
+    groups come first, and groups of the same size are ordered by their values.
+
+    Args:
+        table:              SQLAlchemy table object
+        engine:             SQLAlchemy engine object
+        duplicate_columns:  list of column names
+        limit:              int, gives number of groups to return
+        offset:             int, gives number of groups to skip
+    """
+    columns = create_col_objects(table, duplicate_columns)
+    query = (
+        _get_duplicate_keys_query(table, duplicate_columns)
+        .order_by(func.count(1).desc(), *columns)
+        .limit(limit)
+        .offset(offset)
+    )
+    return [(list(row[:-1]), row[-1]) for row in execute_query(engine, query)]
+
+
+def get_duplicate_group_count(table, engine, duplicate_columns):
+    keys_cte = _get_duplicate_keys_query(table, duplicate_columns).cte()
+    query = select(func.count(1)).select_from(keys_cte)
+    return execute_query(engine, query)[0][0]
 
 
 def get_count(table, engine, filter=None):
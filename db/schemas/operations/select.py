@@ -1,13 +1,12 @@
-import warnings
-
-from sqlalchemy import MetaData, select, and_, not_, or_, Table
+from sqlalchemy import select, and_, not_, or_, BigInteger, TEXT, cast, column, func, table
 
 from db import constants
 from db import types
+from db.catalog import get_catalog_table
 
 TYPES_SCHEMA = types.base.SCHEMA
 TEMP_INFER_SCHEMA = constants.INFERENCE_SCHEMA
-EXCLUDED_SCHEMATA = [TYPES_SCHEMA, TEMP_INFER_SCHEMA, "information_schema"]
+EXCLUDED_SCHEMATA = [TYPES_SCHEMA, TEMP_INFER_SCHEMA, constants.IMPORT_SCHEMA, "information_schema"]
 
 
 def reflect_schema(engine, name=None, oid=None):
@@ -16,10 +15,7 @@ def reflect_schema(engine, name=None, oid=None):
         assert name is None or oid is None
     except AssertionError as e:
         raise e
-    metadata = MetaData()
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_namespace = Table("pg_namespace", metadata, autoload_with=engine)
+    pg_namespace = get_catalog_table("pg_namespace", engine)
     sel = (
         select(pg_namespace.c.oid, pg_namespace.c.nspname.label("name"))
         .where(or_(pg_namespace.c.nspname == name, pg_namespace.c.oid == oid))
@@ -30,10 +26,7 @@ def reflect_schema(engine, name=None, oid=None):
 
 
 def get_mathesar_schemas_with_oids(engine):
-    metadata = MetaData()
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_namespace = Table("pg_namespace", metadata, autoload_with=engine)
+    pg_namespace = get_catalog_table("pg_namespace", engine)
     sel = (
         select(pg_namespace.c.nspname.label('schema'), pg_namespace.c.oid)
         .where(
@@ -46,3 +39,75 @@ def get_mathesar_schemas_with_oids(engine):
     with engine.begin() as conn:
         result = conn.execute(sel).fetchall()
     return result
+
+
+def get_mathesar_schema_objects(engine):
+    """
+    Returns the oid of every Mathesar schema, together with the oids of its
+    tables and the attnums of their columns, in a single catalog query.
+
+    Each row has schema_oid, table_oid and attnum; table_oid and attnum are
+    NULL for schemas without tables and tables without columns respectively.
+    """
+    pg_namespace = get_catalog_table("pg_namespace", engine)
+    pg_class = get_catalog_table("pg_class", engine)
+    pg_attribute = get_catalog_table("pg_attribute", engine)
+    sel = (
+        select(
+            pg_namespace.c.oid.label('schema_oid'),
+            pg_class.c.oid.label('table_oid'),
+            pg_attribute.c.attnum,
+        )
+        .select_from(
+            pg_namespace
+            .outerjoin(
+                pg_class,
+                and_(
+                    pg_class.c.relnamespace == pg_namespace.c.oid,
+                    pg_class.c.relkind == 'r'
+                )
+            )
+            .outerjoin(
+                pg_attribute,
+                and_(
+                    pg_attribute.c.attrelid == pg_class.c.oid,
+                    # Ignore system columns
+                    pg_attribute.c.attnum > 0,
+                    # Ignore removed columns
+                    pg_attribute.c.attisdropped.is_(False)
+                )
+            )
+        )
+        .where(
+            and_(
+                *[pg_namespace.c.nspname != schema for schema in EXCLUDED_SCHEMATA],
+                not_(pg_namespace.c.nspname.like("pg_%"))
+            )
+        )
+    )
+    with engine.begin() as conn:
+        result = conn.execute(sel).fetchall()
+    return result
+
+
+def get_catalog_fingerprint(engine):
+    """
+    Returns a tuple which changes whenever a schema, table, column or
+    constraint is created, altered or dropped.
+
+    Any DDL writes a new row version to at least one of these catalogs,
+    which changes the maximum xmin, and dropping an object changes the row
+    counts.
+    """
+    fingerprint_columns = []
+    for catalog_name in ['pg_namespace', 'pg_class', 'pg_attribute', 'pg_constraint']:
+        catalog = table(catalog_name, column('xmin'))
+        # xid has no ordering operators, so we compare it as a number.
+        xmin = cast(cast(catalog.c.xmin, TEXT), BigInteger)
+        fingerprint_columns.extend([
+            select(func.count()).select_from(catalog).scalar_subquery(),
+            select(func.max(xmin)).scalar_subquery(),
+        ])
+    with engine.begin() as conn:
+        result = conn.execute(select(*fingerprint_columns)).fetchone()
+    return tuple(result)
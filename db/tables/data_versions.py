@@ -0,0 +1,237 @@
+"""
+Tracks a version of the data of each table, which changes whenever rows of the table are
+inserted, updated, deleted or truncated, so that results computed from a table's records can be
+cached until the table's data changes, even when it's changed from outside Mathesar.
+
+Installing the tracking adds a statement-level trigger to each table, which bumps the table's
+version in a Mathesar-owned table, in the same transaction as the change.  Writers of a table
+briefly contend for its version row until they commit.  Tables without the trigger get an
+approximate version from the statistics collector instead, which lags behind writes by the
+statistics reporting delay and doesn't count TRUNCATE.
+"""
+import logging
+from weakref import WeakKeyDictionary
+
+from psycopg2.errors import InsufficientPrivilege
+from sqlalchemy import BigInteger, Column, MetaData, Table, and_, func, select, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.dialects.postgresql import OID
+
+from db.catalog import get_catalog_table
+from db.schemas.operations.select import EXCLUDED_SCHEMATA
+from db.types import base
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_TABLE_NAME = "table_data_versions"
+QUALIFIED_VERSIONS_TABLE = base.get_qualified_name(VERSIONS_TABLE_NAME)
+BUMP_VERSION_FUNCTION = base.get_qualified_name("bump_table_data_version")
+TRACK_NEW_TABLES_FUNCTION = base.get_qualified_name("track_new_table_data_versions")
+TRIGGER_NAME = "mathesar_data_version"
+EVENT_TRIGGER_NAME = "mathesar_track_new_table_data_versions"
+
+TRACKED_VERSION_PREFIX = "t"
+STATISTICS_VERSION_PREFIX = "s"
+
+# Engines of databases on which the tracking is known to be installed.
+_installed_engines = WeakKeyDictionary()
+
+
+def _get_excluded_schemata_sql():
+    return ", ".join(f"'{schema}'" for schema in EXCLUDED_SCHEMATA)
+
+
+def _get_create_trigger_sql(table_identity_sql):
+    return (
+        f"format('CREATE TRIGGER {TRIGGER_NAME} "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %s "
+        f"FOR EACH STATEMENT EXECUTE PROCEDURE {BUMP_VERSION_FUNCTION}()', {table_identity_sql})"
+    )
+
+
+def install(engine):
+    """
+    Installs the data version tracking on the database of the engine, and adds the version
+    trigger to all existing tables.  Tables created later get the trigger from an event trigger,
+    which can only be created by a superuser; without one, only the existing tables are tracked.
+    """
+    create_versions_table_query = f"""
+    CREATE TABLE IF NOT EXISTS {QUALIFIED_VERSIONS_TABLE} (
+        table_oid oid PRIMARY KEY,
+        version bigint NOT NULL DEFAULT 0
+    );
+    """
+
+    create_bump_version_function_query = f"""
+    CREATE OR REPLACE FUNCTION {BUMP_VERSION_FUNCTION}()
+    RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO {QUALIFIED_VERSIONS_TABLE} AS versions (table_oid, version)
+        VALUES (TG_RELID, 1)
+        ON CONFLICT (table_oid) DO UPDATE SET version = versions.version + 1;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    add_existing_table_triggers_query = f"""
+    DO $$
+    DECLARE
+        tbl regclass;
+    BEGIN
+        FOR tbl IN
+            SELECT pg_class.oid::regclass
+            FROM pg_class JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+            WHERE pg_class.relkind = 'r'
+            AND pg_namespace.nspname NOT IN ({_get_excluded_schemata_sql()})
+            AND pg_namespace.nspname NOT LIKE 'pg_%'
+            AND NOT EXISTS (
+                SELECT 1 FROM pg_trigger
+                WHERE pg_trigger.tgrelid = pg_class.oid AND pg_trigger.tgname = '{TRIGGER_NAME}'
+            )
+        LOOP
+            EXECUTE {_get_create_trigger_sql('tbl')};
+        END LOOP;
+    END;
+    $$;
+    """
+
+    create_track_new_tables_function_query = f"""
+    CREATE OR REPLACE FUNCTION {TRACK_NEW_TABLES_FUNCTION}()
+    RETURNS event_trigger AS $$
+    DECLARE
+        obj record;
+    BEGIN
+        FOR obj IN
+            SELECT * FROM pg_event_trigger_ddl_commands()
+            WHERE object_type = 'table'
+            AND schema_name NOT IN ({_get_excluded_schemata_sql()})
+            AND schema_name NOT LIKE 'pg_%'
+        LOOP
+            EXECUTE {_get_create_trigger_sql('obj.object_identity')};
+        END LOOP;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    drop_event_trigger_query = f"DROP EVENT TRIGGER IF EXISTS {EVENT_TRIGGER_NAME};"
+    create_event_trigger_query = f"""
+    CREATE EVENT TRIGGER {EVENT_TRIGGER_NAME} ON ddl_command_end
+    WHEN TAG IN ('CREATE TABLE', 'CREATE TABLE AS', 'SELECT INTO')
+    EXECUTE PROCEDURE {TRACK_NEW_TABLES_FUNCTION}();
+    """
+
+    with engine.begin() as conn:
+        conn.execute(text(create_versions_table_query))
+        conn.execute(text(create_bump_version_function_query))
+        conn.execute(text(add_existing_table_triggers_query))
+        conn.execute(text(create_track_new_tables_function_query))
+    _installed_engines[engine] = True
+    # Run separately, so that existing tables are tracked even if the event trigger can't be
+    # created.
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(drop_event_trigger_query))
+            conn.execute(text(create_event_trigger_query))
+    except ProgrammingError as e:
+        if not isinstance(e.orig, InsufficientPrivilege):
+            raise
+        logger.warning(
+            "Tables created from now on won't have their data versions tracked, as only a "
+            "superuser can create the event trigger tracking them."
+        )
+
+
+def track_table_data_version(table_oid, connection):
+    """
+    Adds the version trigger to the table with the given oid, if the tracking is installed and the
+    table doesn't have it yet.  The event trigger doesn't add it to tables created in Mathesar's own
+    schemata, so tables moved out of them are tracked with this.
+    """
+    installed = connection.execute(
+        select(func.to_regproc(BUMP_VERSION_FUNCTION))
+    ).scalar() is not None
+    if not installed:
+        return
+    pg_trigger = get_catalog_table("pg_trigger", connection.engine)
+    tracked = connection.execute(
+        select(pg_trigger.c.oid).where(
+            and_(pg_trigger.c.tgrelid == table_oid, pg_trigger.c.tgname == TRIGGER_NAME)
+        )
+    ).first() is not None
+    if not tracked:
+        create_trigger_statement = connection.execute(
+            text(f"SELECT {_get_create_trigger_sql('CAST(:table_oid AS regclass)')}"),
+            {"table_oid": table_oid},
+        ).scalar()
+        connection.execution_options(no_parameters=True).exec_driver_sql(create_trigger_statement)
+
+
+def _get_versions_table(engine):
+    """
+    Returns the table holding the tracked versions, or None if the tracking isn't installed.
+    """
+    if engine not in _installed_engines:
+        with engine.begin() as conn:
+            installed = conn.execute(
+                select(func.to_regclass(QUALIFIED_VERSIONS_TABLE))
+            ).scalar() is not None
+        if not installed:
+            return None
+        _installed_engines[engine] = True
+    return Table(
+        VERSIONS_TABLE_NAME,
+        MetaData(),
+        Column("table_oid", OID, primary_key=True),
+        Column("version", BigInteger),
+        schema=base.SCHEMA,
+    )
+
+
+def get_table_data_versions(table_oids, engine):
+    """
+    Returns the data versions of the tables with the given oids, keyed by oid.  Versions are
+    opaque strings, which are only meant to be compared for equality.  A table's version is None
+    if it can't be told, e.g. if the table doesn't exist.
+    """
+    table_oids = list(table_oids)
+    if not table_oids:
+        return {}
+    pg_class = get_catalog_table("pg_class", engine)
+    pg_trigger = get_catalog_table("pg_trigger", engine)
+    pg_stat_user_tables = get_catalog_table("pg_stat_user_tables", engine)
+    versions_table = _get_versions_table(engine)
+    columns = [
+        pg_class.c.oid,
+        pg_trigger.c.oid.isnot(None).label("tracked"),
+        pg_stat_user_tables.c.n_tup_ins,
+        pg_stat_user_tables.c.n_tup_upd,
+        pg_stat_user_tables.c.n_tup_del,
+    ]
+    from_clause = (
+        pg_class
+        .outerjoin(
+            pg_trigger,
+            and_(pg_trigger.c.tgrelid == pg_class.c.oid, pg_trigger.c.tgname == TRIGGER_NAME)
+        )
+        .outerjoin(pg_stat_user_tables, pg_stat_user_tables.c.relid == pg_class.c.oid)
+    )
+    if versions_table is not None:
+        columns.append(versions_table.c.version)
+        from_clause = from_clause.outerjoin(
+            versions_table, versions_table.c.table_oid == pg_class.c.oid
+        )
+    query = select(*columns).select_from(from_clause).where(pg_class.c.oid.in_(table_oids))
+    with engine.begin() as conn:
+        rows = conn.execute(query).fetchall()
+
+    versions = {table_oid: None for table_oid in table_oids}
+    for row in rows:
+        if row.tracked and versions_table is not None:
+            # Tables are only in the versions table once they've been written to.
+            versions[row.oid] = f"{TRACKED_VERSION_PREFIX}{row.version or 0}"
+        elif row.n_tup_ins is not None:
+            versions[row.oid] = (
+                f"{STATISTICS_VERSION_PREFIX}{row.n_tup_ins}.{row.n_tup_upd}.{row.n_tup_del}"
+            )
+    return versions
@@ -1,10 +1,19 @@
+import itertools
+
 from alembic.migration import MigrationContext
 from alembic.operations import Operations
 
+from sqlalchemy import and_, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import OID, REGCLASS
+
+from db.catalog import get_catalog_table
 from db.columns.operations.alter import batch_update_columns
+from db.tables.data_versions import track_table_data_version
 from db.tables.operations.select import reflect_table
 
 SUPPORTED_TABLE_ALTER_ARGS = {'name', 'columns'}
+# Postgres truncates longer identifiers to this many bytes.
+MAX_IDENTIFIER_BYTES = 63
 
 
 def rename_table(name, schema, engine, rename_to):
@@ -24,3 +33,99 @@ def alter_table(table_name, table_oid, schema, engine, update_data):
         rename_table(table_name, schema, engine, update_data['name'])
     if 'columns' in update_data:
         batch_update_columns(table_oid, engine, update_data['columns'])
+
+
+def publish_staging_table(staging_name, staging_schema, name, schema, engine):
+    """
+    Turns the unlogged staging table into a logged table with the given name
+    in the given schema.  The constraints, indexes and sequences named after
+    the staging table are renamed after the table, as if it had been created
+    with its name.  It's done in a single transaction, so the table only ever
+    appears complete.  Returns the oid of the table.
+    """
+    quote = engine.dialect.identifier_preparer.quote_identifier
+    staging_table = f"{quote(staging_schema)}.{quote(staging_name)}"
+    moved_table = f"{quote(schema)}.{quote(staging_name)}"
+    table = f"{quote(schema)}.{quote(name)}"
+    with engine.begin() as conn:
+        # Table names are quoted by hand, so they mustn't be taken as
+        # parameter placeholders.
+        ddl_conn = conn.execution_options(no_parameters=True)
+        ddl_conn.exec_driver_sql(f"ALTER TABLE {staging_table} SET LOGGED")
+        ddl_conn.exec_driver_sql(f"ALTER TABLE {staging_table} SET SCHEMA {quote(schema)}")
+        ddl_conn.exec_driver_sql(f"ALTER TABLE {moved_table} RENAME TO {quote(name)}")
+        table_oid = conn.execute(select(cast(cast(literal(table), REGCLASS), OID))).scalar()
+        staging_prefix = f"{staging_name}_"
+        # Renaming the constraint of a primary key or unique index renames
+        # the index as well, so the constraints are renamed first.
+        for constraint_name in _get_constraint_names(table_oid, conn):
+            if constraint_name.startswith(staging_prefix):
+                new_name = _choose_relation_name(name, constraint_name[len(staging_prefix):], schema, conn)
+                ddl_conn.exec_driver_sql(
+                    f"ALTER TABLE {table} RENAME CONSTRAINT {quote(constraint_name)} TO {quote(new_name)}"
+                )
+        for relation_name, kind in _get_dependent_relation_names(table_oid, conn):
+            if relation_name.startswith(staging_prefix):
+                new_name = _choose_relation_name(name, relation_name[len(staging_prefix):], schema, conn)
+                ddl_conn.exec_driver_sql(
+                    f"ALTER {kind} {quote(schema)}.{quote(relation_name)} RENAME TO {quote(new_name)}"
+                )
+        track_table_data_version(table_oid, conn)
+    return table_oid
+
+
+def _get_constraint_names(table_oid, connection):
+    pg_constraint = get_catalog_table("pg_constraint", connection.engine)
+    query = select(pg_constraint.c.conname).where(pg_constraint.c.conrelid == table_oid)
+    return [row.conname for row in connection.execute(query)]
+
+
+def _get_dependent_relation_names(table_oid, connection):
+    """
+    Returns the names of the indexes and sequences of the table with the given
+    oid, along with the kind of each, as used in ALTER statements.
+    """
+    pg_class = get_catalog_table("pg_class", connection.engine)
+    pg_index = get_catalog_table("pg_index", connection.engine)
+    pg_depend = get_catalog_table("pg_depend", connection.engine)
+    index_query = (
+        select(pg_class.c.relname)
+        .select_from(pg_class.join(pg_index, pg_index.c.indexrelid == pg_class.c.oid))
+        .where(pg_index.c.indrelid == table_oid)
+    )
+    # Sequences of serial and identity columns depend on the table.
+    sequence_query = (
+        select(pg_class.c.relname)
+        .select_from(pg_class.join(pg_depend, pg_depend.c.objid == pg_class.c.oid))
+        .where(
+            and_(
+                pg_depend.c.refobjid == table_oid,
+                pg_depend.c.deptype.in_(['a', 'i']),
+                pg_class.c.relkind == 'S',
+            )
+        )
+    )
+    return (
+        [(row.relname, 'INDEX') for row in connection.execute(index_query)]
+        + [(row.relname, 'SEQUENCE') for row in connection.execute(sequence_query)]
+    )
+
+
+def _choose_relation_name(table_name, label, schema, connection):
+    """
+    Returns an unused name in the schema for a relation of the table with the
+    given name, like Postgres chooses them, e.g. "<table_name>_pkey", or
+    "<table_name>_pkey1" if that's taken.  The table name is truncated so that
+    the label fits.
+    """
+    quote = connection.engine.dialect.identifier_preparer.quote_identifier
+    for attempt in itertools.count():
+        numbered_label = label if attempt == 0 else f"{label}{attempt}"
+        max_table_name_bytes = MAX_IDENTIFIER_BYTES - len(numbered_label.encode()) - 1
+        truncated_table_name = table_name.encode()[:max_table_name_bytes].decode(errors='ignore')
+        name = f"{truncated_table_name}_{numbered_label}"
+        taken = connection.execute(
+            select(func.to_regclass(f"{quote(schema)}.{quote(name)}"))
+        ).scalar() is not None
+        if not taken:
+            return name
@@ -4,13 +4,15 @@ from sqlalchemy.schema import DDLElement
 
 from db.columns.utils import init_mathesar_table_column_list_with_defaults
 from db.schemas.operations.create import create_schema
+from db.types.operations.cast import get_supported_alter_column_types
 
 
-def create_mathesar_table(name, schema, columns, engine, metadata=None):
+def create_mathesar_table(name, schema, columns, engine, metadata=None, unlogged=False):
     """
     This method creates a Postgres table in the specified schema using the
     given name and column list.  It adds internal mathesar columns to the
-    table.
+    table.  Unlogged tables are faster to write to, but are emptied after a
+    crash.
     """
     columns = init_mathesar_table_column_list_with_defaults(columns)
     create_schema(schema, engine)
@@ -23,22 +25,54 @@ def create_mathesar_table(name, schema, columns, engine, metadata=None):
         name,
         metadata,
         *columns,
-        schema=schema
+        schema=schema,
+        prefixes=["UNLOGGED"] if unlogged else [],
     )
     table.create(engine)
     return table
 
 
-def create_string_column_table(name, schema, column_names, engine):
+def create_string_column_table(name, schema, column_names, engine, unlogged=False):
     """
     This method creates a Postgres table in the specified schema, with all
     columns being String type.
     """
     columns_ = [Column(name=column_name, type_=TEXT) for column_name in column_names]
-    table = create_mathesar_table(name, schema, columns_, engine)
+    table = create_mathesar_table(name, schema, columns_, engine, unlogged=unlogged)
     return table
 
 
+def create_typed_column_table(name, schema, column_names, column_types, engine, unlogged=False):
+    """
+    This method creates a Postgres table in the specified schema, with the
+    columns having the given types, which are named like the types given to
+    alter_column_type.
+    """
+    supported_types = get_supported_alter_column_types(engine)
+    columns_ = [
+        Column(name=column_name, type_=supported_types[column_type])
+        for column_name, column_type in zip(column_names, column_types)
+    ]
+    table = create_mathesar_table(name, schema, columns_, engine, unlogged=unlogged)
+    return table
+
+
+def check_table_name_available(name, schema, engine):
+    """
+    Raises the error that creating a table with the given name in the given
+    schema would raise if the name is taken, e.g. before a long import into a
+    staging table which is renamed at the end.  The table is only created
+    within a transaction which is rolled back.
+    """
+    quote = engine.dialect.identifier_preparer.quote_identifier
+    with engine.connect() as conn:
+        with conn.begin() as transaction:
+            conn.execution_options(no_parameters=True).exec_driver_sql(
+                f"CREATE TABLE {quote(schema)}.{quote(name)} ()"
+            )
+            transaction.rollback()
+
+
 class CreateTableAs(DDLElement):
     def __init__(self, name, selectable):
         self.name = name
@@ -3,7 +3,7 @@ from sqlalchemy.ext import compiler
 from sqlalchemy.exc import NoSuchTableError, InternalError
 from psycopg2.errors import DependentObjectsStillExist
 
-from db.tables.operations.select import reflect_table
+from db.tables.operations.select import get_oid_from_table, invalidate_reflected_table, reflect_table
 
 
 class DropTableCascade(DropTable):
@@ -29,6 +29,7 @@ def drop_table(name, schema, engine, cascade=False, if_exists=False):
             return
         else:
             raise
+    table_oid = get_oid_from_table(name, schema, engine)
     with engine.begin() as conn:
         try:
             conn.execute(DropTableCascade(table, cascade=cascade))
@@ -37,3 +38,4 @@ def drop_table(name, schema, engine, cascade=False, if_exists=False):
                 raise e.orig
             else:
                 raise e
+    invalidate_reflected_table(table_oid, engine)
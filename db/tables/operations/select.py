@@ -1,7 +1,11 @@
-import warnings
+from weakref import WeakKeyDictionary
 
-from sqlalchemy import Table, MetaData, select, join, inspect, and_
+from sqlalchemy import (
+    Table, MetaData, select, join, inspect, and_, case, func, cast, Integer, BigInteger, TEXT,
+    column, table,
+)
 
+from db.catalog import get_catalog_table
 from db.utils import execute_statement
 
 
@@ -12,35 +16,99 @@ def reflect_table(name, schema, engine, metadata=None, connection_to_use=None):
     return Table(name, metadata, schema=schema, autoload_with=autoload_with, extend_existing=True)
 
 
-def reflect_table_from_oid(oid, engine, connection_to_use=None):
-    metadata = MetaData()
+# Tables reflected by reflect_table_from_oid, cached per engine and keyed by
+# table oid. An entry is only used while both the table's version (bumped by
+# invalidate_reflected_table after DDL) and its catalog signature (which
+# catches DDL run from elsewhere) still match.
+_reflected_tables = WeakKeyDictionary()
+_reflected_table_versions = WeakKeyDictionary()
+REFLECTED_TABLES_MAX_SIZE = 512
 
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_class = Table("pg_class", metadata, autoload_with=engine)
-        pg_namespace = Table("pg_namespace", metadata, autoload_with=engine)
-    sel = (
-        select(pg_namespace.c.nspname, pg_class.c.relname)
+
+def invalidate_reflected_table(oid, engine):
+    """
+    Must be called after DDL altering or dropping the table with the given
+    oid, so the next reflect_table_from_oid call doesn't return the cached
+    table. This
+    matters within a transaction, where several statements can leave the
+    catalog signature unchanged.
+    """
+    versions = _reflected_table_versions.setdefault(engine, {})
+    versions[oid] = versions.get(oid, 0) + 1
+    # The cached table is stale, so it's freed right away rather than when
+    # it's evicted, along with the compiled queries kept on it.
+    _reflected_tables.get(engine, {}).pop(oid, None)
+
+
+def _get_table_signature_query(oid):
+    pg_class = table(
+        'pg_class', column('oid'), column('xmin'), column('relname'), column('relnamespace')
+    )
+    pg_namespace = table('pg_namespace', column('oid'), column('nspname'))
+    signature_columns = [
+        pg_namespace.c.nspname,
+        pg_class.c.relname,
+        cast(pg_class.c.xmin, TEXT),
+    ]
+    for catalog_name, relation_column_name in [
+        ('pg_attribute', 'attrelid'),
+        ('pg_attrdef', 'adrelid'),
+        ('pg_constraint', 'conrelid'),
+        ('pg_index', 'indrelid'),
+    ]:
+        catalog = table(catalog_name, column('xmin'), column(relation_column_name))
+        where_clause = catalog.c[relation_column_name] == oid
+        # xid has no ordering operators, so we compare it as a number.
+        xmin = cast(cast(catalog.c.xmin, TEXT), BigInteger)
+        signature_columns.extend([
+            select(func.count()).select_from(catalog).where(where_clause).scalar_subquery(),
+            select(func.max(xmin)).where(where_clause).scalar_subquery(),
+        ])
+    return (
+        select(*signature_columns)
         .select_from(
-            join(
-                pg_class,
-                pg_namespace,
-                pg_class.c.relnamespace == pg_namespace.c.oid
-            )
+            join(pg_class, pg_namespace, pg_class.c.relnamespace == pg_namespace.c.oid)
         )
         .where(pg_class.c.oid == oid)
     )
-    result = execute_statement(engine, sel, connection_to_use)
-    schema, table_name = result.fetchall()[0]
-    return reflect_table(table_name, schema, engine, connection_to_use=connection_to_use)
 
 
-def get_table_oids_from_schema(schema_oid, engine):
-    metadata = MetaData()
+def reflect_table_from_oid(oid, engine, connection_to_use=None):
+    versions = _reflected_table_versions.setdefault(engine, {})
+    tables = _reflected_tables.setdefault(engine, {})
+    # The version is read before reflecting, so that an invalidation which
+    # happens while we reflect makes the new entry stale.
+    version = versions.get(oid, 0)
+    result = execute_statement(engine, _get_table_signature_query(oid), connection_to_use)
+    signature = tuple(result.fetchall()[0])
+    cached = tables.get(oid)
+    if cached is not None and cached[:2] == (version, signature):
+        return cached[2]
+    schema, table_name = signature[:2]
+    sa_table = reflect_table(table_name, schema, engine, connection_to_use=connection_to_use)
+    tables.pop(oid, None)
+    if len(tables) >= REFLECTED_TABLES_MAX_SIZE:
+        # Evict the least recently reflected table
+        tables.pop(next(iter(tables)))
+    tables[oid] = (version, signature, sa_table)
+    return sa_table
+
+
+def get_table_schema_version(oid, engine):
+    """
+    Returns a string which changes whenever the table with the given oid, or
+    its columns, defaults, constraints or indexes, are altered, or None if the
+    table doesn't exist.
+    """
+    result = execute_statement(engine, _get_table_signature_query(oid))
+    rows = result.fetchall()
+    if not rows:
+        return None
+    return '.'.join(str(value) for value in rows[0])
 
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", message="Did not recognize type")
-        pg_class = Table("pg_class", metadata, autoload_with=engine)
+
+def get_table_oids_from_schema(schema_oid, engine):
+    pg_class = get_catalog_table("pg_class", engine)
     sel = (
         select(pg_class.c.oid)
         .where(
@@ -52,6 +120,33 @@ def get_table_oids_from_schema(schema_oid, engine):
     return table_oids
 
 
+def get_estimated_row_count(table_oid, engine):
+    """
+    Returns the number of rows of the table estimated from the planner
+    statistics, scaled by the current size of the table as the planner does.
+    This avoids scanning the whole table, but may be inaccurate.  Returns
+    None if the table has never been analyzed.
+    """
+    pg_class = get_catalog_table("pg_class", engine)
+    current_pages = (
+        func.pg_relation_size(pg_class.c.oid)
+        / cast(func.current_setting('block_size'), Integer)
+    )
+    sel = (
+        select(
+            case(
+                (pg_class.c.reltuples < 0, None),
+                (pg_class.c.relpages == 0, pg_class.c.reltuples),
+                else_=pg_class.c.reltuples / pg_class.c.relpages * current_pages
+            )
+        )
+        .where(pg_class.c.oid == table_oid)
+    )
+    with engine.begin() as conn:
+        estimate = conn.execute(sel).scalar()
+    return int(estimate) if estimate is not None else None
+
+
 def get_oid_from_table(name, schema, engine):
     inspector = inspect(engine)
     return inspector.get_table_oid(name, schema=schema)
@@ -7,7 +7,8 @@ from db.tests.types import fixtures
 from db.columns.exceptions import DynamicDefaultWarning
 from db.columns.operations.select import (
     get_column_attnum_from_name, get_column_default, _is_default_expr_dynamic,
-    get_column_name_from_attnum, get_columns_attnum_from_names,
+    get_column_name_from_attnum, get_columns_attnum_from_names, get_column_names_by_attnum,
+    get_column_default_dicts,
 )
 from db.tables.operations.select import get_oid_from_table
 from db.tests.columns.utils import column_test_dict, get_default
@@ -54,6 +55,43 @@ def test_get_attnum_from_names(engine_with_schema):
     assert get_column_name_from_attnum(table_oid, columns_attnum[1], engine) == one_name
 
 
+def test_get_column_names_by_attnum(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_name = "table_with_columns"
+    table = Table(
+        table_name,
+        MetaData(bind=engine, schema=schema),
+        Column("colzero", Integer),
+        Column("colone", String),
+        Column("coltwo", String),
+    )
+    table.create()
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE "{schema}"."{table_name}" DROP COLUMN colone;'))
+    table_oid = get_oid_from_table(table_name, schema, engine)
+    assert get_column_names_by_attnum(table_oid, engine) == {1: "colzero", 3: "coltwo"}
+
+
+def test_get_column_default_dicts(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_name = "get_column_default_dicts_table"
+    table = Table(
+        table_name,
+        MetaData(bind=engine, schema=schema),
+        Column("no_default", Integer),
+        Column("static_default", Integer, server_default="5"),
+        Column("string_default", String, server_default="abc"),
+        Column("dynamic_default", DateTime, server_default=func.now()),
+    )
+    table.create()
+    table_oid = get_oid_from_table(table_name, schema, engine)
+    default_dicts = get_column_default_dicts(table_oid, engine)
+    assert default_dicts[1] is None
+    assert default_dicts[2] == {"value": 5, "is_dynamic": False}
+    assert default_dicts[3] == {"value": "abc", "is_dynamic": False}
+    assert default_dicts[4]["is_dynamic"] is True
+
+
 @pytest.mark.parametrize("filler", [True, False])
 @pytest.mark.parametrize("col_type", column_test_dict.keys())
 def test_get_column_default(engine_email_type, filler, col_type):
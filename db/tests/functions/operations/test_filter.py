@@ -4,9 +4,7 @@ import pytest
 from db.utils import execute_query
 
 from db.functions.base import (
-    ColumnName, Not, Literal, Empty, Equal, Greater, And, Or, StartsWith, Contains, StartsWithCaseInsensitive, ContainsCaseInsensitive
-)
-from db.functions.packed import (
+    ColumnName, Not, Literal, Empty, Equal, Greater, And, Or, StartsWith, Contains, StartsWithCaseInsensitive, ContainsCaseInsensitive,
     GreaterOrEqual, LesserOrEqual
 )
 from db.functions.operations.apply import apply_db_function_as_filter
@@ -216,6 +214,9 @@ def test_filtering_booleans(boolean_table_obj, column_name, main_db_function, li
 @pytest.mark.parametrize("column_name,main_db_function,literal_param,expected_count", [
     ("Student Name", StartsWithCaseInsensitive, "stephanie", 15),
     ("Student Name", StartsWith, "stephanie", 0),
+    # LIKE wildcards in literals are matched literally
+    ("Student Name", StartsWithCaseInsensitive, "%", 0),
+    ("Student Name", ContainsCaseInsensitive, "_", 0),
     ("Student Name", ContainsCaseInsensitive, "JUAREZ", 5),
     ("Student Name", Contains, "juarez", 0),
 ])
@@ -0,0 +1,55 @@
+import pytest
+
+from db.functions.base import (
+    And, ColumnName, Empty, Equal, Greater, GreaterOrEqual, Lesser, LesserOrEqual, Literal, Not,
+    Or, StartsWith, ToLowercase
+)
+from db.functions.operations.optimize import optimize_db_function
+from db.types.email import EmailDomainEquals, ExtractEmailDomain
+
+
+col = ColumnName(['col'])
+other_col = ColumnName(['other_col'])
+value = Literal(['value'])
+
+
+optimize_test_list = [
+    # `<` or `=` is collapsed, whichever way round the Equal is
+    (Or([Lesser([col, value]), Equal([col, value])]), LesserOrEqual([col, value])),
+    (Or([Equal([value, col]), Greater([col, value])]), GreaterOrEqual([col, value])),
+    (
+        Or([Lesser([col, value]), Equal([col, value]), Greater([col, value])]),
+        Or([LesserOrEqual([col, value]), Greater([col, value])]),
+    ),
+    (
+        Or([Lesser([col, value]), Equal([other_col, value])]),
+        Or([Lesser([col, value]), Equal([other_col, value])]),
+    ),
+    # nested And and Or are flattened, and duplicates dropped
+    (
+        And([And([Empty([col]), Empty([other_col])]), Empty([col])]),
+        And([Empty([col]), Empty([other_col])]),
+    ),
+    (
+        Or([Empty([col]), And([Empty([col]), Empty([other_col])])]),
+        Or([Empty([col]), And([Empty([col]), Empty([other_col])])]),
+    ),
+    (And([Empty([col]), Empty([col])]), Empty([col])),
+    # literals are folded
+    (And([Empty([col]), Literal([True])]), Empty([col])),
+    (And([Empty([col]), Literal([False])]), Literal([False])),
+    (Or([Empty([col]), Literal([True])]), Literal([True])),
+    (Or([Empty([col]), Literal([False])]), Empty([col])),
+    (Not([Literal([True])]), Literal([False])),
+    (Not([Not([Empty([col])])]), Empty([col])),
+    (Empty([Literal([None])]), Literal([True])),
+    (StartsWith([col, ToLowercase([Literal(['ABC'])])]), StartsWith([col, Literal(['abc'])])),
+    (StartsWith([col, ToLowercase([Literal(['ÀBC'])])]), StartsWith([col, ToLowercase([Literal(['ÀBC'])])])),
+    # packed functions are unpacked
+    (EmailDomainEquals([col, value]), Equal([ExtractEmailDomain([col]), value])),
+]
+
+
+@pytest.mark.parametrize("db_function,expected_db_function", optimize_test_list)
+def test_optimize_db_function(db_function, expected_db_function):
+    assert optimize_db_function(db_function) == expected_db_function
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select
+
+from db.records import exceptions as records_exceptions
+from db.records.operations import aggregate, group
+
+
+def test_aggregate_validate_passes_count_without_column():
+    aggregate.Aggregate(aggregate.AggregateFunction.COUNT.value).validate()
+
+
+def test_aggregate_validate_fails_invalid_function():
+    agg = aggregate.Aggregate('median', 'Grade')
+    with pytest.raises(records_exceptions.BadAggregateFormat):
+        agg.validate()
+
+
+def test_aggregate_validate_fails_missing_column():
+    agg = aggregate.Aggregate(aggregate.AggregateFunction.SUM.value)
+    with pytest.raises(records_exceptions.BadAggregateFormat):
+        agg.validate()
+
+
+def test_aggregate_invalid_column(roster_table_obj):
+    roster, _ = roster_table_obj
+    agg = aggregate.Aggregate(aggregate.AggregateFunction.SUM.value, 'notintable')
+    with pytest.raises(records_exceptions.AggregateFieldNotFound):
+        agg.get_validated_expression(roster)
+
+
+def test_get_aggregate_query_distinct(roster_table_obj):
+    roster, engine = roster_table_obj
+    group_by = group.GroupBy(['Subject'])
+    aggregates = [
+        aggregate.Aggregate(aggregate.AggregateFunction.COUNT.value),
+        aggregate.Aggregate(aggregate.AggregateFunction.MAX.value, 'Grade'),
+        aggregate.Aggregate(aggregate.AggregateFunction.SUM.value, 'Grade'),
+    ]
+    query = aggregate.get_aggregate_query(roster, group_by, aggregates)
+    with engine.begin() as conn:
+        res = [aggregate.extract_aggregates(row, 3) for row in conn.execute(query)]
+        records = conn.execute(select(roster)).fetchall()
+
+    subjects = sorted({record['Subject'] for record in records})
+    assert [group_id for group_id, _ in res] == list(range(1, len(subjects) + 1))
+    for subject, (_, (count, max_grade, sum_grade)) in zip(subjects, res):
+        grades = [record['Grade'] for record in records if record['Subject'] == subject]
+        assert count == len(grades)
+        assert max_grade == max(grades)
+        assert sum_grade == sum(grades)
+
+
+def test_get_aggregate_query_paginates_groups(roster_table_obj):
+    roster, engine = roster_table_obj
+    group_by = group.GroupBy(
+        ['Grade'], mode=group.GroupMode.PERCENTILE.value, num_groups=10
+    )
+    aggregates = [aggregate.Aggregate(aggregate.AggregateFunction.COUNT.value)]
+    query = aggregate.get_aggregate_query(roster, group_by, aggregates)
+    page_query = aggregate.get_aggregate_query(roster, group_by, aggregates, limit=3, offset=2)
+    count_query = aggregate.get_group_count_query(roster, group_by)
+    with engine.begin() as conn:
+        res = [aggregate.extract_aggregates(row, 1) for row in conn.execute(query)]
+        page_res = [aggregate.extract_aggregates(row, 1) for row in conn.execute(page_query)]
+        group_count = conn.execute(count_query).scalar()
+    assert page_res == res[2:5]
+    assert group_count == len(res)
+    assert sum(count for _, (count,) in res) == 1000
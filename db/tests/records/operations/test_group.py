@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import Column
+from sqlalchemy import Column, Integer, MetaData, Table
 
 from db.records.operations import group
 from db.records import exceptions as records_exceptions
@@ -10,11 +10,10 @@ def roster_distinct_setup(roster_table_obj):
     roster, engine = roster_table_obj
     input_cols = ['Student Number', 'Student Email']
     gb = group.GroupBy(columns=input_cols)
-    grouping_columns = gb.get_validated_group_by_columns(roster)
-    sel = group._get_distinct_group_select(roster, grouping_columns)
+    sel = group.get_group_augmented_records_query(roster, gb)
     with engine.begin() as conn:
         res = conn.execute(sel).fetchall()
-    return res
+    return res, _get_group_summaries(roster, engine, gb, res)
 
 
 @pytest.fixture
@@ -26,12 +25,10 @@ def roster_percentile_subj_grade_setup(roster_table_obj):
         mode=group.GroupMode.PERCENTILE.value,
         num_groups=12
     )
-    grouping_columns = group_by.get_validated_group_by_columns(roster)
-    num_groups = group_by.num_groups
-    sel = group._get_percentile_range_group_select(roster, grouping_columns, num_groups)
+    sel = group.get_group_augmented_records_query(roster, group_by)
     with engine.begin() as conn:
         res = conn.execute(sel).fetchall()
-    return res
+    return res, _get_group_summaries(roster, engine, group_by, res)
 
 
 @pytest.fixture
@@ -40,39 +37,21 @@ def record_dictionary_list():
         {
             'data': {
                 'id': 1, 'Center': 'NASA KSC', 'Status': 'Application', 'Case Number': 'KSC-12871',
-                '__mathesar_group_metadata': {
-                    'group_id': 15, 'count': 29,
-                    'first_value': {'Center': 'NASA KSC', 'Status': 'Application'},
-                    'last_value': {'Center': 'NASA KSC', 'Status': 'Application'},
-                    'less_than_eq_value': None, 'greater_than_eq_value': None,
-                    'less_than_value': None, 'greater_than_value': None,
-                }
+                '__mathesar_group_id': 15,
             },
             'metadata': {}
         },
         {
             'data': {
                 'id': 2, 'Center': 'NASA ARC', 'Status': 'Issued', 'Case Number': 'ARC-14048-1',
-                '__mathesar_group_metadata': {
-                    'group_id': 2, 'count': 100,
-                    'first_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'last_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'less_than_eq_value': None, 'greater_than_eq_value': None,
-                    'less_than_value': None, 'greater_than_value': None,
-                }
+                '__mathesar_group_id': 2,
             },
             'metadata': {}
         },
         {
             'data': {
                 'id': 3, 'Center': 'NASA ARC', 'Status': 'Issued', 'Case Number': 'ARC-14231-1',
-                '__mathesar_group_metadata': {
-                    'group_id': 2, 'count': 100,
-                    'first_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'last_value': {'Center': 'NASA ARC', 'Status': 'Issued'},
-                    'less_than_eq_value': None, 'greater_than_eq_value': None,
-                    'less_than_value': None, 'greater_than_value': None,
-                }
+                '__mathesar_group_id': 2,
             },
             'metadata': {}
         }
@@ -161,24 +140,37 @@ def test_GB_get_valid_group_by_columns_invalid_col(roster_table_obj):
         gb.get_validated_group_by_columns(roster)
 
 
-def _group_first_val(row):
-    return row[group.MATHESAR_GROUP_METADATA][group.GroupMetadataField.FIRST_VALUE.value]
+def _get_group_summaries(table, engine, group_by, res):
+    summary_query = group.get_group_summary_query(
+        table, group_by, group.get_group_ids(res)
+    )
+    with engine.begin() as conn:
+        summaries = conn.execute(summary_query).fetchall()
+    return {
+        summary[group.MATHESAR_GROUP_METADATA][group.GroupMetadataField.GROUP_ID.value]:
+        summary[group.MATHESAR_GROUP_METADATA]
+        for summary in summaries
+    }
+
+
+def _group_first_val(row, summaries):
+    return summaries[_group_id(row)][group.GroupMetadataField.FIRST_VALUE.value]
 
 
-def _group_last_val(row):
-    return row[group.MATHESAR_GROUP_METADATA][group.GroupMetadataField.LAST_VALUE.value]
+def _group_last_val(row, summaries):
+    return summaries[_group_id(row)][group.GroupMetadataField.LAST_VALUE.value]
 
 
-def _group_geq_value(row):
-    return row[group.MATHESAR_GROUP_METADATA][group.GroupMetadataField.GEQ_VALUE.value]
+def _group_geq_value(row, summaries):
+    return summaries[_group_id(row)][group.GroupMetadataField.GEQ_VALUE.value]
 
 
-def _group_lt_value(row):
-    return row[group.MATHESAR_GROUP_METADATA][group.GroupMetadataField.LT_VALUE.value]
+def _group_lt_value(row, summaries):
+    return summaries[_group_id(row)][group.GroupMetadataField.LT_VALUE.value]
 
 
 def _group_id(row):
-    return row[group.MATHESAR_GROUP_METADATA][group.GroupMetadataField.GROUP_ID.value]
+    return row[group.MATHESAR_GROUP_ID]
 
 
 basic_group_modes = [
@@ -196,10 +188,12 @@ def test_get_group_augmented_records_query_metadata_fields(roster_table_obj, gro
     augmented_query = group.get_group_augmented_records_query(roster, group_by)
     with engine.begin() as conn:
         res = conn.execute(augmented_query).fetchall()
-    for row in res:
+    summaries = _get_group_summaries(roster, engine, group_by, res)
+    assert set(summaries) == {_group_id(row) for row in res}
+    for summary in summaries.values():
         assert all(
             [
-                metadata_field.value in row[group.MATHESAR_GROUP_METADATA]
+                metadata_field.value in summary
                 for metadata_field in group.GroupMetadataField
             ]
         )
@@ -211,10 +205,11 @@ def test_smoke_get_group_augmented_records_query_magnitude(magnitude_table_obj):
     augmented_query = group.get_group_augmented_records_query(magnitude, group_by)
     with engine.begin() as conn:
         res = conn.execute(augmented_query).fetchall()
-    for row in res:
+    summaries = _get_group_summaries(magnitude, engine, group_by, res)
+    for summary in summaries.values():
         assert all(
             [
-                metadata_field.value in row[group.MATHESAR_GROUP_METADATA]
+                metadata_field.value in summary
                 for metadata_field in group.GroupMetadataField
             ]
         )
@@ -281,7 +276,9 @@ magnitude_gt_zero = ['id', 'big_num', 'big_int', 'pm_seq', 'tens_seq']
 
 magnitude_columns = magnitude_lt_zero + magnitude_gt_zero
 
-magnitude_max_group_ids = [30, 87, 21, 85, 90, 21, 21]
+# Magnitude group ids count the groups from the one of the smallest value,
+# including any empty groups in between.
+magnitude_max_group_ids = [30, 99, 21, 101, 101, 21, 21]
 
 
 @pytest.mark.parametrize('col_name,num', zip(magnitude_columns, magnitude_max_group_ids))
@@ -310,13 +307,14 @@ def test_magnitude_group_select_bounds_chain(magnitude_table_obj, col_name):
     augmented_query = group.get_group_augmented_records_query(magnitude, group_by)
     with engine.begin() as conn:
         res = conn.execute(augmented_query).fetchall()
+    summaries = _get_group_summaries(magnitude, engine, group_by, res)
 
     for i in range(len(res) - 1):
         assert (
-            _group_lt_value(res[i])[col_name] <= _group_geq_value(res[i + 1])[col_name]
+            _group_lt_value(res[i], summaries)[col_name] <= _group_geq_value(res[i + 1], summaries)[col_name]
             or (
-                _group_lt_value(res[i]) == _group_lt_value(res[i + 1])
-                and _group_geq_value(res[i]) == _group_geq_value(res[i + 1])
+                _group_lt_value(res[i], summaries) == _group_lt_value(res[i + 1], summaries)
+                and _group_geq_value(res[i], summaries) == _group_geq_value(res[i + 1], summaries)
             )
         )
 
@@ -331,11 +329,12 @@ def test_magnitude_group_select_bounds_pretty(magnitude_table_obj, col_name):
     augmented_query = group.get_group_augmented_records_query(magnitude, group_by)
     with engine.begin() as conn:
         res = conn.execute(augmented_query).fetchall()
+    summaries = _get_group_summaries(magnitude, engine, group_by, res)
 
     for row in res:
         assert (
-            len(str(_group_lt_value(row)[col_name])) <= 7
-            and len(str(_group_geq_value(row)[col_name])) <= 7
+            len(str(_group_lt_value(row, summaries)[col_name])) <= 7
+            and len(str(_group_geq_value(row, summaries)[col_name])) <= 7
         )
 
 
@@ -349,26 +348,27 @@ def test_magnitude_group_select_inside_bounds(magnitude_table_obj, col_name):
     augmented_query = group.get_group_augmented_records_query(magnitude, group_by)
     with engine.begin() as conn:
         res = conn.execute(augmented_query).fetchall()
+    summaries = _get_group_summaries(magnitude, engine, group_by, res)
 
     for row in res:
         assert (
-            row[col_name] < _group_lt_value(row)[col_name]
-            and row[col_name] >= _group_geq_value(row)[col_name]
+            row[col_name] < _group_lt_value(row, summaries)[col_name]
+            and row[col_name] >= _group_geq_value(row, summaries)[col_name]
         )
 
 
 def test_get_distinct_group_select_correct_first_last_row_match(roster_distinct_setup):
-    res = roster_distinct_setup
+    res, summaries = roster_distinct_setup
     for row in res:
-        first_val = _group_first_val(row)
-        last_val = _group_last_val(row)
+        first_val = _group_first_val(row, summaries)
+        last_val = _group_last_val(row, summaries)
         assert row['Student Number'] == first_val['Student Number']
         assert row['Student Email'] == first_val['Student Email']
         assert first_val == last_val
 
 
 def test_get_distinct_group_select_groups_distinct(roster_distinct_setup):
-    res = roster_distinct_setup
+    res, summaries = roster_distinct_setup
     group_member_tuples = {
         (_group_id(row), row['Student Number'], row['Student Email']) for row in res
     }
@@ -380,23 +380,23 @@ def test_get_distinct_group_select_groups_distinct(roster_distinct_setup):
 
 
 def test_get_percentile_range_group_first_last(roster_percentile_subj_grade_setup):
-    res = roster_percentile_subj_grade_setup
+    res, summaries = roster_percentile_subj_grade_setup
     for row in res:
-        first_val = _group_first_val(row)
-        last_val = _group_last_val(row)
+        first_val = _group_first_val(row, summaries)
+        last_val = _group_last_val(row, summaries)
         assert (first_val['Subject'], first_val['Grade']) <= (row['Subject'], row['Grade'])
         assert (last_val['Subject'], last_val['Grade']) >= (row['Subject'], row['Grade'])
 
 
 def test_get_percentile_range_group_groups_correct(roster_percentile_subj_grade_setup):
-    res = roster_percentile_subj_grade_setup
+    res, summaries = roster_percentile_subj_grade_setup
     group_member_tuples = {
         (
             _group_id(row),
-            _group_first_val(row)['Subject'],
-            _group_first_val(row)['Grade'],
-            _group_last_val(row)['Subject'],
-            _group_last_val(row)['Grade'],
+            _group_first_val(row, summaries)['Subject'],
+            _group_first_val(row, summaries)['Grade'],
+            _group_last_val(row, summaries)['Subject'],
+            _group_last_val(row, summaries)['Grade'],
         )
         for row in res
     }
@@ -409,12 +409,94 @@ def test_get_percentile_range_group_groups_correct(roster_percentile_subj_grade_
     )
 
 
+@pytest.mark.parametrize('col_name,num_groups', [('Grade', 12), ('Subject', 5), ('Grade', 1500)])
+def test_percentile_boundaries_group_ids_match(roster_table_obj, col_name, num_groups):
+    roster, engine = roster_table_obj
+    group_by = group.GroupBy(
+        [col_name], mode=group.GroupMode.PERCENTILE.value, num_groups=num_groups
+    )
+    boundaries_query = group.get_group_boundaries_query(roster, group_by)
+    ranked_query = group.get_group_augmented_records_query(roster, group_by)
+    with engine.begin() as conn:
+        boundaries = [list(row) for row in conn.execute(boundaries_query).fetchall()]
+        bucketed_query = group.get_group_augmented_records_query(
+            roster, group_by.with_boundaries(boundaries)
+        )
+        ranked = {row['id']: _group_id(row) for row in conn.execute(ranked_query)}
+        bucketed = {row['id']: _group_id(row) for row in conn.execute(bucketed_query)}
+    assert bucketed == ranked
+
+
+@pytest.mark.parametrize('num_groups', [3, 20])
+def test_percentile_boundaries_group_ids_match_with_nulls(engine_with_schema, num_groups):
+    engine, schema = engine_with_schema
+    table = Table(
+        'nullable_grades',
+        MetaData(bind=engine, schema=schema),
+        Column('id', Integer, primary_key=True),
+        Column('grade', Integer),
+    )
+    table.create()
+    grades = list(range(10)) + [None] * 3
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{'grade': grade} for grade in grades])
+    group_by = group.GroupBy(['grade'], mode=group.GroupMode.PERCENTILE.value, num_groups=num_groups)
+    boundaries_query = group.get_group_boundaries_query(table, group_by)
+    ranked_query = group.get_group_augmented_records_query(table, group_by)
+    with engine.begin() as conn:
+        boundaries = [list(row) for row in conn.execute(boundaries_query).fetchall()]
+        bucketed_query = group.get_group_augmented_records_query(
+            table, group_by.with_boundaries(boundaries)
+        )
+        ranked = {row['id']: _group_id(row) for row in conn.execute(ranked_query)}
+        bucketed = {row['id']: _group_id(row) for row in conn.execute(bucketed_query)}
+    assert None not in bucketed.values()
+    assert bucketed == ranked
+
+
+def test_percentile_boundaries_group_by_copy():
+    group_by = group.GroupBy(
+        ['Grade'], mode=group.GroupMode.PERCENTILE.value, num_groups=12
+    )
+    bounded_group_by = group_by.with_boundaries([[1, 1]])
+    assert group_by.uses_boundaries
+    assert group_by.boundaries is None
+    assert bounded_group_by.boundaries == [[1, 1]]
+    assert bounded_group_by.columns == group_by.columns
+
+
+def test_percentile_boundaries_multiple_columns_unused():
+    group_by = group.GroupBy(
+        ['Subject', 'Grade'], mode=group.GroupMode.PERCENTILE.value, num_groups=12
+    )
+    assert not group_by.uses_boundaries
+
+
+@pytest.mark.parametrize('col_name', magnitude_columns)
+def test_magnitude_boundaries_group_ids_match(magnitude_table_obj, col_name):
+    magnitude, engine = magnitude_table_obj
+    group_by = group.GroupBy([col_name], mode=group.GroupMode.MAGNITUDE.value)
+    boundaries_query = group.get_group_boundaries_query(magnitude, group_by)
+    computed_query = group.get_group_augmented_records_query(magnitude, group_by)
+    with engine.begin() as conn:
+        boundaries = list(conn.execute(boundaries_query).fetchone())
+        bounded_group_by = group_by.with_boundaries(boundaries)
+        bounded_query = group.get_group_augmented_records_query(magnitude, bounded_group_by)
+        computed = {row['id']: _group_id(row) for row in conn.execute(computed_query)}
+        bounded = {row['id']: _group_id(row) for row in conn.execute(bounded_query)}
+        res = conn.execute(bounded_query).fetchall()
+    assert bounded == computed
+    computed_summaries = _get_group_summaries(magnitude, engine, group_by, res)
+    bounded_summaries = _get_group_summaries(magnitude, engine, bounded_group_by, res)
+    assert bounded_summaries == computed_summaries
+
+
 def test_extract_group_metadata_correct_data(record_dictionary_list):
     records, _ = group.extract_group_metadata(
         record_dictionary_list, data_key='data', metadata_key='metadata'
     )
     data_no_meta = [
-        {k: v for k, v in rec['data'].items() if k != group.MATHESAR_GROUP_METADATA}
+        {k: v for k, v in rec['data'].items() if k != group.MATHESAR_GROUP_ID}
         for rec in record_dictionary_list
     ]
     assert all(
@@ -435,14 +517,22 @@ def test_extract_group_metadata_correct_metadata(record_dictionary_list):
 
 
 def test_extract_group_metadata_correct_groups(record_dictionary_list):
-    _, groups = group.extract_group_metadata(
+    _, group_ids = group.extract_group_metadata(
         record_dictionary_list, data_key='data', metadata_key='metadata'
     )
-    assert len(groups) == 2
-    actual_ids = [
-        gr_dict[group.GroupMetadataField.GROUP_ID.value] for gr_dict in groups
-    ]
-    expect_ids = [
-        _group_id(rec['data']) for rec in record_dictionary_list
-    ]
-    assert set(actual_ids) == set(expect_ids)
+    assert group_ids == [15, 2]
+
+
+def test_extract_group_metadata_ungrouped():
+    record_dictionaries = [{'data': {'id': 1, 'Center': 'NASA KSC'}}]
+    records, group_ids = group.extract_group_metadata(record_dictionaries)
+    assert records == [{'data': {'id': 1, 'Center': 'NASA KSC'}, 'metadata': None}]
+    assert group_ids is None
+
+
+def test_get_group_summary_query_counts(roster_distinct_setup):
+    res, summaries = roster_distinct_setup
+    for group_id, summary in summaries.items():
+        assert summary[group.GroupMetadataField.COUNT.value] == len(
+            [row for row in res if _group_id(row) == group_id]
+        )
@@ -0,0 +1,43 @@
+from io import BytesIO
+
+from db.records.operations import insert
+from db.records.operations.insert import _ProgressReader, _TranscodingReader
+
+CONTENTS = "id,name\n" + "".join(f"{i},Noël Müller {i}\n" for i in range(2000))
+
+
+def _read_all(file, size):
+    chunks = []
+    while True:
+        chunk = file.read(size)
+        if not chunk:
+            return b"".join(chunks)
+        assert len(chunk) <= size
+        chunks.append(chunk)
+
+
+def test_transcoding_reader_converts_in_chunks(monkeypatch):
+    # Small reads split multi-byte characters across chunks
+    monkeypatch.setattr(insert, "READ_SIZE", 7)
+    file = _TranscodingReader(BytesIO(CONTENTS.encode("utf-16")), "utf-16", "utf-8")
+    assert _read_all(file, 5).decode("utf-8") == CONTENTS
+
+
+def test_transcoding_reader_read_all():
+    file = _TranscodingReader(BytesIO(CONTENTS.encode("cp1252")), "cp1252", "utf-8")
+    assert file.read().decode("utf-8") == CONTENTS
+    assert file.read() == b""
+
+
+def test_transcoding_reader_replaces_unencodable_characters():
+    file = _TranscodingReader(BytesIO("Noël ☃\n".encode("utf-8")), "utf-8", "cp1252")
+    assert file.read(8192) == "Noël ?\n".encode("cp1252")
+
+
+def test_progress_reader_reports_bytes_read():
+    contents = CONTENTS.encode("utf-8")
+    reported = []
+    file = _ProgressReader(BytesIO(contents), reported.append)
+    assert _read_all(file, 8192) == contents
+    assert reported[-1] == len(contents)
+    assert reported == sorted(reported)
@@ -1,11 +1,21 @@
+import gc
+import weakref
 from decimal import Decimal
 from collections import Counter
 
+import pytest
 from sqlalchemy import Column
 from sqlalchemy import String
 
-from db.records.operations.select import get_records, get_column_cast_records
+from db.records import exceptions as records_exceptions
+from db.records.operations import select as records_select
+from db.records.operations.select import (
+    get_records, get_column_cast_records, get_duplicate_group_count, get_duplicate_groups,
+    get_unique_order_by
+)
 from db.tables.operations.create import create_mathesar_table
+from db.tables.operations.drop import drop_table
+from db.tables.operations.select import get_oid_from_table, reflect_table_from_oid
 from db.tests.types import fixtures
 
 
@@ -33,6 +43,37 @@ def test_get_records_gets_limited_offset_records(roster_table_obj):
     assert len(offset_records) == 10 and offset_records[0] == base_records[5]
 
 
+def _get_cursor_paged_records(table, engine, order_by, page_size):
+    unique_order_by = get_unique_order_by(table, order_by)
+    records = []
+    cursor = None
+    while True:
+        page = get_records(table, engine, limit=page_size, order_by=order_by, cursor=cursor)
+        if not page:
+            return records
+        records.extend(page)
+        cursor = [page[-1]._mapping[sort_spec['field']] for sort_spec in unique_order_by]
+
+
+def test_get_records_cursor_default_order(roster_table_obj):
+    roster, engine = roster_table_obj
+    cursor_records = _get_cursor_paged_records(roster, engine, [], 75)
+    assert cursor_records == get_records(roster, engine)
+
+
+def test_get_records_cursor_matches_offset(roster_table_obj):
+    roster, engine = roster_table_obj
+    order_by = [
+        {'field': 'Subject', 'direction': 'desc'},
+        {'field': 'Grade', 'direction': 'asc', 'nullsfirst': True},
+    ]
+    cursor_records = _get_cursor_paged_records(roster, engine, order_by, 75)
+    offset_records = get_records(
+        roster, engine, order_by=get_unique_order_by(roster, order_by)
+    )
+    assert cursor_records == offset_records
+
+
 def test_get_column_cast_records(engine_email_type):
     COL1 = "col1"
     COL2 = "col2"
@@ -110,3 +151,86 @@ def test_get_records_duplicate_only(roster_table_obj):
     all_counter = {k: v for k, v in all_counter.items() if v > 1}
     got_counter = Counter(tuple(r[c] for c in duplicate_only) for r in dupe_record_list)
     assert all_counter == got_counter
+    assert all(r._fields == full_record_list[0]._fields for r in dupe_record_list)
+
+
+def test_get_records_duplicate_only_with_keys(roster_table_obj):
+    roster, engine = roster_table_obj
+    duplicate_only = ["Grade", "Subject"]
+    duplicate_keys = [values for values, _ in get_duplicate_groups(roster, engine, duplicate_only)]
+
+    dupe_record_list = get_records(roster, engine, duplicate_only=duplicate_only)
+    keyed_record_list = get_records(
+        roster, engine, duplicate_only=duplicate_only, duplicate_keys=duplicate_keys
+    )
+    assert keyed_record_list == dupe_record_list
+
+
+def test_get_records_duplicate_only_with_no_keys(roster_table_obj):
+    roster, engine = roster_table_obj
+    record_list = get_records(roster, engine, duplicate_only=["Grade"], duplicate_keys=[])
+    assert record_list == []
+
+
+def test_get_duplicate_groups(roster_table_obj):
+    roster, engine = roster_table_obj
+    duplicate_only = ["Grade", "Subject"]
+
+    full_record_list = get_records(roster, engine)
+    all_counter = Counter(tuple(r[c] for c in duplicate_only) for r in full_record_list)
+    all_counter = {k: v for k, v in all_counter.items() if v > 1}
+    duplicate_groups = get_duplicate_groups(roster, engine, duplicate_only)
+
+    assert {tuple(values): count for values, count in duplicate_groups} == all_counter
+    counts = [count for _, count in duplicate_groups]
+    assert counts == sorted(counts, reverse=True)
+    assert get_duplicate_group_count(roster, engine, duplicate_only) == len(all_counter)
+
+
+def test_get_duplicate_groups_limit_offset(roster_table_obj):
+    roster, engine = roster_table_obj
+    duplicate_only = ["Subject"]
+    duplicate_groups = get_duplicate_groups(roster, engine, duplicate_only)
+    paged_groups = get_duplicate_groups(roster, engine, duplicate_only, limit=2, offset=1)
+    assert paged_groups == duplicate_groups[1:3]
+
+
+def test_get_duplicate_groups_no_columns(roster_table_obj):
+    roster, engine = roster_table_obj
+    with pytest.raises(records_exceptions.BadDuplicateFormat):
+        get_duplicate_groups(roster, engine, [])
+
+
+def test_get_records_reuses_compiled_query(roster_table_obj):
+    roster, engine = roster_table_obj
+    full_record_list = get_records(roster, engine)
+
+    def _get_grade_records(grade, limit, offset):
+        filter = {"greater_or_equal": [{"column_name": ["Grade"]}, {"literal": [grade]}]}
+        return get_records(roster, engine, limit=limit, offset=offset, filter=filter)
+
+    first_record_list = _get_grade_records(50, 10, 0)
+    num_compiled_queries = len(roster.info[records_select.COMPILED_RECORDS_QUERIES_INFO_KEY])
+    second_record_list = _get_grade_records(90, 5, 5)
+
+    assert len(roster.info[records_select.COMPILED_RECORDS_QUERIES_INFO_KEY]) == num_compiled_queries
+    assert first_record_list == [
+        r for r in full_record_list if r["Grade"] is not None and r["Grade"] >= 50
+    ][:10]
+    assert second_record_list == [
+        r for r in full_record_list if r["Grade"] is not None and r["Grade"] >= 90
+    ][5:10]
+
+
+def test_get_records_compiled_queries_freed_with_dropped_table(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_name = "compiled_queries_table"
+    create_mathesar_table(table_name, schema, [Column("name", String)], engine)
+    table = reflect_table_from_oid(get_oid_from_table(table_name, schema, engine), engine)
+    get_records(table, engine, limit=10)
+    assert len(table.info[records_select.COMPILED_RECORDS_QUERIES_INFO_KEY]) == 1
+    table_ref = weakref.ref(table)
+    del table
+    drop_table(table_name, schema, engine)
+    gc.collect()
+    assert table_ref() is None
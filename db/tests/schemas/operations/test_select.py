@@ -1,9 +1,12 @@
 import warnings
-from sqlalchemy import select, Table, MetaData
+from sqlalchemy import select, Table, MetaData, Column, Integer, String
 
 from db import types
 from db.tables.operations import infer_types
-from db.schemas.operations.select import get_mathesar_schemas_with_oids
+from db.schemas.operations.select import (
+    get_catalog_fingerprint, get_mathesar_schemas_with_oids, get_mathesar_schema_objects
+)
+from db.schemas.utils import get_schema_oid_from_name
 
 
 def test_get_mathesar_schemas_with_oids_gets_added_schema(engine_with_schema):
@@ -48,3 +51,47 @@ def test_get_mathesar_schemas_with_oids_gets_correct_oid(engine_with_schema):
     actual_schemata = get_mathesar_schemas_with_oids(engine)
     actual_oid = [oid for schm, oid in actual_schemata if schm == schema][0]
     assert actual_oid == expect_oid
+
+
+def test_get_mathesar_schema_objects_gets_tables_and_columns(engine_with_schema):
+    engine, schema = engine_with_schema
+    metadata = MetaData(schema=schema)
+    Table("objects_table", metadata, Column("id", Integer), Column("name", String))
+    Table("other_table", metadata, Column("id", Integer))
+    metadata.create_all(engine)
+    schema_oid = get_schema_oid_from_name(schema, engine)
+
+    actual_objects = get_mathesar_schema_objects(engine)
+
+    schema_rows = [row for row in actual_objects if row.schema_oid == schema_oid]
+    table_attnums = {}
+    for row in schema_rows:
+        table_attnums.setdefault(row.table_oid, set()).add(row.attnum)
+    assert sorted(table_attnums.values(), key=len) == [{1}, {1, 2}]
+
+
+def test_get_mathesar_schema_objects_gets_empty_schema(engine_with_schema):
+    engine, schema = engine_with_schema
+    schema_oid = get_schema_oid_from_name(schema, engine)
+    actual_objects = get_mathesar_schema_objects(engine)
+    schema_rows = [row for row in actual_objects if row.schema_oid == schema_oid]
+    assert [(row.table_oid, row.attnum) for row in schema_rows] == [(None, None)]
+
+
+def test_get_mathesar_schema_objects_avoids_excluded_schemas(engine_with_schema):
+    engine, _ = engine_with_schema
+    actual_schema_oids = {row.schema_oid for row in get_mathesar_schema_objects(engine)}
+    expect_schema_oids = {oid for _, oid in get_mathesar_schemas_with_oids(engine)}
+    assert actual_schema_oids == expect_schema_oids
+
+
+def test_get_catalog_fingerprint_changes_on_ddl(engine_with_schema):
+    engine, schema = engine_with_schema
+    fingerprint_one = get_catalog_fingerprint(engine)
+    fingerprint_two = get_catalog_fingerprint(engine)
+    metadata = MetaData(schema=schema)
+    Table("fingerprint_table", metadata, Column("id", Integer))
+    metadata.create_all(engine)
+    fingerprint_three = get_catalog_fingerprint(engine)
+    assert fingerprint_one == fingerprint_two
+    assert fingerprint_two != fingerprint_three
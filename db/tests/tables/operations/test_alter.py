@@ -1,8 +1,11 @@
 import pytest
+from sqlalchemy import text
 from sqlalchemy.exc import NoSuchTableError
+from sqlalchemy.schema import DropSchema
 
-from db.tables.operations.alter import rename_table
-from db.tables.operations.create import create_mathesar_table
+from db.constants import IMPORT_SCHEMA
+from db.tables.operations.alter import publish_staging_table, rename_table
+from db.tables.operations.create import create_mathesar_table, create_string_column_table
 from db.tables.operations.select import get_oid_from_table, reflect_table
 from db.tests.tables import utils as test_utils
 
@@ -39,3 +42,69 @@ def test_rename_table_foreign_key(engine_with_schema):
     related_table = reflect_table(related_table_name, schema, engine)
     fk = list(related_table.foreign_keys)[0]
     assert fk.column.table.name == new_table_name
+
+
+def test_publish_staging_table(engine_with_schema):
+    engine, schema = engine_with_schema
+    staging_table = create_string_column_table(
+        "test_staging_table", IMPORT_SCHEMA, ["name"], engine, unlogged=True
+    )
+    staging_oid = get_oid_from_table(staging_table.name, IMPORT_SCHEMA, engine)
+    with engine.begin() as conn:
+        conn.execute(staging_table.insert(), [{"name": "one"}, {"name": "two"}])
+
+    table_oid = publish_staging_table(
+        "test_staging_table", IMPORT_SCHEMA, "test_published_table", schema, engine
+    )
+    with engine.begin() as conn:
+        persistence = conn.execute(
+            text("SELECT relpersistence FROM pg_class WHERE oid = :oid"), {"oid": table_oid}
+        ).scalar()
+        conn.execute(DropSchema(IMPORT_SCHEMA, cascade=True))
+    table = reflect_table("test_published_table", schema, engine)
+    with engine.begin() as conn:
+        names = conn.execute(table.select().order_by(table.c.id)).fetchall()
+
+    assert table_oid == staging_oid
+    assert persistence == "p"
+    assert [row.name for row in names] == ["one", "two"]
+
+
+def _get_published_relation_names(table_oid, engine):
+    with engine.begin() as conn:
+        constraint_names = conn.execute(
+            text("SELECT conname FROM pg_constraint WHERE conrelid = :oid"), {"oid": table_oid}
+        ).scalars().all()
+        sequence_name = conn.execute(
+            text("SELECT pg_get_serial_sequence(CAST(:oid AS regclass)::text, 'id')"), {"oid": table_oid}
+        ).scalar()
+    return constraint_names, sequence_name
+
+
+def test_publish_staging_table_renames_relations(engine_with_schema):
+    engine, schema = engine_with_schema
+    create_string_column_table("test_staging_names", IMPORT_SCHEMA, ["name"], engine, unlogged=True)
+    table_oid = publish_staging_table(
+        "test_staging_names", IMPORT_SCHEMA, "test_published_names", schema, engine
+    )
+    constraint_names, sequence_name = _get_published_relation_names(table_oid, engine)
+    with engine.begin() as conn:
+        conn.execute(DropSchema(IMPORT_SCHEMA, cascade=True))
+
+    assert constraint_names == ["test_published_names_pkey"]
+    assert sequence_name == f"{schema}.test_published_names_id_seq"
+
+
+def test_publish_staging_table_renames_relations_to_unused_names(engine_with_schema):
+    engine, schema = engine_with_schema
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE SEQUENCE "{schema}".test_published_taken_pkey'))
+    create_string_column_table("test_staging_taken", IMPORT_SCHEMA, ["name"], engine, unlogged=True)
+    table_oid = publish_staging_table(
+        "test_staging_taken", IMPORT_SCHEMA, "test_published_taken", schema, engine
+    )
+    constraint_names, _ = _get_published_relation_names(table_oid, engine)
+    with engine.begin() as conn:
+        conn.execute(DropSchema(IMPORT_SCHEMA, cascade=True))
+
+    assert constraint_names == ["test_published_taken_pkey1"]
@@ -3,7 +3,8 @@ from unittest.mock import call, patch
 from sqlalchemy import Column, MetaData, Table, select
 from sqlalchemy import BOOLEAN, Numeric, NUMERIC, String, VARCHAR
 
-from db.columns.operations.infer_types import infer_column_type
+from db.columns.exceptions import DagCycleError
+from db.columns.operations.infer_types import infer_column_type, infer_column_types_from_rows
 from db.tables.operations import infer_types as infer_operations
 from db.tables.operations.create import create_mathesar_table
 from db.tests.types import fixtures
@@ -240,3 +241,48 @@ def test_update_table_column_types_skips_fkey_columns(extracted_remainder_roster
             engine
         )
     assert all([call_[1][2] != roster_fkey_col for call_ in mock_infer.mock_calls])
+
+
+infer_from_rows_test_list = [
+    (["0", "2", "1", "0"], "numeric"),
+    (["0", "1", "1", "0"], "boolean"),
+    (["t", "false", "TRUE", "F", "yes", "off"], "boolean"),
+    (["1.0", "0"], "numeric"),
+    (["t", "false", "2", "0"], "text"),
+    (["a", "cat", "mat", "bat"], "text"),
+    (["-2", "+1.5", ".5", "3.", "1e10", "2E-3"], "numeric"),
+    (["1", " 2"], "text"),
+    (["1", "1,000"], "text"),
+    (["1", "NaN"], "text"),
+    (["1", "\u0661"], "text"),
+    (["1", "", None, "2"], "numeric"),
+    (["", None], "boolean"),
+]
+
+
+@pytest.mark.parametrize("values,expected_type", infer_from_rows_test_list)
+def test_infer_column_types_from_rows(values, expected_type):
+    rows = [[value] for value in values]
+    assert infer_column_types_from_rows(rows, 1, batch_size=2) == [expected_type]
+
+
+def test_infer_column_types_from_rows_multiple_columns():
+    rows = [["1", "a", "t"], ["2", "b"]]
+    assert infer_column_types_from_rows(rows, 3) == ["numeric", "text", "boolean"]
+
+
+def test_infer_column_types_from_rows_stops_reading_text_columns():
+    def get_rows():
+        yield ["a"]
+        yield ["b"]
+        raise AssertionError("Rows were read after all columns became text")
+    assert infer_column_types_from_rows(get_rows(), 1, batch_size=1) == ["text"]
+
+
+def test_infer_column_types_from_rows_dag_cycle():
+    type_inference_dag = {"text": ["numeric"], "numeric": ["text"]}
+    value_type_checks = {"text": lambda _: True, "numeric": lambda _: True}
+    with pytest.raises(DagCycleError):
+        infer_column_types_from_rows(
+            [["1"]], 1, type_inference_dag=type_inference_dag, value_type_checks=value_type_checks
+        )
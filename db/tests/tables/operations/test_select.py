@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Integer, MetaData, String, Table, text
+
+from db.tables.operations.select import (
+    get_oid_from_table, invalidate_reflected_table, reflect_table_from_oid,
+)
+
+
+def _create_table(engine, schema, table_name='reflection_cache_table'):
+    metadata = MetaData(bind=engine, schema=schema)
+    Table(table_name, metadata, Column('id', Integer), Column('name', String))
+    metadata.create_all()
+    return get_oid_from_table(table_name, schema, engine)
+
+
+def test_reflect_table_from_oid_uses_cache(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_oid = _create_table(engine, schema)
+    table_one = reflect_table_from_oid(table_oid, engine)
+    table_two = reflect_table_from_oid(table_oid, engine)
+    assert table_one is table_two
+
+
+def test_reflect_table_from_oid_detects_external_ddl(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_oid = _create_table(engine, schema)
+    table_one = reflect_table_from_oid(table_oid, engine)
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE "{schema}".reflection_cache_table ADD COLUMN extra INTEGER;'))
+    table_two = reflect_table_from_oid(table_oid, engine)
+    assert 'extra' not in table_one.columns
+    assert 'extra' in table_two.columns
+
+
+def test_reflect_table_from_oid_detects_rename(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_oid = _create_table(engine, schema)
+    reflect_table_from_oid(table_oid, engine)
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE "{schema}".reflection_cache_table RENAME TO renamed_table;'))
+    assert reflect_table_from_oid(table_oid, engine).name == 'renamed_table'
+
+
+def test_invalidate_reflected_table(engine_with_schema):
+    engine, schema = engine_with_schema
+    table_oid = _create_table(engine, schema)
+    table_one = reflect_table_from_oid(table_oid, engine)
+    invalidate_reflected_table(table_oid, engine)
+    table_two = reflect_table_from_oid(table_oid, engine)
+    assert table_one is not table_two
@@ -0,0 +1,128 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, text
+from sqlalchemy.schema import DropSchema
+
+from db.tables import data_versions
+from db.tables.operations.select import get_oid_from_table
+from db.types import base, install
+
+
+@pytest.fixture
+def engine_with_data_versions(engine_with_schema):
+    engine, schema = engine_with_schema
+    install.install_mathesar_on_database(engine)
+    data_versions.install(engine)
+    yield engine, schema
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP EVENT TRIGGER IF EXISTS {data_versions.EVENT_TRIGGER_NAME};"))
+        conn.execute(DropSchema(base.SCHEMA, cascade=True, if_exists=True))
+    data_versions._installed_engines.pop(engine, None)
+
+
+def _create_table(engine, schema, table_name='data_versions_table'):
+    metadata = MetaData(bind=engine, schema=schema)
+    table = Table(table_name, metadata, Column('id', Integer), Column('name', String))
+    metadata.create_all()
+    return table, get_oid_from_table(table_name, schema, engine)
+
+
+def _get_data_version(table_oid, engine):
+    return data_versions.get_table_data_versions([table_oid], engine)[table_oid]
+
+
+def test_data_version_changes_on_writes(engine_with_data_versions):
+    engine, schema = engine_with_data_versions
+    table, table_oid = _create_table(engine, schema)
+    versions = [_get_data_version(table_oid, engine)]
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{'id': 1, 'name': 'one'}, {'id': 2, 'name': 'two'}])
+    versions.append(_get_data_version(table_oid, engine))
+    with engine.begin() as conn:
+        conn.execute(table.update().where(table.c.id == 1).values(name='uno'))
+    versions.append(_get_data_version(table_oid, engine))
+    with engine.begin() as conn:
+        conn.execute(text(f'TRUNCATE "{schema}".data_versions_table;'))
+    versions.append(_get_data_version(table_oid, engine))
+    assert versions == ['t0', 't1', 't2', 't3']
+
+
+def test_data_version_unchanged_on_reads(engine_with_data_versions):
+    engine, schema = engine_with_data_versions
+    table, table_oid = _create_table(engine, schema)
+    version_one = _get_data_version(table_oid, engine)
+    with engine.begin() as conn:
+        conn.execute(table.select()).fetchall()
+    assert _get_data_version(table_oid, engine) == version_one
+
+
+def test_data_version_unchanged_on_rollback(engine_with_data_versions):
+    engine, schema = engine_with_data_versions
+    table, table_oid = _create_table(engine, schema)
+    version_one = _get_data_version(table_oid, engine)
+    with engine.connect() as conn:
+        conn.execute(table.insert(), [{'id': 1, 'name': 'one'}])
+        conn.rollback()
+    assert _get_data_version(table_oid, engine) == version_one
+
+
+def test_data_versions_in_bulk(engine_with_data_versions):
+    engine, schema = engine_with_data_versions
+    table_one, table_one_oid = _create_table(engine, schema, 'data_versions_table_one')
+    _, table_two_oid = _create_table(engine, schema, 'data_versions_table_two')
+    with engine.begin() as conn:
+        conn.execute(table_one.insert(), [{'id': 1, 'name': 'one'}])
+    versions = data_versions.get_table_data_versions([table_one_oid, table_two_oid, 0], engine)
+    assert versions == {table_one_oid: 't1', table_two_oid: 't0', 0: None}
+
+
+def test_data_versions_without_tracking(engine_with_schema):
+    engine, schema = engine_with_schema
+    _, table_oid = _create_table(engine, schema)
+    version = _get_data_version(table_oid, engine)
+    assert version is None or version.startswith(data_versions.STATISTICS_VERSION_PREFIX)
+
+
+def test_track_table_data_version(engine_with_data_versions):
+    engine, schema = engine_with_data_versions
+    table, table_oid = _create_table(engine, schema, table_name='data_versions_untracked')
+    with engine.begin() as conn:
+        conn.execute(text(
+            f'DROP TRIGGER {data_versions.TRIGGER_NAME} ON "{schema}".data_versions_untracked;'
+        ))
+        data_versions.track_table_data_version(table_oid, conn)
+        # Tracking a tracked table is a no-op
+        data_versions.track_table_data_version(table_oid, conn)
+    version = _get_data_version(table_oid, engine)
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [{'id': 1, 'name': 'one'}])
+    assert version.startswith(data_versions.TRACKED_VERSION_PREFIX)
+    assert _get_data_version(table_oid, engine) != version
+
+
+def test_install_without_event_trigger_privilege(engine_with_schema):
+    engine, schema = engine_with_schema
+    install.install_mathesar_on_database(engine)
+    table, table_oid = _create_table(engine, schema)
+
+    def create_event_trigger_as_non_superuser(conn, cursor, statement, *args):
+        if 'CREATE EVENT TRIGGER' in statement:
+            statement = f"SET LOCAL ROLE pg_monitor; {statement}"
+        return statement, args[0]
+
+    event.listen(engine, 'before_cursor_execute', create_event_trigger_as_non_superuser, retval=True)
+    try:
+        data_versions.install(engine)
+    finally:
+        event.remove(engine, 'before_cursor_execute', create_event_trigger_as_non_superuser)
+    try:
+        with engine.begin() as conn:
+            conn.execute(table.insert(), [{'id': 1, 'name': 'one'}])
+            event_trigger_count = conn.execute(text(
+                f"SELECT count(*) FROM pg_event_trigger WHERE evtname = '{data_versions.EVENT_TRIGGER_NAME}';"
+            )).scalar()
+        assert _get_data_version(table_oid, engine) == 't1'
+        assert event_trigger_count == 0
+    finally:
+        with engine.begin() as conn:
+            conn.execute(DropSchema(base.SCHEMA, cascade=True, if_exists=True))
+        data_versions._installed_engines.pop(engine, None)
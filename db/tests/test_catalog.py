@@ -0,0 +1,20 @@
+from unittest.mock import patch
+
+from sqlalchemy import select
+
+from db import catalog
+
+
+def test_get_catalog_table_reflects_once(engine):
+    with patch.object(catalog, 'Table', side_effect=catalog.Table) as mock_table:
+        pg_class_one = catalog.get_catalog_table('pg_class', engine)
+        pg_class_two = catalog.get_catalog_table('pg_class', engine)
+    assert pg_class_one is pg_class_two
+    assert mock_table.call_count <= 1
+
+
+def test_get_catalog_table_is_queryable(engine):
+    pg_namespace = catalog.get_catalog_table('pg_namespace', engine)
+    sel = select(pg_namespace.c.nspname).where(pg_namespace.c.nspname == 'pg_catalog')
+    with engine.begin() as conn:
+        assert conn.execute(sel).scalar() == 'pg_catalog'
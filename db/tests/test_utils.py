@@ -1,6 +1,9 @@
+from unittest.mock import MagicMock, call
+
 from sqlalchemy import MetaData, Column, String, Table
 
 from db.columns.utils import get_enriched_column_table
+from db.utils import execute_statement
 
 
 def test_get_enriched_column_table(engine):
@@ -15,3 +18,19 @@ def test_get_enriched_column_table_no_engine():
     table = Table("testtable", MetaData(), Column(abc, String), Column('def', String))
     enriched_table = get_enriched_column_table(table)
     assert enriched_table.columns[abc].engine is None
+
+
+def test_execute_statement_without_parameters():
+    table = Table("testtable", MetaData(), Column('abc', String))
+    statement = table.insert().values(abc='value')
+    connection = MagicMock()
+    execute_statement(None, statement, connection_to_use=connection)
+    assert connection.execute.call_args == call(statement)
+
+
+def test_execute_statement_with_parameters():
+    table = Table("testtable", MetaData(), Column('abc', String))
+    statement = table.select()
+    connection = MagicMock()
+    execute_statement(None, statement, connection_to_use=connection, parameters={'abc': 'value'})
+    assert connection.execute.call_args == call(statement, {'abc': 'value'})
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from psycopg2.errors import InvalidParameterValue
@@ -1351,6 +1352,33 @@ def test_get_full_cast_map(engine_with_types, source_type, expect_target_types):
     assert sorted(actual_target_types) == sorted(expect_target_types)
 
 
+def test_get_full_cast_map_is_cached(engine_with_types):
+    cast_operations.clear_type_map_cache(engine_with_types)
+    with patch.object(
+        cast_operations, '_get_full_cast_map', side_effect=cast_operations._get_full_cast_map
+    ) as mock_build:
+        cast_map_one = cast_operations.get_full_cast_map(engine_with_types)
+        cast_map_two = cast_operations.get_full_cast_map(engine_with_types)
+    assert cast_map_one == cast_map_two
+    assert mock_build.call_count == 1
+
+
+def test_get_full_cast_map_returns_copy(engine_with_types):
+    cast_map = cast_operations.get_full_cast_map(engine_with_types)
+    cast_map[VARCHAR].append('not a type')
+    cast_map.pop(TEXT)
+    cast_map_two = cast_operations.get_full_cast_map(engine_with_types)
+    assert 'not a type' not in cast_map_two[VARCHAR]
+    assert TEXT in cast_map_two
+
+
+def test_install_all_casts_clears_type_map_cache(engine_with_types):
+    cast_operations.get_supported_alter_column_types(engine_with_types)
+    assert engine_with_types in cast_operations._type_map_cache
+    cast_operations.install_all_casts(engine_with_types)
+    assert engine_with_types not in cast_operations._type_map_cache
+
+
 money_array_examples = [
     ('$1,000.00', ['1,000.00', ',', '.']),
     ('1,000.00$', ['1,000.00', ',', '.']),
@@ -1,3 +1,5 @@
+from weakref import WeakKeyDictionary
+
 from sqlalchemy import text
 from sqlalchemy.sql import quoted_name
 from sqlalchemy.sql.functions import Function
@@ -47,6 +49,27 @@ TEXT_TYPES = frozenset([CHAR, TEXT, VARCHAR])
 
 MONEY_ARR_FUNC_NAME = "get_mathesar_money_array"
 
+# The type and cast maps below only depend on the types known to the engine's
+# dialect, but building them compiles every type (and every cast function
+# body), so they're cached per engine.  The cache is keyed on the known type
+# names, since custom types may be added to the dialect after it's created.
+_type_map_cache = WeakKeyDictionary()
+
+
+def _get_cached_type_map(engine, key, build_map):
+    available_type_names = frozenset(base.get_available_types(engine))
+    engine_cache = _type_map_cache.get(engine)
+    if engine_cache is None or engine_cache['available_type_names'] != available_type_names:
+        engine_cache = {'available_type_names': available_type_names}
+        _type_map_cache[engine] = engine_cache
+    if key not in engine_cache:
+        engine_cache[key] = build_map()
+    return engine_cache[key]
+
+
+def clear_type_map_cache(engine):
+    _type_map_cache.pop(engine, None)
+
 
 def get_supported_alter_column_types(engine, friendly_names=True):
     """
@@ -57,6 +80,14 @@ def get_supported_alter_column_types(engine, friendly_names=True):
     friendly_names: sets whether to use "friendly" service-layer or the
     actual DB-layer names.
     """
+    return dict(_get_cached_type_map(
+        engine,
+        ('supported_alter_column_types', friendly_names),
+        lambda: _get_supported_alter_column_types(engine, friendly_names)
+    ))
+
+
+def _get_supported_alter_column_types(engine, friendly_names):
     dialect_types = base.get_available_types(engine)
     friendly_type_map = {
         # Default Postgres types
@@ -98,15 +129,25 @@ def get_supported_alter_column_types(engine, friendly_names=True):
 
 
 def get_supported_alter_column_db_types(engine):
-    return set(
-        [
+    return set(_get_cached_type_map(
+        engine,
+        'supported_alter_column_db_types',
+        lambda: {
             type_().compile(dialect=engine.dialect)
             for type_ in get_supported_alter_column_types(engine).values()
-        ]
-    )
+        }
+    ))
 
 
 def get_robust_supported_alter_column_type_map(engine):
+    return dict(_get_cached_type_map(
+        engine,
+        'robust_supported_alter_column_type_map',
+        lambda: _get_robust_supported_alter_column_type_map(engine)
+    ))
+
+
+def _get_robust_supported_alter_column_type_map(engine):
     supported_types = get_supported_alter_column_types(engine, friendly_names=True)
     supported_types.update(get_supported_alter_column_types(engine, friendly_names=False))
     supported_types.update(
@@ -149,6 +190,7 @@ def get_column_cast_expression(column, target_type_str, engine, type_options={})
 
 
 def install_all_casts(engine):
+    clear_type_map_cache(engine)
     create_boolean_casts(engine)
     create_date_casts(engine)
     create_decimal_number_casts(engine)
@@ -244,6 +286,13 @@ def create_uri_casts(engine):
 
 
 def get_full_cast_map(engine):
+    full_cast_map = _get_cached_type_map(
+        engine, 'full_cast_map', lambda: _get_full_cast_map(engine)
+    )
+    return {key: list(val) for key, val in full_cast_map.items()}
+
+
+def _get_full_cast_map(engine):
     full_cast_map = {}
     supported_types = get_robust_supported_alter_column_type_map(engine)
     for source, target in get_defined_source_target_cast_tuples(engine):
@@ -260,6 +309,14 @@ def get_full_cast_map(engine):
 
 
 def get_defined_source_target_cast_tuples(engine):
+    return set(_get_cached_type_map(
+        engine,
+        'defined_source_target_cast_tuples',
+        lambda: _get_defined_source_target_cast_tuples(engine)
+    ))
+
+
+def _get_defined_source_target_cast_tuples(engine):
     type_body_map_map = {
         BIGINT: _get_integer_type_body_map(target_type_str=BIGINT),
         BOOLEAN: _get_boolean_type_body_map(),
@@ -3,18 +3,20 @@ from sqlalchemy.exc import ProgrammingError
 from psycopg2.errors import UndefinedFunction
 
 
-def execute_statement(engine, statement, connection_to_use=None):
+def execute_statement(engine, statement, connection_to_use=None, parameters=None):
+    # SQLAlchemy takes parameters of None as a positional parameter.
+    args = () if parameters is None else (parameters,)
     try:
         if connection_to_use:
-            return connection_to_use.execute(statement)
+            return connection_to_use.execute(statement, *args)
         else:
             with engine.begin() as conn:
-                return conn.execute(statement)
+                return conn.execute(statement, *args)
     except ProgrammingError as e:
         if isinstance(e.orig, UndefinedFunction):
             message = e.orig.args[0].split('\n')[0]
             raise exceptions.UndefinedFunction(message)
 
 
-def execute_query(engine, query, connection_to_use=None):
-    return execute_statement(engine, query, connection_to_use=None).fetchall()
+def execute_query(engine, query, connection_to_use=None, parameters=None):
+    return execute_statement(engine, query, connection_to_use=None, parameters=parameters).fetchall()
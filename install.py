@@ -10,15 +10,21 @@ from db import install
 
 def main():
     skip_confirm = False
-    (opts, _) = getopt.getopt(sys.argv[1:], ":s", ["skip-confirm"])
+    # Installs triggers tracking a version of each table's data, so that
+    # results can be cached until the data changes.  Tracking new tables
+    # requires a superuser.
+    track_data_versions = False
+    (opts, _) = getopt.getopt(sys.argv[1:], ":sv", ["skip-confirm", "track-data-versions"])
     for (opt, value) in opts:
         if (opt == "-s") or (opt == "--skip-confirm"):
             skip_confirm = True
+        if (opt == "-v") or (opt == "--track-data-versions"):
+            track_data_versions = True
     for database_key in [key for key in DATABASES if key != "default"]:
-        install_on_db_with_key(database_key, skip_confirm)
+        install_on_db_with_key(database_key, skip_confirm, track_data_versions)
 
 
-def install_on_db_with_key(database_key, skip_confirm):
+def install_on_db_with_key(database_key, skip_confirm, track_data_versions=False):
     if DATABASES[database_key]["HOST"] == "mathesar_db":
         # if we're going to install on the docker-created Postgres, we'll
         # create the DB
@@ -30,6 +36,7 @@ def install_on_db_with_key(database_key, skip_confirm):
             DATABASES["default"]["HOST"],
             DATABASES["default"]["NAME"],
             DATABASES["default"]["PORT"],
+            track_data_versions=track_data_versions,
         )
         print(f"Created DB is {DATABASES['mathesar_tables']['NAME']}")
     else:
@@ -56,6 +63,7 @@ def install_on_db_with_key(database_key, skip_confirm):
                 host,
                 db_name,
                 port,
+                track_data_versions=track_data_versions,
             )
         else:
             print("Skipping DB with key {database_key}.")
@@ -2,6 +2,9 @@ from mathesar.api.db.viewsets.columns import ColumnViewSet  # noqa
 from mathesar.api.db.viewsets.constraints import ConstraintViewSet # noqa
 from mathesar.api.db.viewsets.data_files import DataFileViewSet # noqa
 from mathesar.api.db.viewsets.databases import DatabaseViewSet # noqa
+from mathesar.api.db.viewsets.duplicates import DuplicateViewSet # noqa
+from mathesar.api.db.viewsets.import_jobs import ImportJobViewSet # noqa
 from mathesar.api.db.viewsets.records import RecordViewSet # noqa
 from mathesar.api.db.viewsets.schemas import SchemaViewSet # noqa
+from mathesar.api.db.viewsets.summaries import SummaryViewSet # noqa
 from mathesar.api.db.viewsets.tables import TableViewSet # noqa
@@ -18,8 +18,8 @@ from db.types.exceptions import InvalidTypeParameters
 from db.records.exceptions import UndefinedFunction
 from mathesar.api.pagination import DefaultLimitOffsetPagination
 from mathesar.api.serializers.columns import ColumnSerializer
-from mathesar.api.utils import get_table_or_404
-from mathesar.models import Column
+from mathesar.api.utils import get_table_conditional_response, get_table_or_404
+from mathesar.models import Column, Table
 
 
 class ColumnViewSet(viewsets.ModelViewSet):
@@ -27,7 +27,26 @@ class ColumnViewSet(viewsets.ModelViewSet):
     pagination_class = DefaultLimitOffsetPagination
 
     def get_queryset(self):
-        return Column.objects.filter(table=self.kwargs['table_pk'])
+        # Fetching the columns through their table makes them share the table
+        # instance, so its column metadata is only loaded once.
+        table = Table.objects.filter(id=self.kwargs['table_pk']).first()
+        if table is None:
+            return Column.objects.none()
+        return table.columns.all()
+
+    # Responses have an ETag, and requests with a matching If-None-Match header
+    # get a 304 response without reflecting or serializing the columns.
+    def list(self, request, table_pk=None):
+        return get_table_conditional_response(
+            request, table_pk, lambda: super(ColumnViewSet, self).list(request, table_pk=table_pk)
+        )
+
+    def retrieve(self, request, pk=None, table_pk=None):
+        return get_table_conditional_response(
+            request,
+            table_pk,
+            lambda: super(ColumnViewSet, self).retrieve(request, pk=pk, table_pk=table_pk),
+        )
 
     def create(self, request, table_pk=None):
         table = get_table_or_404(table_pk)
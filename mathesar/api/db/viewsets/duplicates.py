@@ -0,0 +1,35 @@
+from rest_framework import viewsets
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from mathesar.api.pagination import TableLimitOffsetDuplicatePagination
+from mathesar.api.serializers.duplicates import DuplicateListParameterSerializer
+from mathesar.api.utils import get_duplicate_only_column_names, get_table_or_404
+from mathesar.models import Table
+from mathesar.utils.json import MathesarJSONRenderer
+
+
+class DuplicateViewSet(viewsets.ViewSet):
+    def get_queryset(self):
+        return Table.objects.all().order_by('-created_at')
+
+    renderer_classes = [MathesarJSONRenderer, BrowsableAPIRenderer]
+
+    # The `duplicate_only` parameter has the same format as for the records
+    # endpoint.  Each result is a group of records sharing the values of those
+    # columns, with the number of records in it; larger groups come first.
+    def list(self, request, table_pk=None):
+        paginator = TableLimitOffsetDuplicatePagination()
+
+        serializer = DuplicateListParameterSerializer(data=request.GET)
+        serializer.is_valid(raise_exception=True)
+        table = get_table_or_404(table_pk)
+
+        column_names_to_ids = table.get_column_name_id_bidirectional_map()
+        name_converted_duplicate_only = get_duplicate_only_column_names(
+            serializer.validated_data['duplicate_only'], column_names_to_ids.inverse
+        )
+        duplicate_groups = paginator.paginate_queryset(
+            self.get_queryset(), request, table, column_names_to_ids,
+            name_converted_duplicate_only,
+        )
+        return paginator.get_paginated_response(duplicate_groups)
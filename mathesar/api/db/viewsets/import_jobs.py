@@ -0,0 +1,41 @@
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
+from rest_framework.response import Response
+
+from mathesar.api.pagination import DefaultLimitOffsetPagination
+from mathesar.api.serializers.import_jobs import ImportJobSerializer
+from mathesar.imports.jobs import cancel_import_job, fail_abandoned_import_jobs, start_import_job
+from mathesar.models import ImportJob
+
+
+class ImportJobViewSet(ListModelMixin, RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = ImportJob.objects.all().order_by('-created_at')
+    serializer_class = ImportJobSerializer
+    pagination_class = DefaultLimitOffsetPagination
+
+    def get_queryset(self):
+        # Jobs are checked for a stopped process when they're read, so that
+        # they don't look unfinished forever.
+        fail_abandoned_import_jobs()
+        return super().get_queryset()
+
+    # Imports the data file into a new table in the background.  Poll the
+    # returned job for its progress; its table is set once it's done.
+    def create(self, request):
+        serializer = ImportJobSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        job = start_import_job(
+            serializer.validated_data['data_file'],
+            serializer.validated_data['name'],
+            serializer.validated_data['schema'],
+            infer_types=serializer.validated_data.get('infer_types', False),
+        )
+        serializer = ImportJobSerializer(job, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(methods=['post'], detail=True)
+    def cancel(self, request, pk=None):
+        job = cancel_import_job(self.get_object())
+        serializer = ImportJobSerializer(job, context={'request': request})
+        return Response(serializer.data)
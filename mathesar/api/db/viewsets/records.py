@@ -2,6 +2,7 @@ from rest_framework import status, viewsets
 from rest_framework.exceptions import NotFound
 from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from sqlalchemy.exc import DataError
 from sqlalchemy_filters.exceptions import BadSortFormat, SortFieldNotFound
 
 import mathesar.api.exceptions.database_exceptions.exceptions as database_api_exceptions
@@ -9,11 +10,13 @@ from db.functions.exceptions import (
     BadDBFunctionFormat, ReferencedColumnsDontExist, UnknownDBFunctionID
 )
 from db.records.exceptions import (
-    BadGroupFormat, GroupFieldNotFound, InvalidGroupType, UndefinedFunction
+    BadCursorFormat, BadGroupFormat, GroupFieldNotFound, InvalidGroupType, UndefinedFunction
 )
 from mathesar.api.pagination import TableLimitOffsetGroupPagination
 from mathesar.api.serializers.records import RecordListParameterSerializer, RecordSerializer
-from mathesar.api.utils import get_table_or_404
+from mathesar.api.utils import (
+    get_duplicate_only_column_names, get_not_modified_response, get_table_etag, get_table_or_404
+)
 from mathesar.functions.operations.convert import rewrite_db_function_spec_column_ids_to_names
 from mathesar.models import Table
 from mathesar.utils.json import MathesarJSONRenderer
@@ -32,7 +35,17 @@ class RecordViewSet(viewsets.ViewSet):
     # db/functions/operations/deserialize.py::get_db_function_from_ma_function_spec function doc>
     # For sorting parameter formatting, see:
     # https://github.com/centerofci/sqlalchemy-filters#sort-format
+    # The `count` parameter can be 'exact' (default), 'estimate' (large unfiltered
+    # tables are counted from planner statistics) or 'none' (count is skipped).
+    # For keyset pagination, pass an empty `cursor` parameter for the first page,
+    # and the `next_cursor` value of the response for subsequent pages.
+    # Responses have an ETag, and requests with a matching If-None-Match header
+    # get a 304 response without querying the records.
     def list(self, request, table_pk=None):
+        etag = get_table_etag(request, table_pk, include_records=True)
+        not_modified_response = get_not_modified_response(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
         paginator = TableLimitOffsetGroupPagination()
 
         serializer = RecordListParameterSerializer(data=request.GET)
@@ -57,6 +70,9 @@ class RecordViewSet(viewsets.ViewSet):
             group_by_columns_names = [column_ids_to_names[column_id] for column_id in grouping['columns']]
             name_converted_group_by = {**grouping, 'columns': group_by_columns_names}
         name_converted_order_by = [{**column, 'field': column_ids_to_names[column['field']]} for column in order_by]
+        name_converted_duplicate_only = get_duplicate_only_column_names(
+            serializer.validated_data['duplicate_only'], column_ids_to_names
+        )
 
         try:
 
@@ -65,7 +81,8 @@ class RecordViewSet(viewsets.ViewSet):
                 filters=filter_processed,
                 order_by=name_converted_order_by,
                 grouping=name_converted_group_by,
-                duplicate_only=serializer.validated_data['duplicate_only'],
+                duplicate_only=name_converted_duplicate_only,
+                count_mode=serializer.validated_data['count'],
             )
         except (BadDBFunctionFormat, UnknownDBFunctionID, ReferencedColumnsDontExist) as e:
             raise database_api_exceptions.BadFilterAPIException(
@@ -85,6 +102,22 @@ class RecordViewSet(viewsets.ViewSet):
                 field='grouping',
                 status_code=status.HTTP_400_BAD_REQUEST
             )
+        except BadCursorFormat as e:
+            raise database_api_exceptions.BadCursorAPIException(
+                e,
+                field='cursor',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except DataError as e:
+            # The values of a cursor are only cast to the types of the sort
+            # columns once they're compared with them.
+            if paginator.cursor_query_param not in request.query_params:
+                raise
+            raise database_api_exceptions.BadCursorAPIException(
+                e,
+                field='cursor',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
         except UndefinedFunction as e:
             raise database_api_exceptions.UndefinedFunctionAPIException(
                 e,
@@ -96,7 +129,10 @@ class RecordViewSet(viewsets.ViewSet):
             many=True,
             context=self.get_serializer_context(table)
         )
-        return paginator.get_paginated_response(serializer.data)
+        response = paginator.get_paginated_response(serializer.data)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
 
     def retrieve(self, request, pk=None, table_pk=None):
         table = get_table_or_404(table_pk)
@@ -0,0 +1,113 @@
+from rest_framework import status, viewsets
+from rest_framework.renderers import BrowsableAPIRenderer
+
+import mathesar.api.exceptions.database_exceptions.exceptions as database_api_exceptions
+from db.functions.exceptions import (
+    BadDBFunctionFormat, ReferencedColumnsDontExist, UnknownDBFunctionID
+)
+from db.records.exceptions import (
+    AggregateFieldNotFound, BadAggregateFormat, BadGroupFormat, GroupFieldNotFound,
+    InvalidGroupType, UndefinedFunction
+)
+from mathesar.api.pagination import TableLimitOffsetSummaryPagination
+from mathesar.api.serializers.summaries import SummaryListParameterSerializer
+from mathesar.api.utils import get_duplicate_only_column_names, get_table_or_404
+from mathesar.functions.operations.convert import rewrite_db_function_spec_column_ids_to_names
+from mathesar.models import Table
+from mathesar.utils.json import MathesarJSONRenderer
+
+
+class SummaryViewSet(viewsets.ViewSet):
+    def get_queryset(self):
+        return Table.objects.all().order_by('-created_at')
+
+    renderer_classes = [MathesarJSONRenderer, BrowsableAPIRenderer]
+
+    # The `grouping` parameter has the same format as for the records endpoint.
+    # The `aggregates` parameter is a list of {"function": ..., "column": ...}
+    # objects, where the function is one of count, sum, avg, min and max, and
+    # the column may be omitted for count.  Pagination is over the groups.
+    def list(self, request, table_pk=None):
+        paginator = TableLimitOffsetSummaryPagination()
+
+        serializer = SummaryListParameterSerializer(data=request.GET)
+        serializer.is_valid(raise_exception=True)
+        table = get_table_or_404(table_pk)
+
+        filter_unprocessed = serializer.validated_data['filter']
+        grouping = serializer.validated_data['grouping']
+        aggregates = serializer.validated_data['aggregates']
+        column_names_to_ids = table.get_column_name_id_bidirectional_map()
+        column_ids_to_names = column_names_to_ids.inverse
+        filter_processed = None
+        if filter_unprocessed:
+            filter_processed = rewrite_db_function_spec_column_ids_to_names(
+                column_ids_to_names=column_ids_to_names,
+                spec=filter_unprocessed,
+            )
+        name_converted_duplicate_only = get_duplicate_only_column_names(
+            serializer.validated_data['duplicate_only'], column_ids_to_names
+        )
+
+        # Replace the column ids used in the grouping and aggregates with column names
+        try:
+            name_converted_group_by = {
+                **grouping,
+                'columns': [column_ids_to_names[column_id] for column_id in grouping['columns']]
+            }
+        except (KeyError, TypeError) as e:
+            raise database_api_exceptions.BadGroupAPIException(
+                e,
+                message='Grouping must refer to columns of the table by id.',
+                field='grouping',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            name_converted_aggregates = [
+                {
+                    **aggregate,
+                    'column': column_ids_to_names[aggregate['column']],
+                } if aggregate.get('column') is not None else aggregate
+                for aggregate in aggregates
+            ]
+        except (KeyError, TypeError) as e:
+            raise database_api_exceptions.BadAggregateAPIException(
+                e,
+                message='Aggregates must refer to columns of the table by id.',
+                field='aggregates',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            summaries = paginator.paginate_queryset(
+                self.get_queryset(), request, table, column_names_to_ids,
+                name_converted_group_by,
+                name_converted_aggregates,
+                filters=filter_processed,
+                duplicate_only=name_converted_duplicate_only,
+            )
+        except (BadDBFunctionFormat, UnknownDBFunctionID, ReferencedColumnsDontExist) as e:
+            raise database_api_exceptions.BadFilterAPIException(
+                e,
+                field='filters',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except (BadAggregateFormat, AggregateFieldNotFound) as e:
+            raise database_api_exceptions.BadAggregateAPIException(
+                e,
+                field='aggregates',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except (BadGroupFormat, GroupFieldNotFound, InvalidGroupType) as e:
+            raise database_api_exceptions.BadGroupAPIException(
+                e,
+                field='grouping',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except UndefinedFunction as e:
+            raise database_api_exceptions.UndefinedFunctionAPIException(
+                e,
+                details=e.args[0],
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return paginator.get_paginated_response(summaries)
@@ -14,10 +14,13 @@ from mathesar.api.exceptions.generic_exceptions import base_exceptions as base_a
 from db.types.exceptions import UnsupportedTypeException
 from mathesar.api.dj_filters import TableFilter
 from mathesar.api.pagination import DefaultLimitOffsetPagination
-from mathesar.api.serializers.tables import TableSerializer, TablePreviewSerializer
+from mathesar.api.serializers.tables import (
+    TableDataVersionsParameterSerializer, TableSerializer, TablePreviewSerializer
+)
+from mathesar.api.utils import get_table_conditional_response
 from mathesar.models import Table
 from mathesar.utils.tables import (
-    get_table_column_types
+    get_table_column_types, get_tables_data_versions
 )
 
 
@@ -30,6 +33,13 @@ class TableViewSet(CreateModelMixin, RetrieveModelMixin, ListModelMixin, viewset
     def get_queryset(self):
         return Table.objects.all().order_by('-created_at')
 
+    # Responses have an ETag, and requests with a matching If-None-Match header
+    # get a 304 response without reflecting or serializing the table.
+    def retrieve(self, request, pk=None):
+        return get_table_conditional_response(
+            request, pk, lambda: super(TableViewSet, self).retrieve(request, pk=pk)
+        )
+
     def partial_update(self, request, pk=None):
         serializer = TableSerializer(
             data=request.data, context={'request': request}, partial=True
@@ -64,6 +74,17 @@ class TableViewSet(CreateModelMixin, RetrieveModelMixin, ListModelMixin, viewset
         table.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    # Returns the data versions of the tables given by the `ids` parameter,
+    # keyed by table id.  A version changes whenever the table's records do.
+    @action(methods=['get'], detail=False)
+    def data_versions(self, request):
+        serializer = TableDataVersionsParameterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        tables = self.get_queryset().filter(
+            id__in=serializer.validated_data['ids']
+        ).select_related('schema__database')
+        return Response(get_tables_data_versions(tables))
+
     @action(methods=['get'], detail=True)
     def type_suggestions(self, request, pk=None):
         table = self.get_object()
@@ -175,6 +175,51 @@ class BadGroupAPIException(MathesarAPIException):
         super().__init__(exception, self.error_code, message, field, details, status_code)
 
 
+class BadAggregateAPIException(MathesarAPIException):
+    # Default message is not needed as the exception string provides enough details
+    error_code = ErrorCodes.UnsupportedType.value
+
+    def __init__(
+            self,
+            exception,
+            message=None,
+            field=None,
+            details=None,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+    ):
+        super().__init__(exception, self.error_code, message, field, details, status_code)
+
+
+class BadDuplicateAPIException(MathesarAPIException):
+    # Default message is not needed as the exception string provides enough details
+    error_code = ErrorCodes.UnsupportedType.value
+
+    def __init__(
+            self,
+            exception,
+            message=None,
+            field=None,
+            details=None,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+    ):
+        super().__init__(exception, self.error_code, message, field, details, status_code)
+
+
+class BadCursorAPIException(MathesarAPIException):
+    # Default message is not needed as the exception string provides enough details
+    error_code = ErrorCodes.UnsupportedType.value
+
+    def __init__(
+            self,
+            exception,
+            message=None,
+            field=None,
+            details=None,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+    ):
+        super().__init__(exception, self.error_code, message, field, details, status_code)
+
+
 class RaiseExceptionAPIException(MathesarAPIException):
     """
     Exception raised inside a postgres function
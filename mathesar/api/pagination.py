@@ -1,10 +1,36 @@
+import base64
+import binascii
+import decimal
+import json
 from collections import OrderedDict
+from enum import Enum
 
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 
-from db.records.operations.group import GroupBy
+from db.records.exceptions import BadCursorFormat
+from db.records.operations.aggregate import Aggregate
+from db.records.operations.group import GroupBy, GroupMetadataField, get_group_ids
+from db.records.operations.select import get_unique_order_by
 from mathesar.api.utils import get_table_or_404, process_annotated_records
+from mathesar.utils.json import MathesarJSONEncoder
+
+
+class CursorJSONEncoder(MathesarJSONEncoder):
+    """
+    Cursor values are compared against column values by Postgres, so they
+    must not lose precision on the way through JSON.
+    """
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+class CountMode(Enum):
+    EXACT = 'exact'
+    ESTIMATE = 'estimate'
+    NONE = 'none'
 
 
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
@@ -36,6 +62,9 @@ class ColumnLimitOffsetPagination(DefaultLimitOffsetPagination):
 
 
 class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
+    # Passing this parameter (even empty, for the first page) switches to keyset
+    # pagination, which seeks past the previous page instead of using OFFSET.
+    cursor_query_param = 'cursor'
 
     def paginate_queryset(
         self,
@@ -46,15 +75,26 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
         order_by=[],
         group_by=None,
         duplicate_only=None,
+        count_mode=CountMode.EXACT.value,
     ):
         self.limit = self.get_limit(request)
         if self.limit is None:
             self.limit = self.default_limit
         self.offset = self.get_offset(request)
-        # TODO: Cache count value somewhere, since calculating it is expensive.
-        self.count = table.sa_num_records(filter=filters)
+        if count_mode == CountMode.NONE.value:
+            self.count = None
+        else:
+            self.count = table.sa_num_records(
+                filter=filters, estimate=count_mode == CountMode.ESTIMATE.value
+            )
         self.request = request
 
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if self.cursor_mode:
+            return self._paginate_by_cursor(
+                request, table, filters, order_by, group_by, duplicate_only
+            )
+
         return table.get_records(
             self.limit,
             self.offset,
@@ -64,18 +104,52 @@ class TableLimitOffsetPagination(DefaultLimitOffsetPagination):
             duplicate_only=duplicate_only,
         )
 
+    def _paginate_by_cursor(self, request, table, filters, order_by, group_by, duplicate_only):
+        self.offset = 0
+        # We fetch an extra record to find out whether there is a next page.
+        records = table.get_records(
+            self.limit + 1,
+            None,
+            filter=filters,
+            order_by=order_by,
+            group_by=group_by,
+            duplicate_only=duplicate_only,
+            cursor=self.decode_cursor(request),
+        )
+        if len(records) > self.limit:
+            records = records[:self.limit]
+            unique_order_by = get_unique_order_by(table._sa_table, order_by)
+            self.next_cursor = self.encode_cursor(
+                [records[-1]._mapping[sort_spec['field']] for sort_spec in unique_order_by]
+            )
+        else:
+            self.next_cursor = None
+        return records
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (ValueError, binascii.Error) as e:
+            raise BadCursorFormat(f'Cursor "{encoded}" is invalid.') from e
+
+    def encode_cursor(self, values):
+        encoded = json.dumps(values, cls=CursorJSONEncoder).encode('utf-8')
+        return base64.urlsafe_b64encode(encoded).decode('ascii')
+
 
 class TableLimitOffsetGroupPagination(TableLimitOffsetPagination):
     def get_paginated_response(self, data):
-        return Response(
-            OrderedDict(
-                [
-                    ('count', self.count),
-                    ('grouping', self.grouping),
-                    ('results', data)
-                ]
-            )
-        )
+        response_data = [
+            ('count', self.count),
+            ('grouping', self.grouping),
+            ('results', data)
+        ]
+        if self.cursor_mode:
+            response_data.append(('next_cursor', self.next_cursor))
+        return Response(OrderedDict(response_data))
 
     def paginate_queryset(
         self,
@@ -87,6 +161,7 @@ class TableLimitOffsetGroupPagination(TableLimitOffsetPagination):
         order_by=[],
         grouping={},
         duplicate_only=None,
+        count_mode=CountMode.EXACT.value,
     ):
         group_by = GroupBy(**grouping) if grouping else None
         records = super().paginate_queryset(
@@ -97,12 +172,24 @@ class TableLimitOffsetGroupPagination(TableLimitOffsetPagination):
             order_by=order_by,
             group_by=group_by,
             duplicate_only=duplicate_only,
+            count_mode=count_mode,
         )
 
         if records:
+            if group_by:
+                # Only the groups of the records on this page are summarized.
+                group_metadata = table.get_group_summaries(
+                    group_by,
+                    get_group_ids(records),
+                    filter=filters,
+                    duplicate_only=duplicate_only,
+                )
+            else:
+                group_metadata = None
             processed_records, groups = process_annotated_records(
                 records,
                 column_name_id_bidirectional_map,
+                group_metadata,
             )
         else:
             processed_records, groups = None, None
@@ -119,3 +206,95 @@ class TableLimitOffsetGroupPagination(TableLimitOffsetPagination):
             self.grouping = None
 
         return processed_records
+
+
+class TableLimitOffsetSummaryPagination(DefaultLimitOffsetPagination):
+    """
+    Paginates the groups of the records of a table, giving the metadata and
+    the aggregate values of each group.
+    """
+    def paginate_queryset(
+        self,
+        queryset,
+        request,
+        table,
+        column_name_id_bidirectional_map,
+        grouping,
+        aggregates,
+        filters=None,
+        duplicate_only=None,
+    ):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            self.limit = self.default_limit
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        group_by = GroupBy(**grouping)
+        aggregates = [Aggregate(**aggregate) for aggregate in aggregates]
+        self.count = table.get_group_count(
+            group_by, filter=filters, duplicate_only=duplicate_only
+        )
+        group_aggregates = table.get_aggregates(
+            group_by,
+            aggregates,
+            limit=self.limit,
+            offset=self.offset,
+            filter=filters,
+            duplicate_only=duplicate_only,
+        )
+        group_metadata = table.get_group_summaries(
+            group_by,
+            [group_id for group_id, _ in group_aggregates],
+            filter=filters,
+            duplicate_only=duplicate_only,
+        )
+        group_metadata_by_id = {
+            grp[GroupMetadataField.GROUP_ID.value]: grp for grp in group_metadata
+        }
+
+        def _replace_column_names_with_ids(group_metadata_item):
+            if isinstance(group_metadata_item, dict):
+                return {
+                    column_name_id_bidirectional_map[k]: v
+                    for k, v in group_metadata_item.items()
+                }
+            return group_metadata_item
+
+        return [
+            {
+                k: _replace_column_names_with_ids(v)
+                for k, v in group_metadata_by_id[group_id].items()
+            } | {'aggregates': aggregate_values}
+            for group_id, aggregate_values in group_aggregates
+        ]
+
+
+class TableLimitOffsetDuplicatePagination(DefaultLimitOffsetPagination):
+    """
+    Paginates the groups of records of a table that share the values of the
+    duplicate_only columns, giving the values and the size of each group.
+    """
+    def paginate_queryset(
+        self,
+        queryset,
+        request,
+        table,
+        column_name_id_bidirectional_map,
+        duplicate_only,
+    ):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            self.limit = self.default_limit
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        self.count = table.get_duplicate_group_count(duplicate_only)
+        duplicate_groups = table.get_duplicate_groups(
+            duplicate_only, limit=self.limit, offset=self.offset
+        )
+        column_ids = [column_name_id_bidirectional_map[name] for name in duplicate_only]
+        return [
+            {'values': dict(zip(column_ids, values)), 'count': count}
+            for values, count in duplicate_groups
+        ]
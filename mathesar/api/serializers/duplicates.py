@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
+
+
+class DuplicateListParameterSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    duplicate_only = serializers.JSONField()
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
+from mathesar.models import ImportJob
+from mathesar.utils.tables import gen_table_name
+
+
+class ImportJobSerializer(MathesarErrorMessageMixin, serializers.ModelSerializer):
+    name = serializers.CharField(required=False, allow_blank=True, default='')
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'data_file', 'schema', 'name', 'infer_types', 'status', 'table', 'rows_copied',
+            'bytes_processed', 'bytes_total', 'error', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'status', 'table', 'rows_copied', 'bytes_processed', 'bytes_total', 'error'
+        ]
+
+    def validate(self, data):
+        data = super().validate(data)
+        if not data.get('name'):
+            data['name'] = gen_table_name(data['schema'], [data['data_file']])
+        return data
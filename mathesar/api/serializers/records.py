@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 
 import mathesar.api.exceptions.database_exceptions.exceptions as database_api_exceptions
 from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
+from mathesar.api.pagination import CountMode
 
 
 class RecordListParameterSerializer(MathesarErrorMessageMixin, serializers.Serializer):
@@ -12,6 +13,11 @@ class RecordListParameterSerializer(MathesarErrorMessageMixin, serializers.Seria
     order_by = serializers.JSONField(required=False, default=[])
     grouping = serializers.JSONField(required=False, default={})
     duplicate_only = serializers.JSONField(required=False, default=None)
+    count = serializers.ChoiceField(
+        choices=[count_mode.value for count_mode in CountMode],
+        required=False,
+        default=CountMode.EXACT.value,
+    )
 
 
 class RecordSerializer(MathesarErrorMessageMixin, serializers.BaseSerializer):
@@ -0,0 +1,46 @@
+from rest_framework import serializers, status
+
+from db.records.exceptions import BadAggregateFormat, BadGroupFormat
+from mathesar.api.exceptions.database_exceptions.exceptions import (
+    BadAggregateAPIException, BadGroupAPIException
+)
+from mathesar.api.exceptions.mixins import MathesarErrorMessageMixin
+
+GROUPING_KEYS = {'columns', 'mode', 'num_groups'}
+AGGREGATE_KEYS = {'function', 'column'}
+
+
+class SummaryListParameterSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    grouping = serializers.JSONField()
+    aggregates = serializers.JSONField(required=False, default=[])
+    filter = serializers.JSONField(required=False, default=None)
+    duplicate_only = serializers.JSONField(required=False, default=None)
+
+    def validate_grouping(self, grouping):
+        if (
+                not isinstance(grouping, dict)
+                or not isinstance(grouping.get('columns'), list)
+                or not set(grouping) <= GROUPING_KEYS
+        ):
+            raise BadGroupAPIException(
+                BadGroupFormat(
+                    f'grouping must be an object with a columns list, and only the keys {sorted(GROUPING_KEYS)}.'
+                ),
+                field='grouping',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return grouping
+
+    def validate_aggregates(self, aggregates):
+        if not isinstance(aggregates, list) or not all(
+                isinstance(aggregate, dict) and 'function' in aggregate and set(aggregate) <= AGGREGATE_KEYS
+                for aggregate in aggregates
+        ):
+            raise BadAggregateAPIException(
+                BadAggregateFormat(
+                    f'aggregates must be a list of objects with a function, and only the keys {sorted(AGGREGATE_KEYS)}.'
+                ),
+                field='aggregates',
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return aggregates
@@ -114,3 +114,7 @@ class TablePreviewSerializer(MathesarErrorMessageMixin, serializers.Serializer):
         if not len(columns) == len(table.sa_columns):
             raise ColumnSizeMismatchAPIException()
         return columns
+
+
+class TableDataVersionsParameterSerializer(MathesarErrorMessageMixin, serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField())
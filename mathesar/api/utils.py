@@ -1,5 +1,13 @@
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
 from rest_framework.exceptions import NotFound
 
+import mathesar.api.exceptions.database_exceptions.exceptions as database_api_exceptions
+from db.records.exceptions import BadDuplicateFormat
 from db.records.operations import group
 from mathesar.models import Table
 
@@ -22,7 +30,84 @@ def get_table_or_404(pk):
     return table
 
 
-def process_annotated_records(record_list, column_name_id_map):
+def get_table_etag(request, table_pk, include_records=False):
+    """
+    Returns a strong ETag for the response to a request about the table with
+    the given id, or None if the table's versions can't be told.  The ETag is
+    computed without reflecting the database or querying the table's records:
+    it changes with the table's definition in the database, the models
+    describing it, the request's parameters and media type, and, if
+    include_records is set, the table's records.
+    """
+    table = Table.current_objects.filter(id=table_pk).select_related('schema__database').first()
+    if table is None:
+        return None
+    versions = [table.schema_version, table.get_metadata_version()]
+    if include_records:
+        versions.extend([table.data_version, table.records_version])
+    if None in versions:
+        return None
+    etag_data = json.dumps(
+        [request.get_full_path(), request.accepted_media_type, versions], default=str
+    )
+    return quote_etag(hashlib.sha1(etag_data.encode('utf-8')).hexdigest())
+
+
+def get_not_modified_response(request, etag):
+    """
+    Returns a 304 Not Modified response if the request's If-None-Match header
+    matches the ETag, or None if the full response should be sent.
+    """
+    if etag is None:
+        return None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def get_table_conditional_response(request, table_pk, get_response, include_records=False):
+    """
+    Returns a 304 Not Modified response if the request's If-None-Match header
+    matches the table's ETag, and otherwise the response from get_response,
+    with the ETag.
+    """
+    etag = get_table_etag(request, table_pk, include_records=include_records)
+    not_modified_response = get_not_modified_response(request, etag)
+    if not_modified_response is not None:
+        return not_modified_response
+    response = get_response()
+    if etag is not None:
+        response['ETag'] = etag
+    return response
+
+
+def get_duplicate_only_column_names(duplicate_only, column_ids_to_names):
+    """
+    Returns the names of the columns given by the duplicate_only parameter,
+    which is a column id or a non-empty list of column ids.
+    """
+    if duplicate_only is None:
+        return None
+    column_ids = duplicate_only if isinstance(duplicate_only, list) else [duplicate_only]
+    try:
+        if not column_ids:
+            raise BadDuplicateFormat('duplicate_only must not be empty.')
+        return [column_ids_to_names[column_id] for column_id in column_ids]
+    except (BadDuplicateFormat, KeyError, TypeError) as e:
+        raise database_api_exceptions.BadDuplicateAPIException(
+            e,
+            message='duplicate_only must refer to columns of the table by id.',
+            field='duplicate_only',
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+
+def process_annotated_records(record_list, column_name_id_map, group_metadata=None):
+    """
+    Splits the records into their data and metadata, and attaches the indices
+    of the records in each group to the given group metadata.
+    """
 
     RESULT_IDX = 'result_indices'
 
@@ -34,7 +119,7 @@ def process_annotated_records(record_list, column_name_id_map):
         for record_dict in (_get_record_dict(record) for record in record_list)
     )
 
-    combined_records, groups = group.extract_group_metadata(
+    combined_records, group_ids = group.extract_group_metadata(
         split_records, data_key=DATA_KEY, metadata_key=METADATA_KEY
     )
 
@@ -51,13 +136,13 @@ def process_annotated_records(record_list, column_name_id_map):
             processed_group_metadata_item = group_metadata_item
         return processed_group_metadata_item
 
-    if groups is not None:
+    if group_ids is not None and group_metadata is not None:
         groups_by_id = {
             grp[group.GroupMetadataField.GROUP_ID.value]: {
                 k: _replace_column_names_with_ids(v) for k, v in grp.items()
                 if k != group.GroupMetadataField.GROUP_ID.value
             } | {RESULT_IDX: []}
-            for grp in groups
+            for grp in group_metadata
         }
 
         for i, meta in enumerate(record_metadata):
@@ -1,13 +1,91 @@
+from threading import Lock
+
 from django.conf import settings
 
 from db import engine
 
+# Process-wide registry of engines, keyed by Django database key. Each entry
+# holds the configuration used to build the engine, so that a changed
+# configuration can be detected and the stale engine disposed of.
+_engine_registry = {}
+_engine_registry_lock = Lock()
 
-def create_mathesar_engine(database):
+
+def _get_engine_config(database):
+    db_settings = settings.DATABASES[database]
+    return (
+        db_settings["USER"],
+        db_settings["PASSWORD"],
+        db_settings["HOST"],
+        db_settings["NAME"],
+        db_settings["PORT"],
+        settings.MATHESAR_ENGINE_POOL_SIZE,
+        settings.MATHESAR_ENGINE_MAX_OVERFLOW,
+        settings.MATHESAR_ENGINE_POOL_RECYCLE,
+        settings.MATHESAR_ENGINE_POOL_PRE_PING,
+    )
+
+
+def _create_engine_from_config(config):
+    user, password, host, name, port, pool_size, max_overflow, pool_recycle, pool_pre_ping = config
     return engine.create_future_engine_with_custom_types(
-        settings.DATABASES[database]["USER"],
-        settings.DATABASES[database]["PASSWORD"],
-        settings.DATABASES[database]["HOST"],
-        settings.DATABASES[database]["NAME"],
-        settings.DATABASES[database]["PORT"],
+        user, password, host, name, port,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
     )
+
+
+def create_mathesar_engine(database):
+    """
+    Creates a new engine for the given database key. Most callers should use
+    get_mathesar_engine instead, which shares a single pooled engine.
+    """
+    return _create_engine_from_config(_get_engine_config(database))
+
+
+def get_mathesar_engine(database):
+    """
+    Returns the shared engine for the given database key, creating it on first
+    use. If the database configuration has changed since the engine was
+    created, the old engine is disposed of and replaced.
+    """
+    config = _get_engine_config(database)
+    entry = _engine_registry.get(database)
+    if entry is not None and entry[0] == config:
+        return entry[1]
+    with _engine_registry_lock:
+        entry = _engine_registry.get(database)
+        if entry is not None and entry[0] == config:
+            return entry[1]
+        if entry is not None:
+            entry[1].dispose()
+        sa_engine = _create_engine_from_config(config)
+        _engine_registry[database] = (config, sa_engine)
+        return sa_engine
+
+
+def dispose_mathesar_engines():
+    """Disposes of all registered engines and empties the registry."""
+    with _engine_registry_lock:
+        for _, sa_engine in _engine_registry.values():
+            sa_engine.dispose()
+        _engine_registry.clear()
+
+
+def get_engine_pool_stats():
+    """
+    Returns connection pool statistics for each registered engine, keyed by
+    database key.
+    """
+    stats = {}
+    for database, (_, sa_engine) in list(_engine_registry.items()):
+        pool = sa_engine.pool
+        stats[database] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+    return stats
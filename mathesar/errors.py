@@ -14,3 +14,7 @@ class URLInvalidContentTypeError(Exception):
     def __init__(self, content_type, *args):
         self.content_type = content_type
         super().__init__(*args)
+
+
+class ImportJobCancelled(Exception):
+    pass
@@ -1,15 +1,27 @@
+import codecs
+import itertools
+import os
+import re
+from functools import partial
 from io import TextIOWrapper
+from time import time
+from uuid import uuid4
 
 import clevercsv as csv
+from sqlalchemy import inspect
 
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 from mathesar.models import Table
 from db.records.operations.insert import insert_records_from_csv
-from db.tables.operations.create import create_string_column_table
-from db.tables.operations.select import get_oid_from_table
+from db.columns.operations.infer_types import infer_column_types_from_rows
+from db.tables.operations.create import (
+    check_table_name_available, create_string_column_table, create_typed_column_table
+)
+from db.tables.operations.alter import publish_staging_table
+from db.tables.operations.select import get_oid_from_table, reflect_table
 from db.tables.operations.drop import drop_table
 from mathesar.errors import InvalidTableError
-from db.constants import ID, ID_ORIGINAL, COLUMN_NAME_TEMPLATE
+from db.constants import ID, ID_ORIGINAL, COLUMN_NAME_TEMPLATE, IMPORT_SCHEMA, MATHESAR_PREFIX
 from psycopg2.errors import IntegrityError, DataError
 
 from mathesar.reflection import reflect_columns_from_table
@@ -17,23 +29,82 @@ from mathesar.reflection import reflect_columns_from_table
 ALLOWED_DELIMITERS = ",\t:|"
 SAMPLE_SIZE = 20000
 CHECK_ROWS = 10
+ENCODING_SAMPLE_SIZE = 64 * 1024
+# Number of rows checked to tell whether the values of an id column can be
+# used as the ids of the imported records, which are integers.
+ID_SAMPLE_ROWS = 1000
+ID_VALUE_PATTERN = re.compile(r'^\s*[+-]?\d+\s*$')
+ID_MIN = -2 ** 31
+ID_MAX = 2 ** 31 - 1
+# Number of rows read between calls of the progress callback while inferring
+# column types.
+INFERENCE_PROGRESS_ROWS = 1000
+# Staging tables are named after the time they're created, so that those left
+# behind by a crashed process can be dropped once they're older than any
+# import could take.
+STAGING_TABLE_PREFIX = f"{MATHESAR_PREFIX}import_"
+STAGING_TABLE_NAME_PATTERN = re.compile(rf'^{re.escape(STAGING_TABLE_PREFIX)}(\d+)_[0-9a-f]+$')
+STAGING_TABLE_MAX_AGE = 24 * 60 * 60
+# The longer UTF-32 marks come first, since the UTF-16 LE mark is a prefix of
+# the UTF-32 LE one.
+BYTE_ORDER_MARKS = (
+    codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE
+)
+
+
+def _get_encoding_sample(file):
+    """
+    Returns up to ENCODING_SAMPLE_SIZE bytes from each of the head, middle and
+    tail of the file.  The middle and tail samples are cut at line breaks, so
+    that they don't start or end within a multi-byte character.  Files with a
+    byte order mark are only sampled from the head, since the mark determines
+    their encoding, and the other samples may be misaligned with it.
+    """
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+    head = file.read(ENCODING_SAMPLE_SIZE)
+    if size <= ENCODING_SAMPLE_SIZE * 3:
+        return head + file.read()
+    if head.startswith(BYTE_ORDER_MARKS):
+        return head
+    samples = [head[:head.rfind(b'\n') + 1] or head]
+    for offset in [size // 2 - ENCODING_SAMPLE_SIZE // 2, size - ENCODING_SAMPLE_SIZE]:
+        file.seek(offset)
+        sample = file.read(ENCODING_SAMPLE_SIZE)
+        start = sample.find(b'\n') + 1
+        end = sample.rfind(b'\n') + 1 if offset + len(sample) < size else len(sample)
+        if 0 < start < end:
+            samples.append(sample[start:end])
+    return b''.join(samples)
 
 
 def get_file_encoding(file):
     """
-    Given a file, uses charset_normalizer if installed or chardet which is installed as part of clevercsv module to
-    detect the file encoding. Returns a default value of utf-8-sig if encoding could not be detected or detection
-    libraries are missing.
+    Given a binary file, uses charset_normalizer to detect the file encoding from samples of its head,
+    middle and tail, so that large files aren't read whole. Returns a default value of utf-8 if encoding
+    could not be detected.
     """
     from charset_normalizer import detect
-    # Sample Size reduces the accuracy
-    encoding = detect(file.read()).get('encoding', None)
+    encoding = detect(_get_encoding_sample(file)).get('encoding', None)
     file.seek(0)
     if encoding is not None:
         return encoding
     return "utf-8"
 
 
+def get_data_file_encoding(data_file):
+    """
+    Returns the encoding of the data file, detecting it and saving it on the
+    data file if it hasn't been detected yet.
+    """
+    if not data_file.encoding:
+        with open(data_file.file.path, 'rb') as sv_file:
+            data_file.encoding = get_file_encoding(sv_file)
+        data_file.save(update_fields=['encoding'])
+    return data_file.encoding
+
+
 def check_dialect(file, dialect):
     """
     Checks to see if we can parse the given file with the given dialect
@@ -91,8 +162,9 @@ def get_sv_dialect(file):
         raise InvalidTableError
 
 
-def get_sv_reader(file, header, dialect=None):
-    encoding = get_file_encoding(file)
+def get_sv_reader(file, header, dialect=None, encoding=None):
+    if encoding is None:
+        encoding = get_file_encoding(file)
     file = TextIOWrapper(file, encoding=encoding)
     if dialect:
         reader = csv.DictReader(file, dialect=dialect)
@@ -107,62 +179,198 @@ def get_sv_reader(file, header, dialect=None):
     return reader
 
 
-def create_db_table_from_data_file(data_file, name, schema):
-    engine = create_mathesar_engine(schema.database.name)
+def _can_use_id_values(sv_reader, id_fieldname):
+    """
+    Returns whether the values of the id column in the first ID_SAMPLE_ROWS
+    rows can be used as the ids of the table's records, i.e. whether they are
+    distinct integers.  The rest of the file may still have values which
+    can't be used.
+    """
+    id_values = set()
+    for row in itertools.islice(sv_reader, ID_SAMPLE_ROWS):
+        value = row.get(id_fieldname)
+        if value is None or not ID_VALUE_PATTERN.match(value):
+            return False
+        id_value = int(value)
+        if not ID_MIN <= id_value <= ID_MAX or id_value in id_values:
+            return False
+        id_values.add(id_value)
+    return True
+
+
+def _get_column_name_layouts(sv_reader):
+    """
+    Returns the lists of column names to try importing the file with, in
+    order.  If the file has an id column, its values are used as the ids of
+    the records if possible.  Otherwise it's renamed, and the records get
+    generated ids.  The choice is made from a sample of the file, so that
+    the file is usually copied only once.
+    """
+    column_names = [column_name.strip() for column_name in sv_reader.fieldnames]
+    column_names = [f"{COLUMN_NAME_TEMPLATE}{i}" if name == '' else name for i, name in enumerate(column_names)]
+    if ID not in column_names:
+        return [column_names]
+    column_names_alt = [fieldname if fieldname != ID else ID_ORIGINAL for fieldname in column_names]
+    id_fieldname = sv_reader.fieldnames[column_names.index(ID)]
+    if _can_use_id_values(sv_reader, id_fieldname):
+        # The rest of the file may have unusable ids after all.
+        return [column_names, column_names_alt]
+    return [column_names_alt]
+
+
+def _infer_column_types(sv_reader, sv_file, progress_callback=None):
+    """
+    Infers the types of the columns of the file from all of its values, in
+    the order of the reader's fieldnames.  The progress callback is given the
+    number of bytes of the file read so far every INFERENCE_PROGRESS_ROWS
+    rows, and may stop the inference by raising.
+    """
+    fieldnames = sv_reader.fieldnames
+
+    def _get_rows():
+        for i, row in enumerate(sv_reader):
+            if progress_callback is not None and i % INFERENCE_PROGRESS_ROWS == 0:
+                progress_callback(sv_file.tell())
+            yield [row[fieldname] for fieldname in fieldnames]
+    return infer_column_types_from_rows(_get_rows(), len(fieldnames))
+
+
+def _offset_progress(progress_callback, offset, bytes_processed):
+    progress_callback(offset + bytes_processed)
+
+
+def _is_id_column_error(error, column_names):
+    """
+    Returns whether the error copying the file was caused by the values of
+    the id column not being usable as the ids of the records.
+    """
+    if ID not in column_names:
+        return False
+    if isinstance(error, IntegrityError):
+        return True
+    # COPY gives the column of the value it couldn't read in the context of
+    # the error, e.g. 'COPY table, line 3, column id: "x"'.
+    return f", column {ID}:" in (error.diag.context or '')
+
+
+def _get_staging_table_name():
+    # The name is kept short, so that Postgres doesn't have to truncate it in
+    # the names of the table's constraints and sequences.
+    return f"{STAGING_TABLE_PREFIX}{int(time())}_{uuid4().hex[:16]}"
+
+
+def drop_stale_staging_tables(engine):
+    """
+    Drops the staging tables older than STAGING_TABLE_MAX_AGE, which were
+    left behind by imports whose process stopped.
+    """
+    now = time()
+    for table_name in inspect(engine).get_table_names(schema=IMPORT_SCHEMA):
+        match = STAGING_TABLE_NAME_PATTERN.match(table_name)
+        if match and now - int(match.group(1)) > STAGING_TABLE_MAX_AGE:
+            drop_table(name=table_name, schema=IMPORT_SCHEMA, engine=engine, if_exists=True)
+
+
+def _create_staging_table(staging_name, column_names, column_types, engine):
+    if column_types is None:
+        return create_string_column_table(
+            name=staging_name,
+            schema=IMPORT_SCHEMA,
+            column_names=column_names,
+            engine=engine,
+            unlogged=True,
+        )
+    return create_typed_column_table(
+        name=staging_name,
+        schema=IMPORT_SCHEMA,
+        column_names=column_names,
+        column_types=column_types,
+        engine=engine,
+        unlogged=True,
+    )
+
+
+def create_db_table_from_data_file(data_file, name, schema, progress_callback=None, infer_types=False):
+    """
+    Imports the data file into a new table.  The records are copied into an
+    unlogged staging table, which becomes the table once they're all copied,
+    so that a failed import doesn't leave anything behind.
+
+    With infer_types, the types of the columns are inferred from the file
+    before it's copied, so that the records are written in their final form.
+    Otherwise, or if the file can't be copied with the inferred types after
+    all, all columns are text.
+    """
+    engine = get_mathesar_engine(schema.database.name)
     sv_filename = data_file.file.path
     header = data_file.header
     dialect = csv.dialect.SimpleDialect(data_file.delimiter, data_file.quotechar,
                                         data_file.escapechar)
-    encoding = get_file_encoding(data_file.file)
+    encoding = get_data_file_encoding(data_file)
+    # A taken name would otherwise only be found once the file is copied.
+    check_table_name_available(name, schema.name, engine)
+    drop_stale_staging_tables(engine)
     with open(sv_filename, 'rb') as sv_file:
-        sv_reader = get_sv_reader(sv_file, header, dialect=dialect)
-        column_names = [column_name.strip() for column_name in sv_reader.fieldnames]
-        column_names = [f"{COLUMN_NAME_TEMPLATE}{i}" if name == '' else name for i, name in enumerate(column_names)]
-        column_names_alt = [fieldname if fieldname != ID else ID_ORIGINAL for fieldname in column_names]
-        table = create_string_column_table(
-            name=name,
-            schema=schema.name,
-            column_names=column_names,
-            engine=engine
-        )
-    try:
-        insert_records_from_csv(
-            table,
-            engine,
-            sv_filename,
-            column_names,
-            header,
-            delimiter=dialect.delimiter,
-            escape=dialect.escapechar,
-            quote=dialect.quotechar,
-            encoding=encoding
+        sv_reader = get_sv_reader(sv_file, header, dialect=dialect, encoding=encoding)
+        column_name_layouts = _get_column_name_layouts(sv_reader)
+    column_types = None
+    if infer_types:
+        with open(sv_filename, 'rb') as sv_file:
+            sv_reader = get_sv_reader(sv_file, header, dialect=dialect, encoding=encoding)
+            column_types = _infer_column_types(sv_reader, sv_file, progress_callback)
+    if infer_types and progress_callback is not None:
+        # The file is read twice, so the progress of the copy follows that of
+        # the inference.
+        copy_progress_callback = partial(
+            _offset_progress, progress_callback, os.path.getsize(sv_filename)
         )
-    except (IntegrityError, DataError):
-        drop_table(name=name, schema=schema.name, engine=engine)
-        table = create_string_column_table(
-            name=name,
-            schema=schema.name,
-            column_names=column_names_alt,
-            engine=engine
-        )
-        insert_records_from_csv(
-            table,
-            engine,
-            sv_filename,
-            column_names_alt,
-            header,
-            delimiter=dialect.delimiter,
-            escape=dialect.escapechar,
-            quote=dialect.quotechar,
-            encoding=encoding
-        )
-    return table
+    else:
+        copy_progress_callback = progress_callback
+    staging_name = _get_staging_table_name()
+    column_name_layouts = iter(column_name_layouts)
+    column_names = next(column_name_layouts)
+    while True:
+        staging_table = _create_staging_table(staging_name, column_names, column_types, engine)
+        try:
+            insert_records_from_csv(
+                staging_table,
+                engine,
+                sv_filename,
+                column_names,
+                header,
+                delimiter=dialect.delimiter,
+                escape=dialect.escapechar,
+                quote=dialect.quotechar,
+                encoding=encoding,
+                progress_callback=copy_progress_callback,
+            )
+            publish_staging_table(staging_name, IMPORT_SCHEMA, name, schema.name, engine)
+        except (IntegrityError, DataError) as e:
+            drop_table(name=staging_name, schema=IMPORT_SCHEMA, engine=engine)
+            # Unusable ids are retried with the next column name layout, and
+            # values which don't fit the inferred types are retried as text.
+            if _is_id_column_error(e, column_names):
+                column_names = next(column_name_layouts, None)
+                if column_names is None:
+                    raise
+            elif column_types is not None:
+                column_types = None
+            else:
+                raise
+        except Exception:
+            # Don't leave the staging table behind, e.g. when the import is
+            # cancelled.
+            drop_table(name=staging_name, schema=IMPORT_SCHEMA, engine=engine, if_exists=True)
+            raise
+        else:
+            break
+    return reflect_table(name, schema.name, engine)
 
 
-def create_table_from_csv(data_file, name, schema):
-    engine = create_mathesar_engine(schema.database.name)
+def create_table_from_csv(data_file, name, schema, progress_callback=None, infer_types=False):
+    engine = get_mathesar_engine(schema.database.name)
     db_table = create_db_table_from_data_file(
-        data_file, name, schema
+        data_file, name, schema, progress_callback=progress_callback, infer_types=infer_types
     )
     db_table_oid = get_oid_from_table(db_table.name, db_table.schema, engine)
     # Using current_objects to create the table instead of objects. objects
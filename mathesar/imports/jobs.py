@@ -0,0 +1,200 @@
+"""
+Runs imports of data files into new tables in a pool of worker threads, so
+that large imports don't hold a request until they're done.  Each import is
+tracked by an ImportJob, which reports its progress and can be cancelled.
+Jobs live in the process which started them, which keeps them alive with a
+heartbeat.  Jobs whose heartbeat stopped, because their process stopped, are
+marked as failed when jobs are read.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from mathesar.errors import ImportJobCancelled
+from mathesar.models import ImportJob
+from mathesar.utils.tables import create_table_from_datafile
+
+logger = logging.getLogger(__name__)
+
+# Progress is saved at most once per this many bytes copied, which is also
+# how often cancellation is checked.
+PROGRESS_UPDATE_BYTES = 4 * 1024 * 1024
+# The heartbeat of the jobs of a process is saved this often, in seconds.
+# Unfinished jobs without a heartbeat for ABANDONED_JOB_TIMEOUT are taken to
+# belong to a process which stopped.
+HEARTBEAT_INTERVAL = 30
+ABANDONED_JOB_TIMEOUT = timedelta(minutes=5)
+ABANDONED_JOB_ERROR = 'The import was interrupted, as the process running it stopped.'
+
+_executor = None
+_executor_lock = threading.Lock()
+# Ids of the unfinished jobs of this process, whose heartbeat is saved.
+_active_job_ids = set()
+_heartbeat_thread = None
+_heartbeat_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MATHESAR_IMPORT_WORKERS, thread_name_prefix='mathesar_import'
+            )
+    return _executor
+
+
+def _save_heartbeat():
+    with _heartbeat_lock:
+        job_ids = list(_active_job_ids)
+    if job_ids:
+        ImportJob.objects.filter(id__in=job_ids).update(heartbeat_at=timezone.now())
+
+
+def _run_heartbeat():
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL)
+        try:
+            _save_heartbeat()
+        except Exception:
+            # Missing a beat is fine, but stopping would get the jobs of this
+            # process failed as abandoned.
+            logger.exception('Could not save the heartbeat of import jobs.')
+        finally:
+            connections.close_all()
+
+
+def _add_active_job(job_id):
+    global _heartbeat_thread
+    with _heartbeat_lock:
+        _active_job_ids.add(job_id)
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(
+                target=_run_heartbeat, name='mathesar_import_heartbeat', daemon=True
+            )
+            _heartbeat_thread.start()
+
+
+def _remove_active_job(job_id):
+    with _heartbeat_lock:
+        _active_job_ids.discard(job_id)
+
+
+def fail_abandoned_import_jobs():
+    """
+    Marks the unfinished jobs without a recent heartbeat as failed.
+    """
+    ImportJob.objects.filter(
+        heartbeat_at__lt=timezone.now() - ABANDONED_JOB_TIMEOUT,
+        status__in=[ImportJob.status_choices.QUEUED, ImportJob.status_choices.RUNNING],
+    ).update(status=ImportJob.status_choices.FAILED, error=ABANDONED_JOB_ERROR)
+
+
+def start_import_job(data_file, name, schema, infer_types=False):
+    """
+    Creates an import job for the data file, and runs it in the background
+    unless MATHESAR_IMPORT_WORKERS is 0.  With infer_types, the table is
+    created with the column types inferred from the file.
+    """
+    # Inferring the column types reads the file once more before it's copied.
+    bytes_total = data_file.file.size * (2 if infer_types else 1)
+    job = ImportJob.objects.create(
+        data_file=data_file, name=name, schema=schema, infer_types=infer_types,
+        bytes_total=bytes_total
+    )
+    _add_active_job(job.id)
+    if settings.MATHESAR_IMPORT_WORKERS > 0:
+        _get_executor().submit(_run_import_job_in_worker, job.id)
+    else:
+        run_import_job(job.id)
+        job.refresh_from_db()
+    return job
+
+
+def cancel_import_job(job):
+    """
+    Cancels the import job if it isn't finished.  A running job stops the
+    next time it reports its progress, and drops the table it was importing.
+    """
+    ImportJob.objects.filter(
+        id=job.id,
+        status__in=[ImportJob.status_choices.QUEUED, ImportJob.status_choices.RUNNING],
+    ).update(status=ImportJob.status_choices.CANCELLED)
+    job.refresh_from_db()
+    return job
+
+
+class _ProgressReporter:
+    def __init__(self, job_id):
+        self._job_id = job_id
+        self._reported_bytes = 0
+        self.cancelled = False
+
+    def __call__(self, bytes_processed):
+        if bytes_processed - self._reported_bytes < PROGRESS_UPDATE_BYTES:
+            return
+        self._reported_bytes = bytes_processed
+        updated = ImportJob.objects.filter(
+            id=self._job_id, status=ImportJob.status_choices.RUNNING
+        ).update(bytes_processed=bytes_processed)
+        if not updated:
+            # psycopg2 replaces exceptions raised while COPY reads the file
+            # with its own error, so the cancellation is also noted here.
+            self.cancelled = True
+            raise ImportJobCancelled
+
+
+def _run_import_job(job_id):
+    started = ImportJob.objects.filter(
+        id=job_id, status=ImportJob.status_choices.QUEUED
+    ).update(status=ImportJob.status_choices.RUNNING)
+    if not started:
+        # The job was cancelled before it started.
+        return
+    job = ImportJob.objects.select_related('data_file', 'schema').get(id=job_id)
+    running_job = ImportJob.objects.filter(id=job_id, status=ImportJob.status_choices.RUNNING)
+    progress_reporter = _ProgressReporter(job_id)
+    try:
+        table = create_table_from_datafile(
+            [job.data_file], job.name, job.schema, progress_callback=progress_reporter,
+            infer_types=job.infer_types,
+        )
+    except ImportJobCancelled:
+        return
+    except Exception as e:
+        if not progress_reporter.cancelled:
+            running_job.update(status=ImportJob.status_choices.FAILED, error=str(e))
+        return
+    finished = running_job.update(
+        table=table,
+        rows_copied=table.sa_num_records(),
+        bytes_processed=F('bytes_total'),
+        status=ImportJob.status_choices.DONE,
+    )
+    if not finished:
+        # The job was cancelled after the records were copied.
+        table.delete_sa_table()
+        table.delete()
+
+
+def run_import_job(job_id):
+    try:
+        _run_import_job(job_id)
+    finally:
+        _remove_active_job(job_id)
+
+
+def _run_import_job_in_worker(job_id):
+    # Worker threads get their own database connections, which are closed
+    # once the job is done.
+    try:
+        run_import_job(job_id)
+    finally:
+        connections.close_all()
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management import BaseCommand
+
+from mathesar import reflection
+
+
+class Command(BaseCommand):
+    help = 'Reflects the objects of the user databases into Mathesar models'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=None,
+            help='Keep running, reflecting every INTERVAL seconds.'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            reflection.reflect_db_objects(force=True)
+            if interval is None:
+                break
+            time.sleep(interval)
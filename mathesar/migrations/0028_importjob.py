@@ -0,0 +1,34 @@
+# Generated by Django 3.1.14 on 2026-10-18 03:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0027_auto_20220329_1855'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=63)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed'), ('CANCELLED', 'Cancelled')], default='QUEUED', max_length=128)),
+                ('rows_copied', models.BigIntegerField(blank=True, null=True)),
+                ('bytes_processed', models.BigIntegerField(default=0)),
+                ('bytes_total', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('data_file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='mathesar.datafile')),
+                ('schema', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='mathesar.schema')),
+                ('table', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to='mathesar.table')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0028_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datafile',
+            name='encoding',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0029_datafile_encoding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='infer_types',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.1.14 on 2026-10-18 03:37
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mathesar', '0031_importjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='table',
+            name='records_version',
+            field=models.UUIDField(default=uuid.uuid4),
+        ),
+    ]
@@ -1,8 +1,14 @@
+import hashlib
+import json
+from uuid import uuid4
+
 from bidict import bidict
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.cache import cache
+from django.core.cache import cache, caches
 from django.db import models
-from django.db.models import JSONField
+from django.db.models import Count, JSONField, Max
+from django.utils import timezone
 from django.utils.functional import cached_property
 from django.core.exceptions import ValidationError
 
@@ -10,28 +16,47 @@ from db.columns import utils as column_utils
 from db.columns.operations.create import create_column, duplicate_column
 from db.columns.operations.alter import alter_column
 from db.columns.operations.drop import drop_column
-from db.columns.operations.select import get_column_name_from_attnum, get_columns_attnum_from_names
+from db.columns.operations.select import (
+    get_column_default_dicts, get_column_name_from_attnum, get_column_names_by_attnum,
+    get_columns_attnum_from_names,
+)
 from db.constraints.operations.create import create_unique_constraint
 from db.constraints.operations.drop import drop_constraint
 from db.constraints.operations.select import get_constraint_oid_by_name_and_table_oid, get_constraint_from_oid
 from db.constraints import utils as constraint_utils
 from db.records.operations.delete import delete_record
 from db.records.operations.insert import insert_record_or_records
-from db.records.operations.select import get_column_cast_records, get_count, get_record
+from db.records.operations.select import (
+    get_aggregates, get_column_cast_records, get_count, get_duplicate_group_count,
+    get_duplicate_groups, get_group_boundaries, get_group_count, get_group_summaries, get_record,
+)
 from db.records.operations.select import get_records as db_get_records
 from db.records.operations.update import update_record
 from db.schemas.operations.drop import drop_schema
 from db.schemas import utils as schema_utils
 from db.tables import utils as table_utils
+from db.tables.data_versions import get_table_data_versions
 from db.tables.operations.drop import drop_table
-from db.tables.operations.select import reflect_table_from_oid
+from db.tables.operations.select import (
+    get_estimated_row_count, get_table_schema_version, reflect_table_from_oid
+)
 from mathesar import reflection
 from mathesar.utils import models as model_utils
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 from mathesar.database.types import get_types
 
 
 NAME_CACHE_INTERVAL = 60 * 5
+COUNT_CACHE_INTERVAL = 60 * 5
+# Results of records queries, and everything computed to get them, are kept in
+# the records cache (see CACHES in the settings).
+records_cache = caches['records']
+# Unfiltered tables with at least this many (estimated) rows may be counted
+# using planner statistics instead of a full scan.
+COUNT_ESTIMATE_THRESHOLD = 100000
+# The duplicated values of a set of columns are cached, to be reused for each
+# page of duplicate records, only if there are at most this many of them.
+DUPLICATE_KEYS_CACHE_MAX_SIZE = 1000
 
 
 class BaseModel(models.Model):
@@ -44,7 +69,10 @@ class BaseModel(models.Model):
 
 class DatabaseObjectManager(models.Manager):
     def get_queryset(self):
-        reflection.reflect_db_objects()
+        # With background reflection, the reflect_db_objects management
+        # command keeps the models up to date and requests only read them.
+        if not settings.MATHESAR_BACKGROUND_REFLECTION:
+            reflection.reflect_db_objects()
         return super().get_queryset()
 
 
@@ -78,11 +106,6 @@ class DatabaseObject(ReflectionManagerMixin, BaseModel):
         return f"{self.__class__.__name__}: {self.oid}"
 
 
-# TODO: Replace with a proper form of caching
-# See: https://github.com/centerofci/mathesar/issues/280
-_engines = {}
-
-
 class Database(ReflectionManagerMixin, BaseModel):
     current_objects = models.Manager()
     objects = DatabaseObjectManager()
@@ -91,11 +114,7 @@ class Database(ReflectionManagerMixin, BaseModel):
 
     @property
     def _sa_engine(self):
-        global _engines
-        # We're caching this since the engine is used frequently.
-        if self.name not in _engines:
-            _engines[self.name] = create_mathesar_engine(self.name)
-        return _engines[self.name]
+        return get_mathesar_engine(self.name)
 
     @property
     def supported_types(self):
@@ -166,6 +185,10 @@ class Table(DatabaseObject):
     schema = models.ForeignKey('Schema', on_delete=models.CASCADE,
                                related_name='tables')
     import_verified = models.BooleanField(blank=True, null=True)
+    # Changed whenever the table's records are changed through this model.
+    # It's kept here rather than in the records cache, which may be local to
+    # each process, so that every process sees the change.
+    records_version = models.UUIDField(default=uuid4)
 
     class Meta:
         constraints = [
@@ -226,25 +249,49 @@ class Table(DatabaseObject):
     def sa_column_names(self):
         return self.sa_columns.keys()
 
+    # Column metadata of the whole table, loaded at once so that serializing
+    # many columns doesn't query the catalog for each one.  Columns share the
+    # table instance when fetched through table.columns.
+    @cached_property
+    def _column_names_by_attnum(self):
+        return get_column_names_by_attnum(self.oid, self.schema._sa_engine)
+
+    @cached_property
+    def _column_default_dicts(self):
+        return get_column_default_dicts(self.oid, self.schema._sa_engine)
+
+    def _clear_column_metadata_cache(self):
+        for cached_attribute in ['_column_names_by_attnum', '_column_default_dicts']:
+            self.__dict__.pop(cached_attribute, None)
+
     # TODO: This should check for dependencies once the depdency endpoint is implemeted
     @property
     def has_dependencies(self):
         return True
 
     def add_column(self, column_data):
-        return create_column(
+        column = create_column(
             self.schema._sa_engine,
             self.oid,
             column_data,
         )
+        # Cached records don't have the new column
+        self.clear_records_cache()
+        self._clear_column_metadata_cache()
+        return column
 
     def alter_column(self, column_attnum, column_data):
-        return alter_column(
+        column = alter_column(
             self.schema._sa_engine,
             self.oid,
             column_attnum,
             column_data,
         )
+        # Cached records and filtered counts may change along with the
+        # column's type or name
+        self.clear_records_cache()
+        self._clear_column_metadata_cache()
+        return column
 
     def drop_column(self, column_attnum):
         drop_column(
@@ -252,9 +299,11 @@ class Table(DatabaseObject):
             column_attnum,
             self.schema._sa_engine,
         )
+        self.clear_records_cache()
+        self._clear_column_metadata_cache()
 
     def duplicate_column(self, column_attnum, copy_data, copy_constraints, name=None):
-        return duplicate_column(
+        column = duplicate_column(
             self.oid,
             column_attnum,
             self.schema._sa_engine,
@@ -262,6 +311,9 @@ class Table(DatabaseObject):
             copy_data=copy_data,
             copy_constraints=copy_constraints,
         )
+        self.clear_records_cache()
+        self._clear_column_metadata_cache()
+        return column
 
     def get_preview(self, column_definitions):
         return get_column_cast_records(
@@ -272,8 +324,71 @@ class Table(DatabaseObject):
     def sa_all_records(self):
         return db_get_records(self._sa_table, self.schema._sa_engine)
 
-    def sa_num_records(self, filter=None):
-        return get_count(self._sa_table, self.schema._sa_engine, filter=filter)
+    def sa_num_records(self, filter=None, estimate=False):
+        """
+        Returns the number of records matching the filter.  Exact counts are
+        cached until the records of the table change.  If estimate is set,
+        large unfiltered tables are counted using planner statistics.
+        """
+        if estimate and filter is None:
+            estimated_count = get_estimated_row_count(self.oid, self.schema._sa_engine)
+            if estimated_count is not None and estimated_count >= COUNT_ESTIMATE_THRESHOLD:
+                return estimated_count
+        cache_key = self._get_records_cache_key('count', filter)
+        count = records_cache.get(cache_key)
+        if count is None:
+            count = get_count(self._sa_table, self.schema._sa_engine, filter=filter)
+            records_cache.set(cache_key, count, COUNT_CACHE_INTERVAL)
+        return count
+
+    @cached_property
+    def data_version(self):
+        """
+        The version of the table's data, which changes when its records are
+        changed, even from outside Mathesar (see db/tables/data_versions.py).
+        It's read once per instance, so at most once per request.
+        """
+        return get_table_data_versions([self.oid], self.schema._sa_engine)[self.oid]
+
+    @cached_property
+    def schema_version(self):
+        """
+        The version of the table's definition in the database, which changes
+        when its columns or constraints are altered, even from outside
+        Mathesar.  It's read once per instance, so at most once per request.
+        """
+        return get_table_schema_version(self.oid, self.schema._sa_engine)
+
+    def get_metadata_version(self):
+        """
+        Returns a version of the models describing the table, which changes
+        when the table, its columns or its data files are saved.
+        """
+        columns = self.columns.aggregate(count=Count('id'), updated_at=Max('updated_at'))
+        data_file_ids = sorted(self.data_files.values_list('id', flat=True))
+        return [self.updated_at, columns['count'], columns['updated_at'], data_file_ids]
+
+    def _get_records_cache_key(self, kind, *args):
+        # Records, counts, group boundaries and duplicate keys are cached under
+        # a per-table version, so that everything cached about the records of
+        # a table can be invalidated at once.  The data and schema versions of
+        # the table catch changes made without this model, to its rows and to
+        # its columns respectively.
+        version = self.records_version.hex
+        args_hash = hashlib.sha1(
+            json.dumps([self.schema_version, args], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        return (
+            f"{self.schema.database.name}_table_{kind}_{self.oid}_{version}"
+            f"_{self.data_version}_{args_hash}"
+        )
+
+    def clear_records_cache(self):
+        # The versions read before the change are out of date as well.
+        for cached_attribute in ['data_version', 'schema_version']:
+            self.__dict__.pop(cached_attribute, None)
+        self.records_version = uuid4()
+        Table.current_objects.filter(id=self.id).update(records_version=self.records_version)
 
     def update_sa_table(self, update_params):
         return model_utils.update_sa_table(self, update_params)
@@ -284,6 +399,56 @@ class Table(DatabaseObject):
     def get_record(self, id_value):
         return get_record(self._sa_table, self.schema._sa_engine, id_value)
 
+    def _get_group_by_with_boundaries(self, group_by, filter, duplicate_only):
+        """
+        Returns the group_by with the boundaries of its groups, if they can be
+        used.  The boundaries are cached, so that each page of a grouped view
+        doesn't need to scan all the records of the table again.
+        """
+        if group_by is None or not group_by.uses_boundaries:
+            return group_by
+        cache_key = self._get_records_cache_key(
+            'group_boundaries', group_by.columns, group_by.mode, group_by.num_groups,
+            filter, duplicate_only
+        )
+        boundaries = records_cache.get(cache_key)
+        if boundaries is None:
+            boundaries = get_group_boundaries(
+                self._sa_table,
+                self.schema._sa_engine,
+                group_by,
+                filter=filter,
+                duplicate_only=duplicate_only,
+            )
+            records_cache.set(cache_key, boundaries, COUNT_CACHE_INTERVAL)
+        return group_by.with_boundaries(boundaries)
+
+    def _get_duplicate_keys(self, duplicate_only):
+        """
+        Returns the duplicated values of the duplicate_only columns, or None if
+        there are too many of them to be worth caching.  The values are cached,
+        so that each page of duplicate records only joins the table against
+        them instead of aggregating the whole table again.
+        """
+        if not duplicate_only:
+            return None
+        cache_key = self._get_records_cache_key('duplicate_keys', duplicate_only)
+        duplicate_keys = records_cache.get(cache_key)
+        if duplicate_keys is None:
+            duplicate_groups = get_duplicate_groups(
+                self._sa_table,
+                self.schema._sa_engine,
+                duplicate_only,
+                limit=DUPLICATE_KEYS_CACHE_MAX_SIZE + 1,
+            )
+            if len(duplicate_groups) > DUPLICATE_KEYS_CACHE_MAX_SIZE:
+                # Cached as well, so that we don't look for the values again.
+                duplicate_keys = False
+            else:
+                duplicate_keys = [values for values, _ in duplicate_groups]
+            records_cache.set(cache_key, duplicate_keys, COUNT_CACHE_INTERVAL)
+        return duplicate_keys if duplicate_keys is not False else None
+
     def get_records(
         self,
         limit=None,
@@ -292,26 +457,114 @@ class Table(DatabaseObject):
         order_by=[],
         group_by=None,
         duplicate_only=None,
+        cursor=None,
     ):
-        return db_get_records(
+        """
+        Returns a page of the records of the table.  Pages are cached until
+        the records of the table change, so that going back and forth between
+        the same pages doesn't query the database again.
+        """
+        group_by = self._get_group_by_with_boundaries(group_by, filter, duplicate_only)
+        group_by_spec = None
+        if group_by is not None:
+            group_by_spec = [
+                group_by.columns, group_by.mode, group_by.num_groups, group_by.boundaries
+            ]
+        cache_key = self._get_records_cache_key(
+            'records', limit, offset, filter, order_by, group_by_spec, duplicate_only, cursor
+        )
+        records = records_cache.get(cache_key)
+        if records is None:
+            records = db_get_records(
+                self._sa_table,
+                self.schema._sa_engine,
+                limit,
+                offset,
+                filter=filter,
+                order_by=order_by,
+                group_by=group_by,
+                duplicate_only=duplicate_only,
+                cursor=cursor,
+                duplicate_keys=self._get_duplicate_keys(duplicate_only),
+            )
+            records_cache.set(cache_key, records)
+        return records
+
+    def get_group_summaries(self, group_by, group_ids, filter=None, duplicate_only=None):
+        group_by = self._get_group_by_with_boundaries(group_by, filter, duplicate_only)
+        return get_group_summaries(
             self._sa_table,
             self.schema._sa_engine,
-            limit,
-            offset,
+            group_by,
+            group_ids,
             filter=filter,
-            order_by=order_by,
-            group_by=group_by,
             duplicate_only=duplicate_only,
         )
 
+    def get_aggregates(
+        self,
+        group_by,
+        aggregates,
+        limit=None,
+        offset=None,
+        filter=None,
+        duplicate_only=None,
+    ):
+        group_by = self._get_group_by_with_boundaries(group_by, filter, duplicate_only)
+        return get_aggregates(
+            self._sa_table,
+            self.schema._sa_engine,
+            group_by,
+            aggregates,
+            limit=limit,
+            offset=offset,
+            filter=filter,
+            duplicate_only=duplicate_only,
+        )
+
+    def get_group_count(self, group_by, filter=None, duplicate_only=None):
+        group_by = self._get_group_by_with_boundaries(group_by, filter, duplicate_only)
+        return get_group_count(
+            self._sa_table,
+            self.schema._sa_engine,
+            group_by,
+            filter=filter,
+            duplicate_only=duplicate_only,
+        )
+
+    def get_duplicate_groups(self, duplicate_only, limit=None, offset=None):
+        return get_duplicate_groups(
+            self._sa_table,
+            self.schema._sa_engine,
+            duplicate_only,
+            limit=limit,
+            offset=offset,
+        )
+
+    def get_duplicate_group_count(self, duplicate_only):
+        cache_key = self._get_records_cache_key('duplicate_group_count', duplicate_only)
+        count = records_cache.get(cache_key)
+        if count is None:
+            count = get_duplicate_group_count(
+                self._sa_table, self.schema._sa_engine, duplicate_only
+            )
+            records_cache.set(cache_key, count, COUNT_CACHE_INTERVAL)
+        return count
+
     def create_record_or_records(self, record_data):
-        return insert_record_or_records(self._sa_table, self.schema._sa_engine, record_data)
+        record = insert_record_or_records(self._sa_table, self.schema._sa_engine, record_data)
+        self.clear_records_cache()
+        return record
 
     def update_record(self, id_value, record_data):
-        return update_record(self._sa_table, self.schema._sa_engine, id_value, record_data)
+        record = update_record(self._sa_table, self.schema._sa_engine, id_value, record_data)
+        self.clear_records_cache()
+        return record
 
     def delete_record(self, id_value):
-        return delete_record(self._sa_table, self.schema._sa_engine, id_value)
+        result = delete_record(self._sa_table, self.schema._sa_engine, id_value)
+        self.clear_records_cache()
+        return result
 
     def add_constraint(self, constraint_type, columns, name=None):
         if constraint_type != constraint_utils.ConstraintType.UNIQUE.value:
@@ -336,8 +589,8 @@ class Table(DatabaseObject):
         return Constraint.current_objects.create(oid=constraint_oid, table=self)
 
     def get_column_name_id_bidirectional_map(self):
-        # TODO: Prefetch column names to avoid N+1 queries
-        columns = Column.objects.filter(table_id=self.id)
+        # Column names come from the table's column metadata, loaded once.
+        columns = self.columns.all()
         columns_map = bidict({column.name: column.id for column in columns})
         return columns_map
 
@@ -362,9 +615,24 @@ class Column(ReflectionManagerMixin, BaseModel):
 
     @property
     def name(self):
-        return get_column_name_from_attnum(
-            self.table.oid, self.attnum, self.table.schema._sa_engine
-        )
+        name = self.table._column_names_by_attnum.get(self.attnum)
+        if name is None:
+            # The column may have been added after the table's column
+            # metadata was loaded.
+            name = get_column_name_from_attnum(
+                self.table.oid, self.attnum, self.table.schema._sa_engine
+            )
+        return name
+
+    @property
+    def column_attnum(self):
+        return self.attnum
+
+    @property
+    def column_default_dict(self):
+        if self.attnum not in self.table._column_default_dicts:
+            return self._sa_column.column_default_dict
+        return self.table._column_default_dicts[self.attnum]
 
 
 class Constraint(DatabaseObject):
@@ -414,3 +682,28 @@ class DataFile(BaseModel):
     delimiter = models.CharField(max_length=1, default=',', blank=True)
     escapechar = models.CharField(max_length=1, blank=True)
     quotechar = models.CharField(max_length=1, default='"', blank=True)
+    # Detected when the data file is created; blank if it's unknown yet.
+    encoding = models.CharField(max_length=128, blank=True)
+
+
+class ImportJob(BaseModel):
+    """
+    An import of a data file into a new table, which is run in the background
+    by the import workers (see mathesar/imports/jobs.py).
+    """
+    status_choices = models.TextChoices("status", "QUEUED RUNNING DONE FAILED CANCELLED")
+
+    data_file = models.ForeignKey(DataFile, related_name="import_jobs", on_delete=models.CASCADE)
+    schema = models.ForeignKey(Schema, related_name="import_jobs", on_delete=models.CASCADE)
+    name = models.CharField(max_length=63)
+    infer_types = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=128, choices=status_choices.choices, default=status_choices.QUEUED
+    )
+    table = models.ForeignKey(Table, related_name="import_jobs", blank=True,
+                              null=True, on_delete=models.SET_NULL)
+    rows_copied = models.BigIntegerField(blank=True, null=True)
+    bytes_processed = models.BigIntegerField(default=0)
+    bytes_total = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
@@ -1,19 +1,25 @@
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Q
 
 from db.columns.operations.select import get_column_attnums_from_table
 from db.constraints.operations.select import get_constraints_with_oids
-from db.schemas.operations.select import get_mathesar_schemas_with_oids
-from db.tables.operations.select import get_table_oids_from_schema
+from db.schemas.operations.select import get_catalog_fingerprint, get_mathesar_schema_objects
 # We import the entire models module to avoid a circular import error
 from mathesar import models
 from mathesar.api.serializers.shared_serializers import DisplayOptionsMappingSerializer, \
     DISPLAY_OPTIONS_SERIALIZER_MAPPING_KEY
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 
 DB_REFLECTION_KEY = 'database_reflected_recently'
 DB_REFLECTION_INTERVAL = 60 * 5  # we reflect DB changes every 5 minutes
+# Held while a reflection is running, so that only one runs at a time. The
+# timeout releases the lock if the process holding it dies.
+DB_REFLECTION_LOCK_KEY = 'database_reflection_lock'
+DB_REFLECTION_LOCK_TIMEOUT = 60 * 10
+
+
+def _get_catalog_fingerprint_cache_key(database):
+    return f"{database.name}_catalog_fingerprint"
 
 
 # NOTE: All querysets used for reflection should use the .current_objects manager
@@ -40,30 +46,46 @@ def reflect_databases():
         models.Database.current_objects.create(name=database)
 
 
-def reflect_schemas_from_database(database):
-    engine = create_mathesar_engine(database)
-    db_schema_oids = {
-        schema['oid'] for schema in get_mathesar_schemas_with_oids(engine)
-    }
-
-    database = models.Database.current_objects.get(name=database)
-    for oid in db_schema_oids:
-        models.Schema.current_objects.get_or_create(oid=oid, database=database)
-    for schema in models.Schema.current_objects.all():
-        if schema.database.name == database and schema.oid not in db_schema_oids:
-            schema.delete()
-
-
-def reflect_tables_from_schema(schema):
-    db_table_oids = {
-        table['oid']
-        for table in get_table_oids_from_schema(schema.oid, schema._sa_engine)
-    }
-    for oid in db_table_oids:
-        models.Table.current_objects.get_or_create(oid=oid, schema=schema)
-    for table in models.Table.current_objects.filter(schema=schema):
-        if table.oid not in db_table_oids:
-            table.delete()
+def reflect_schemas_from_database(database, db_schema_oids):
+    """
+    Makes the Schema models of the database match db_schema_oids, and returns
+    them keyed by oid.
+    """
+    schemas = models.Schema.current_objects.filter(database=database)
+    schemas.exclude(oid__in=db_schema_oids).delete()
+    existing_oids = set(schemas.values_list('oid', flat=True))
+    models.Schema.current_objects.bulk_create([
+        models.Schema(oid=oid, database=database)
+        for oid in db_schema_oids - existing_oids
+    ])
+    return {schema.oid: schema for schema in schemas.all()}
+
+
+def reflect_tables_from_database(database, schemas, db_table_schema_oids):
+    """
+    Makes the Table models of the database match db_table_schema_oids, a dict
+    of table oid to schema oid, and returns them keyed by oid.  A table moved
+    to another schema keeps its oid, so its model is moved along with it.
+    """
+    tables = models.Table.current_objects.filter(schema__database=database)
+    tables.exclude(oid__in=db_table_schema_oids.keys()).delete()
+    existing_oids = set()
+    moved_tables = []
+    for table in tables.all():
+        existing_oids.add(table.oid)
+        schema = schemas[db_table_schema_oids[table.oid]]
+        if table.schema_id != schema.id:
+            table.schema = schema
+            moved_tables.append(table)
+    models.Table.current_objects.bulk_update(moved_tables, ['schema'])
+    # bulk_create skips Table.save, which is fine here since table oids are
+    # unique within a database.
+    models.Table.current_objects.bulk_create([
+        models.Table(oid=oid, schema=schemas[schema_oid])
+        for oid, schema_oid in db_table_schema_oids.items()
+        if oid not in existing_oids
+    ])
+    return {table.oid: table for table in tables.select_related('schema__database')}
 
 
 def reflect_columns_from_table(table):
@@ -71,36 +93,104 @@ def reflect_columns_from_table(table):
         column['attnum']
         for column in get_column_attnums_from_table(table.oid, table.schema._sa_engine)
     }
-    for attnum in attnums:
-        column, created = models.Column.current_objects.get_or_create(attnum=attnum,
-                                                                      table=table,
-                                                                      defaults={'display_options': None})
-        if not created and column.display_options:
-            # If the type of column has changed, existing display options won't be valid anymore.
-            serializer = DisplayOptionsMappingSerializer(data=column.display_options,
-                                                         context={DISPLAY_OPTIONS_SERIALIZER_MAPPING_KEY: str(column.plain_type)})
-            if not serializer.is_valid(False):
-                column.display_options = None
-                column.save()
-    models.Column.current_objects.filter(table=table).filter(~Q(attnum__in=attnums)).delete()
-
-
-def reflect_constraints_from_database(database):
-    engine = create_mathesar_engine(database)
-    db_constraints = get_constraints_with_oids(engine)
-    for db_constraint in db_constraints:
-        try:
-            table = models.Table.current_objects.get(oid=db_constraint['conrelid'])
-        except models.Table.DoesNotExist:
+    _reflect_columns(
+        models.Column.current_objects.filter(table=table), {table.oid: table}, {table.oid: attnums}
+    )
+
+
+def reflect_columns_from_database(database, tables, db_table_attnums):
+    """
+    Makes the Column models of the database match db_table_attnums, a dict of
+    table oid to the set of attnums of the table's columns.
+    """
+    _reflect_columns(
+        models.Column.current_objects.filter(table__schema__database=database), tables, db_table_attnums
+    )
+
+
+def _reflect_columns(columns, tables, db_table_attnums):
+    tables_by_id = {table.id: table for table in tables.values()}
+    stale_column_ids = []
+    existing_columns = set()
+    columns_with_display_options = []
+    for column in columns:
+        table = tables_by_id[column.table_id]
+        if column.attnum not in db_table_attnums[table.oid]:
+            stale_column_ids.append(column.id)
             continue
-        models.Constraint.current_objects.get_or_create(oid=db_constraint['oid'], table=table)
-    for constraint in models.Constraint.current_objects.all():
-        if constraint.oid not in [db_constraint['oid'] for db_constraint in db_constraints]:
-            constraint.delete()
+        existing_columns.add((table.oid, column.attnum))
+        if column.display_options:
+            # Share the table instance, so each table is reflected only once.
+            column.table = table
+            columns_with_display_options.append(column)
+    models.Column.current_objects.filter(id__in=stale_column_ids).delete()
+    models.Column.current_objects.bulk_create([
+        models.Column(table=tables[table_oid], attnum=attnum, display_options=None)
+        for table_oid, attnums in db_table_attnums.items()
+        for attnum in attnums
+        if (table_oid, attnum) not in existing_columns
+    ])
+
+    invalid_columns = []
+    for column in columns_with_display_options:
+        # If the type of column has changed, existing display options won't be valid anymore.
+        serializer = DisplayOptionsMappingSerializer(data=column.display_options,
+                                                     context={DISPLAY_OPTIONS_SERIALIZER_MAPPING_KEY: str(column.plain_type)})
+        if not serializer.is_valid(False):
+            column.display_options = None
+            invalid_columns.append(column)
+    models.Column.current_objects.bulk_update(invalid_columns, ['display_options'])
+
+
+def reflect_constraints_from_database(database, tables, db_constraints):
+    db_constraint_oids = {
+        db_constraint['oid']: db_constraint['conrelid']
+        for db_constraint in db_constraints
+        # Constraints on tables Mathesar doesn't track are ignored.
+        if db_constraint['conrelid'] in tables
+    }
+    constraints = models.Constraint.current_objects.filter(table__schema__database=database)
+    constraints.exclude(oid__in=db_constraint_oids.keys()).delete()
+    existing_oids = set(constraints.values_list('oid', flat=True))
+    models.Constraint.current_objects.bulk_create([
+        models.Constraint(oid=oid, table=tables[table_oid])
+        for oid, table_oid in db_constraint_oids.items()
+        if oid not in existing_oids
+    ])
+
+
+def reflect_database_objects(database):
+    """
+    Reflects the schemas, tables, columns and constraints of a database using
+    two catalog queries, then reconciles the models with set-based operations.
+    Nothing is reflected if the catalog hasn't changed since the last time.
+    """
+    engine = get_mathesar_engine(database.name)
+    fingerprint = get_catalog_fingerprint(engine)
+    fingerprint_cache_key = _get_catalog_fingerprint_cache_key(database)
+    if cache.get(fingerprint_cache_key) == fingerprint:
+        return
+    db_schema_oids = set()
+    db_table_schema_oids = {}
+    db_table_attnums = {}
+    for row in get_mathesar_schema_objects(engine):
+        db_schema_oids.add(row.schema_oid)
+        if row.table_oid is not None:
+            db_table_schema_oids[row.table_oid] = row.schema_oid
+            attnums = db_table_attnums.setdefault(row.table_oid, set())
+            if row.attnum is not None:
+                attnums.add(row.attnum)
+    db_constraints = get_constraints_with_oids(engine)
+
+    schemas = reflect_schemas_from_database(database, db_schema_oids)
+    tables = reflect_tables_from_database(database, schemas, db_table_schema_oids)
+    reflect_columns_from_database(database, tables, db_table_attnums)
+    reflect_constraints_from_database(database, tables, db_constraints)
+    cache.set(fingerprint_cache_key, fingerprint, None)
 
 
 def reflect_new_table_constraints(table):
-    engine = create_mathesar_engine(table.schema.database.name)
+    engine = get_mathesar_engine(table.schema.database.name)
     db_constraints = get_constraints_with_oids(engine, table_oid=table.oid)
     constraints = [
         models.Constraint.current_objects.get_or_create(
@@ -112,14 +202,19 @@ def reflect_new_table_constraints(table):
     return constraints
 
 
-def reflect_db_objects():
-    if not cache.get(DB_REFLECTION_KEY):
-        reflect_databases()
-        for database in models.Database.current_objects.filter(deleted=False):
-            reflect_schemas_from_database(database.name)
-        for schema in models.Schema.current_objects.all():
-            reflect_tables_from_schema(schema)
-        for table in models.Table.current_objects.all():
-            reflect_columns_from_table(table)
-        reflect_constraints_from_database(database.name)
-        cache.set(DB_REFLECTION_KEY, True, DB_REFLECTION_INTERVAL)
+def reflect_db_objects(force=False):
+    """
+    Reflects all database objects, unless they were reflected within the last
+    DB_REFLECTION_INTERVAL. If another reflection is already running, this
+    returns immediately and callers use the models as they are.
+    """
+    if force or not cache.get(DB_REFLECTION_KEY):
+        if not cache.add(DB_REFLECTION_LOCK_KEY, True, DB_REFLECTION_LOCK_TIMEOUT):
+            return
+        try:
+            reflect_databases()
+            for database in models.Database.current_objects.filter(deleted=False):
+                reflect_database_objects(database)
+            cache.set(DB_REFLECTION_KEY, True, DB_REFLECTION_INTERVAL)
+        finally:
+            cache.delete(DB_REFLECTION_LOCK_KEY)
@@ -10,7 +10,7 @@ from db.columns.operations.alter import alter_column_type
 from db.columns.operations.select import get_column_attnum_from_name
 from db.tables.operations.select import get_oid_from_table
 from db.tests.types import fixtures
-from mathesar import models
+from mathesar import models, reflection
 from mathesar.api.exceptions.error_codes import ErrorCodes
 from mathesar.models import Column as ServiceLayerColumn
 from mathesar.tests.api.test_table_api import check_columns_response
@@ -833,3 +833,22 @@ def test_column_duplicate_no_parameters(column_test_table, client):
     assert response.status_code == 400
     assert response_data[0]["message"] == "This field is required."
     assert response_data[0]["field"] == "type"
+
+
+def test_column_list_not_modified(column_test_table, client):
+    url = f"/api/db/v0/tables/{column_test_table.id}/columns/"
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response['ETag']
+
+    with patch.object(reflection, 'reflect_db_objects') as mock_reflect:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    mock_reflect.assert_not_called()
+
+    column = _get_columns_by_name(column_test_table, ['mycolumn1'])[0]
+    response = client.patch(f"{url}{column.id}/", data={'name': 'etag_column'})
+    assert response.status_code == 200
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
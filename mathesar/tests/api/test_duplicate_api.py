@@ -0,0 +1,62 @@
+import json
+
+
+def _get_duplicates(client, table, duplicate_only, query_str=''):
+    return client.get(
+        f'/api/db/v0/tables/{table.id}/duplicates/?duplicate_only={json.dumps(duplicate_only)}{query_str}'
+    )
+
+
+def test_duplicate_list(create_table, client):
+    table = create_table('NASA Duplicate List')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    center_id = columns_name_id_map['Center']
+    response = _get_duplicates(client, table, [center_id], '&limit=500')
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert response_data['count'] == len(response_data['results'])
+    counts = [result['count'] for result in response_data['results']]
+    assert counts == sorted(counts, reverse=True)
+    assert all(count > 1 for count in counts)
+    for result in response_data['results']:
+        assert list(result['values'].keys()) == [str(center_id)]
+
+
+def test_duplicate_list_matches_records(create_table, client):
+    table = create_table('NASA Duplicate Records')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    duplicate_only = [columns_name_id_map['Center'], columns_name_id_map['Status']]
+    duplicates = _get_duplicates(client, table, duplicate_only, '&limit=500').json()
+    records = client.get(
+        f'/api/db/v0/tables/{table.id}/records/?duplicate_only={json.dumps(duplicate_only)}&limit=500'
+    ).json()
+
+    assert sum(result['count'] for result in duplicates['results']) == len(records['results'])
+
+
+def test_duplicate_list_pagination(create_table, client):
+    table = create_table('NASA Duplicate Pagination')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    duplicate_only = [columns_name_id_map['Center']]
+    all_results = _get_duplicates(client, table, duplicate_only).json()['results']
+    response = _get_duplicates(client, table, duplicate_only, '&limit=2&offset=1')
+
+    assert response.status_code == 200
+    assert response.json()['results'] == all_results[1:3]
+
+
+def test_duplicate_list_bad_column(create_table, client):
+    table = create_table('NASA Duplicate Bad Column')
+    response = _get_duplicates(client, table, [-1])
+
+    assert response.status_code == 400
+    assert response.json()[0]['field'] == 'duplicate_only'
+
+
+def test_duplicate_list_no_columns(create_table, client):
+    table = create_table('NASA Duplicate No Columns')
+    response = _get_duplicates(client, table, [])
+
+    assert response.status_code == 400
+    assert response.json()[0]['field'] == 'duplicate_only'
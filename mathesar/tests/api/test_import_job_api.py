@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+import pytest
+from unittest.mock import patch
+from django.core.files import File
+from django.db import OperationalError
+from django.utils import timezone
+
+from mathesar.imports import jobs
+from mathesar.models import DataFile, ImportJob, Table
+
+
+@pytest.fixture(autouse=True)
+def import_in_request(settings):
+    settings.MATHESAR_IMPORT_WORKERS = 0
+
+
+@pytest.fixture
+def schema(create_schema):
+    return create_schema('import_job_tests')
+
+
+@pytest.fixture
+def data_file(csv_filename):
+    with open(csv_filename, 'rb') as csv_file:
+        data_file = DataFile.objects.create(
+            file=File(csv_file), created_from='file', base_name='patents'
+        )
+    return data_file
+
+
+def test_import_job_create(client, data_file, schema):
+    data = {'data_file': data_file.id, 'schema': schema.id, 'name': 'Import Job Table'}
+    response = client.post('/api/db/v0/import_jobs/', data=data)
+    assert response.status_code == 202
+    response_job = response.json()
+    assert response_job['status'] == 'DONE'
+    assert response_job['rows_copied'] == 1393
+    assert response_job['bytes_processed'] == response_job['bytes_total'] == data_file.file.size
+
+    table = Table.objects.get(id=response_job['table'])
+    assert table.name == 'Import Job Table'
+    response = client.get(f'/api/db/v0/import_jobs/{response_job["id"]}/')
+    assert response.status_code == 200
+    assert response.json()['table'] == table.id
+
+
+def test_import_job_create_generates_name(client, data_file, schema):
+    data = {'data_file': data_file.id, 'schema': schema.id}
+    response = client.post('/api/db/v0/import_jobs/', data=data)
+    assert response.status_code == 202
+    assert response.json()['name'] == 'patents'
+
+
+def test_import_job_create_infers_types(client, data_file, schema):
+    data = {'data_file': data_file.id, 'schema': schema.id, 'infer_types': True}
+    with patch.object(
+        jobs, 'create_table_from_datafile', side_effect=jobs.create_table_from_datafile
+    ) as mock_create:
+        response = client.post('/api/db/v0/import_jobs/', data=data)
+    assert response.status_code == 202
+    assert response.json()['infer_types'] is True
+    assert mock_create.call_args.kwargs['infer_types'] is True
+
+
+def test_import_job_reports_progress(data_file, schema, monkeypatch):
+    monkeypatch.setattr(jobs, 'PROGRESS_UPDATE_BYTES', 1024)
+    reported_bytes = []
+
+    def save_progress(reporter, bytes_processed):
+        reported_bytes.append(bytes_processed)
+        return original_call(reporter, bytes_processed)
+    original_call = jobs._ProgressReporter.__call__
+    with patch.object(jobs._ProgressReporter, '__call__', save_progress):
+        job = jobs.start_import_job(data_file, 'Import Progress Table', schema)
+    assert job.status == ImportJob.status_choices.DONE
+    assert reported_bytes == sorted(reported_bytes)
+    assert 0 < reported_bytes[0] < reported_bytes[-1] <= data_file.file.size
+
+
+def test_import_job_failure(data_file, schema, create_table):
+    table = create_table('Import Job Existing Table', schema=schema.name)
+    job = jobs.start_import_job(data_file, table.name, schema)
+    assert job.status == ImportJob.status_choices.FAILED
+    assert job.error
+    assert job.table is None
+
+
+def test_import_job_cancelled_while_running(data_file, schema, monkeypatch):
+    monkeypatch.setattr(jobs, 'PROGRESS_UPDATE_BYTES', 1024)
+
+    def cancel_and_report(reporter, bytes_processed):
+        ImportJob.objects.filter(id=reporter._job_id).update(status=ImportJob.status_choices.CANCELLED)
+        return original_call(reporter, bytes_processed)
+    original_call = jobs._ProgressReporter.__call__
+    with patch.object(jobs._ProgressReporter, '__call__', cancel_and_report):
+        job = jobs.start_import_job(data_file, 'Import Cancelled Table', schema)
+    assert job.status == ImportJob.status_choices.CANCELLED
+    assert job.error == ''
+    assert not Table.objects.filter(schema=schema).exists()
+
+
+def test_import_job_cancelled_after_copy(data_file, schema, monkeypatch):
+    def cancel_and_count(table, *args, **kwargs):
+        ImportJob.objects.filter(name='Import Cancelled After Copy Table').update(
+            status=ImportJob.status_choices.CANCELLED
+        )
+        return original_count(table, *args, **kwargs)
+    original_count = Table.sa_num_records
+    monkeypatch.setattr(Table, 'sa_num_records', cancel_and_count)
+    job = jobs.start_import_job(data_file, 'Import Cancelled After Copy Table', schema)
+    assert job.status == ImportJob.status_choices.CANCELLED
+    assert job.table is None
+    assert not Table.objects.filter(schema=schema).exists()
+
+
+def test_import_job_cancel(client, data_file, schema):
+    job = ImportJob.objects.create(data_file=data_file, schema=schema, name='Import Queued Table')
+    response = client.post(f'/api/db/v0/import_jobs/{job.id}/cancel/')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'CANCELLED'
+    jobs.run_import_job(job.id)
+    job.refresh_from_db()
+    assert job.status == ImportJob.status_choices.CANCELLED
+    assert not Table.objects.filter(schema=schema).exists()
+
+
+def test_import_job_cancel_finished(client, data_file, schema):
+    job = jobs.start_import_job(data_file, 'Import Finished Table', schema)
+    response = client.post(f'/api/db/v0/import_jobs/{job.id}/cancel/')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'DONE'
+
+
+def _create_running_job(data_file, schema, name, heartbeat_age):
+    return ImportJob.objects.create(
+        data_file=data_file, schema=schema, name=name, status=ImportJob.status_choices.RUNNING,
+        heartbeat_at=timezone.now() - heartbeat_age,
+    )
+
+
+def test_import_job_abandoned(client, data_file, schema):
+    heartbeat_age = jobs.ABANDONED_JOB_TIMEOUT + timedelta(minutes=1)
+    job = _create_running_job(data_file, schema, 'Import Abandoned Table', heartbeat_age)
+    response = client.get(f'/api/db/v0/import_jobs/{job.id}/')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'FAILED'
+    assert response.json()['error'] == jobs.ABANDONED_JOB_ERROR
+
+
+def test_import_job_heartbeat(client, data_file, schema, monkeypatch):
+    heartbeat_age = jobs.ABANDONED_JOB_TIMEOUT + timedelta(minutes=1)
+    job = _create_running_job(data_file, schema, 'Import Heartbeat Table', heartbeat_age)
+    monkeypatch.setattr(jobs, '_active_job_ids', {job.id})
+    jobs._save_heartbeat()
+    response = client.get(f'/api/db/v0/import_jobs/{job.id}/')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'RUNNING'
+
+
+def test_import_job_heartbeat_survives_errors(monkeypatch):
+    class StopHeartbeat(BaseException):
+        pass
+
+    saved_heartbeats = []
+
+    def save_heartbeat():
+        saved_heartbeats.append(len(saved_heartbeats))
+        if len(saved_heartbeats) == 1:
+            raise OperationalError('connection lost')
+
+    def sleep(seconds):
+        if len(saved_heartbeats) == 2:
+            raise StopHeartbeat()
+
+    monkeypatch.setattr(jobs, '_save_heartbeat', save_heartbeat)
+    monkeypatch.setattr(jobs.time, 'sleep', sleep)
+    with pytest.raises(StopHeartbeat):
+        jobs._run_heartbeat()
+    assert saved_heartbeats == [0, 1]
@@ -1,3 +1,4 @@
+import base64
 from copy import deepcopy
 import json
 from unittest.mock import patch
@@ -140,7 +141,21 @@ def test_record_list_duplicate_rows_only(create_table, client):
     with patch.object(models, "db_get_records", return_value=[]) as mock_get:
         client.get(f'/api/db/v0/tables/{table.id}/records/?duplicate_only={json_duplicate_only}')
     assert mock_get.call_args is not None
-    assert mock_get.call_args[1]['duplicate_only'] == duplicate_only
+    assert mock_get.call_args[1]['duplicate_only'] == ['Patent Expiration Date']
+
+
+def test_record_list_duplicate_rows_only_bad_column(create_table, client):
+    table = create_table('NASA Record List Bad Duplicates')
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?duplicate_only=[-1]')
+    assert response.status_code == 400
+    assert response.json()[0]['field'] == 'duplicate_only'
+
+
+def test_record_list_duplicate_rows_only_no_columns(create_table, client):
+    table = create_table('NASA Record List No Duplicates')
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?duplicate_only=[]')
+    assert response.status_code == 400
+    assert response.json()[0]['field'] == 'duplicate_only'
 
 
 def test_filter_with_added_columns(create_table, client):
@@ -546,6 +561,32 @@ def test_record_list_groups(
     _test_group_equality(grouping_dict['groups'], expected_groups)
 
 
+def test_record_list_groups_summarizes_page_groups(create_table, client):
+    table = create_table('NASA Record List Group Summaries')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    order_by = json.dumps([
+        {'field': columns_name_id_map['Center'], 'direction': 'asc'},
+        {'field': columns_name_id_map['id'], 'direction': 'asc'},
+    ])
+    grouping = json.dumps({'columns': [columns_name_id_map['Center']]})
+    query_str = f'grouping={grouping}&order_by={order_by}&limit=10'
+
+    with patch.object(
+        models.Table, 'get_group_summaries', side_effect=models.Table.get_group_summaries, autospec=True
+    ) as mock_get_summaries:
+        response = client.get(f'/api/db/v0/tables/{table.id}/records/?{query_str}')
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert mock_get_summaries.call_count == 1
+    page_group_ids = mock_get_summaries.call_args[0][2]
+    groups = response_data['grouping']['groups']
+    assert len(page_group_ids) == len(groups)
+    assert sum(len(grp['result_indices']) for grp in groups) == 10
+    for record in response_data['results']:
+        assert '__mathesar_group_id' not in record
+
+
 def test_record_list_pagination_limit(create_table, client):
     table_name = 'NASA Record List Pagination Limit'
     table = create_table(table_name)
@@ -586,6 +627,112 @@ def test_record_list_pagination_offset(create_table, client):
     assert record_1_data[str(columns_id[5])] != record_2_data[str(columns_id[5])]
 
 
+def test_record_list_pagination_cursor(create_table, client):
+    table_name = 'NASA Record List Pagination Cursor'
+    table = create_table(table_name)
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    order_by = json.dumps([{'field': columns_name_id_map['Center'], 'direction': 'desc'}])
+
+    offset_response = client.get(
+        f'/api/db/v0/tables/{table.id}/records/?limit=20&order_by={order_by}'
+    )
+    response_1 = client.get(
+        f'/api/db/v0/tables/{table.id}/records/?limit=10&order_by={order_by}&cursor='
+    )
+    response_1_data = response_1.json()
+    response_2 = client.get(
+        f'/api/db/v0/tables/{table.id}/records/?limit=10&order_by={order_by}'
+        f'&cursor={response_1_data["next_cursor"]}'
+    )
+    response_2_data = response_2.json()
+
+    assert response_1.status_code == 200
+    assert response_2.status_code == 200
+    assert response_1_data['count'] == 1393
+    assert response_2_data['next_cursor'] is not None
+    assert (
+        response_1_data['results'] + response_2_data['results']
+        == offset_response.json()['results']
+    )
+    assert 'next_cursor' not in offset_response.json()
+
+
+def test_record_list_pagination_cursor_last_page(create_table, client):
+    table_name = 'NASA Record List Pagination Cursor Last Page'
+    table = create_table(table_name)
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?limit=500&cursor=')
+    results = response.json()['results']
+    while response.json()['next_cursor'] is not None:
+        response = client.get(
+            f'/api/db/v0/tables/{table.id}/records/?limit=500'
+            f'&cursor={response.json()["next_cursor"]}'
+        )
+        results.extend(response.json()['results'])
+
+    assert response.status_code == 200
+    assert len(results) == 1393
+
+
+def test_record_list_pagination_bad_cursor(create_table, client):
+    table_name = 'NASA Record List Pagination Bad Cursor'
+    table = create_table(table_name)
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?cursor=notacursor')
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert len(response_data) == 1
+    assert "cursor" in response_data[0]['field']
+
+
+def test_record_list_pagination_cursor_bad_values(create_table, client):
+    table_name = 'NASA Record List Pagination Cursor Bad Values'
+    table = create_table(table_name)
+    # The default ordering is by the integer id column.
+    cursor = base64.urlsafe_b64encode(json.dumps(['notanid']).encode('utf-8')).decode('ascii')
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?cursor={cursor}')
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert len(response_data) == 1
+    assert "cursor" in response_data[0]['field']
+
+
+@pytest.mark.parametrize("count_mode", ["exact", "estimate"])
+def test_record_list_count_mode(create_table, client, count_mode):
+    table_name = f'NASA Record List Count {count_mode}'
+    table = create_table(table_name)
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?count={count_mode}')
+
+    assert response.status_code == 200
+    assert response.json()['count'] == 1393
+
+
+def test_record_list_count_none(create_table, client):
+    table_name = 'NASA Record List Count None'
+    table = create_table(table_name)
+
+    with patch.object(models, "get_count") as mock_count:
+        response = client.get(f'/api/db/v0/tables/{table.id}/records/?count=none')
+
+    assert response.status_code == 200
+    assert response.json()['count'] is None
+    assert len(response.json()['results']) == 50
+    mock_count.assert_not_called()
+
+
+def test_record_list_count_invalid(create_table, client):
+    table_name = 'NASA Record List Count Invalid'
+    table = create_table(table_name)
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?count=sometimes')
+
+    assert response.status_code == 400
+
+
 def test_record_detail(create_table, client):
     table_name = 'NASA Record Detail'
     table = create_table(table_name)
@@ -736,6 +883,30 @@ def test_record_list_sort_exceptions(create_table, client, exception):
     assert response_data[0]['code'] == ErrorCodes.UnsupportedType.value
 
 
+def test_record_list_groups_percentile_with_nulls(create_table, client):
+    table = create_table('NASA Record List Group Percentile Nulls')
+    sa_table = table._sa_table
+    with table.schema._sa_engine.begin() as conn:
+        conn.execute(sa_table.update().where(sa_table.c.id <= 5).values(Center=None))
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    center_id = columns_name_id_map['Center']
+    order_by = json.dumps([
+        {'field': center_id, 'direction': 'desc'},
+        {'field': columns_name_id_map['id'], 'direction': 'asc'},
+    ])
+    grouping = json.dumps({'columns': [center_id], 'mode': 'percentile', 'num_groups': 5})
+    query_str = f'grouping={grouping}&order_by={order_by}&limit=10'
+
+    response = client.get(f'/api/db/v0/tables/{table.id}/records/?{query_str}')
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert [record[str(center_id)] for record in response_data['results'][:5]] == [None] * 5
+    null_group = response_data['grouping']['groups'][0]
+    assert null_group['result_indices'][:5] == [0, 1, 2, 3, 4]
+    assert null_group['count'] > 5
+
+
 @pytest.mark.parametrize("exception", [BadGroupFormat, GroupFieldNotFound])
 def test_record_list_group_exceptions(create_table, client, exception):
     table_name = f"NASA Record List {exception.__name__}"
@@ -751,3 +922,25 @@ def test_record_list_group_exceptions(create_table, client, exception):
     assert len(response_data) == 1
     assert "grouping" in response_data[0]['field']
     assert response_data[0]['code'] == ErrorCodes.UnsupportedType.value
+
+
+def test_record_list_not_modified(create_table, client):
+    table = create_table('NASA Record List ETag')
+    url = f'/api/db/v0/tables/{table.id}/records/?limit=5'
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response['ETag']
+
+    with patch.object(models.Table, 'get_records') as mock_get_records:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    mock_get_records.assert_not_called()
+
+    response = client.get(f'{url}&offset=5', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+    table.create_record_or_records({'Center': 'NASA ETag Center'})
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
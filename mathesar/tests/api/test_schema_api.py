@@ -49,7 +49,7 @@ def test_schema_list_filter(client, monkeypatch):
         return schema_params[oid][0]
 
     monkeypatch.setattr(models.schema_utils, "get_schema_name_from_oid", mock_get_name_from_oid)
-    monkeypatch.setattr(models, "create_mathesar_engine", lambda x: x)
+    monkeypatch.setattr(models, "get_mathesar_engine", lambda x: x)
     monkeypatch.setattr(reflection, "reflect_db_objects", lambda: None)
 
     schemas = {
@@ -391,6 +391,6 @@ def test_schema_viewset_sets_cache(client):
 
 def test_schema_viewset_checks_cache(client):
     cache.delete(reflection.DB_REFLECTION_KEY)
-    with patch.object(reflection, 'reflect_schemas_from_database') as mock_reflect:
+    with patch.object(reflection, 'reflect_database_objects') as mock_reflect:
         client.get('/api/db/v0/schemas/')
     mock_reflect.assert_called()
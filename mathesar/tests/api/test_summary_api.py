@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from mathesar.api.exceptions.error_codes import ErrorCodes
+
+
+def _get_summaries(client, table, grouping, aggregates, query_str=''):
+    return client.get(
+        f'/api/db/v0/tables/{table.id}/summaries/?grouping={json.dumps(grouping)}'
+        f'&aggregates={json.dumps(aggregates)}{query_str}'
+    )
+
+
+def test_summary_list(create_table, client):
+    table = create_table('NASA Summary List')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['Center']]}
+    aggregates = [
+        {'function': 'count'},
+        {'function': 'max', 'column': columns_name_id_map['Case Number']},
+    ]
+    response = _get_summaries(client, table, grouping, aggregates, '&limit=500')
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert response_data['count'] == len(response_data['results'])
+    assert sum(result['aggregates'][0] for result in response_data['results']) == 1393
+    center_id = str(columns_name_id_map['Center'])
+    for result in response_data['results']:
+        assert result['count'] == result['aggregates'][0]
+        assert result['first_value'] == result['last_value']
+        assert center_id in result['first_value']
+
+
+def test_summary_list_pagination(create_table, client):
+    table = create_table('NASA Summary Pagination')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['Center']]}
+    aggregates = [{'function': 'count'}]
+    all_results = _get_summaries(client, table, grouping, aggregates).json()['results']
+    response = _get_summaries(client, table, grouping, aggregates, '&limit=2&offset=1')
+    response_data = response.json()
+
+    assert response.status_code == 200
+    assert response_data['results'] == all_results[1:3]
+
+
+def test_summary_list_magnitude(create_table, client):
+    table = create_table('NASA Summary Magnitude')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['id']], 'mode': 'magnitude'}
+    aggregates = [{'function': 'min', 'column': columns_name_id_map['id']}]
+    response = _get_summaries(client, table, grouping, aggregates)
+    response_data = response.json()
+
+    assert response.status_code == 200
+    id_column_id = str(columns_name_id_map['id'])
+    for result in response_data['results']:
+        assert result['greater_than_eq_value'][id_column_id] <= result['aggregates'][0]
+        assert result['aggregates'][0] < result['less_than_value'][id_column_id]
+
+
+def test_summary_list_bad_aggregate(create_table, client):
+    table = create_table('NASA Summary Bad Aggregate')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['Center']]}
+    aggregates = [{'function': 'median', 'column': columns_name_id_map['id']}]
+    response = _get_summaries(client, table, grouping, aggregates)
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert response_data[0]['code'] == ErrorCodes.UnsupportedType.value
+    assert response_data[0]['field'] == 'aggregates'
+
+
+@pytest.mark.parametrize('bad_column_field', ['grouping', 'aggregates'])
+def test_summary_list_bad_column_id(create_table, client, bad_column_field):
+    table = create_table('NASA Summary Bad Column Id')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['Center']]}
+    aggregates = [{'function': 'max', 'column': columns_name_id_map['id']}]
+    if bad_column_field == 'grouping':
+        grouping = {'columns': [-1]}
+    else:
+        aggregates = [{'function': 'max', 'column': -1}]
+    response = _get_summaries(client, table, grouping, aggregates)
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert response_data[0]['field'] == bad_column_field
+
+
+@pytest.mark.parametrize('grouping', [
+    {'columns': 'Center'},
+    {'columns': ['Center'], 'unknown': 1},
+    ['Center'],
+])
+def test_summary_list_malformed_grouping(create_table, client, grouping):
+    table = create_table('NASA Summary Malformed Grouping')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    if isinstance(grouping, dict) and isinstance(grouping['columns'], list):
+        grouping = {**grouping, 'columns': [columns_name_id_map['Center']]}
+    response = _get_summaries(client, table, grouping, [{'function': 'count'}])
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert response_data[0]['code'] == ErrorCodes.UnsupportedType.value
+    assert response_data[0]['field'] == 'grouping'
+
+
+@pytest.mark.parametrize('aggregates', [
+    {'function': 'count'},
+    ['count'],
+    [{'column': 1}],
+    [{'function': 'count', 'unknown': 1}],
+])
+def test_summary_list_malformed_aggregates(create_table, client, aggregates):
+    table = create_table('NASA Summary Malformed Aggregates')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['Center']]}
+    response = _get_summaries(client, table, grouping, aggregates)
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert response_data[0]['code'] == ErrorCodes.UnsupportedType.value
+    assert response_data[0]['field'] == 'aggregates'
+
+
+def test_summary_list_undefined_function(create_table, client):
+    table = create_table('NASA Summary Undefined Function')
+    columns_name_id_map = table.get_column_name_id_bidirectional_map()
+    grouping = {'columns': [columns_name_id_map['Center']]}
+    aggregates = [{'function': 'sum', 'column': columns_name_id_map['Center']}]
+    response = _get_summaries(client, table, grouping, aggregates)
+    response_data = response.json()
+
+    assert response.status_code == 400
+    assert response_data[0]['code'] == ErrorCodes.UndefinedFunction.value
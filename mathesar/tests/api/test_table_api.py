@@ -8,7 +8,7 @@ from sqlalchemy import text
 from mathesar import reflection
 from mathesar import models
 from mathesar.api.exceptions.error_codes import ErrorCodes
-from mathesar.models import Table, DataFile
+from mathesar.models import Schema, Table, DataFile
 from db.tests.types import fixtures
 
 
@@ -957,6 +957,34 @@ def test_table_get_with_reflect_name_change(client, table_for_reflection):
     assert orig_id == modified_id
 
 
+def test_table_get_with_reflect_schema_change(client, table_for_reflection):
+    schema_name, table_name, engine = table_for_reflection
+    new_schema_name = 'a_moved_schema'
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA {new_schema_name};'))
+    cache.clear()
+    response = client.get('/api/db/v0/tables/')
+    orig_created = [
+        table for table in response.json()['results'] if table['name'] == table_name
+    ]
+    orig_id = orig_created[0]['id']
+    with engine.begin() as conn:
+        conn.execute(
+            text(f'ALTER TABLE {schema_name}.{table_name} SET SCHEMA {new_schema_name};')
+        )
+    cache.clear()
+    response = client.get('/api/db/v0/tables/')
+    modified = [
+        table for table in response.json()['results'] if table['name'] == table_name
+    ]
+    new_schema = Schema.objects.get(id=modified[0]['schema'])
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA {new_schema_name} CASCADE;'))
+    assert len(modified) == 1
+    assert modified[0]['id'] == orig_id
+    assert new_schema.name == new_schema_name
+
+
 def test_table_get_with_reflect_delete(client, table_for_reflection):
     schema_name, table_name, engine = table_for_reflection
     cache.clear()
@@ -986,7 +1014,7 @@ def test_table_viewset_sets_cache(client):
 
 def test_table_viewset_checks_cache(client):
     cache.delete(reflection.DB_REFLECTION_KEY)
-    with patch.object(reflection, 'reflect_tables_from_schema') as mock_reflect:
+    with patch.object(reflection, 'reflect_database_objects') as mock_reflect:
         client.get('/api/db/v0/tables/')
     mock_reflect.assert_called()
 
@@ -1379,3 +1407,43 @@ def test_table_patch_columns_invalid_type_with_multiple_changes(create_data_type
     # The table should not have changed
     original_column_data = _get_data_types_column_data()
     _check_columns(current_table_response.json()['columns'], original_column_data)
+
+
+def test_table_data_versions(create_table, client):
+    table_one = create_table('Data Versions Table One')
+    table_two = create_table('Data Versions Table Two')
+    response = client.get(
+        f'/api/db/v0/tables/data_versions/?ids={table_one.id}&ids={table_two.id}&ids=-1'
+    )
+    response_data = response.json()
+    assert response.status_code == 200
+    assert set(response_data.keys()) == {str(table_one.id), str(table_two.id)}
+
+
+def test_table_data_versions_in_records_cache_key(create_table):
+    cache.clear()
+    table = create_table('Data Version Cache Key Table')
+    with patch.object(models, 'get_table_data_versions', return_value={table.oid: 'one'}):
+        cache_key_one = models.Table.objects.get(id=table.id)._get_records_cache_key('count')
+    with patch.object(models, 'get_table_data_versions', return_value={table.oid: 'two'}):
+        cache_key_two = models.Table.objects.get(id=table.id)._get_records_cache_key('count')
+    assert cache_key_one != cache_key_two
+
+
+def test_table_detail_not_modified(create_table, client):
+    table = create_table('NASA Table Detail ETag')
+    url = f'/api/db/v0/tables/{table.id}/'
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response['ETag']
+
+    with patch.object(reflection, 'reflect_db_objects') as mock_reflect:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    mock_reflect.assert_not_called()
+
+    response = client.patch(url, {'name': 'NASA Table Detail ETag Renamed'})
+    assert response.status_code == 200
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
@@ -3,6 +3,7 @@ This inherits the fixtures in the root conftest.py
 """
 import pytest
 
+from django.core.cache import caches
 from django.core.files import File
 
 from sqlalchemy import Column, MetaData, text, Integer
@@ -71,6 +72,15 @@ def enable_db_access_for_all_tests(db):
     pass
 
 
+@pytest.fixture(autouse=True)
+def clear_records_cache():
+    # Tables of different tests may get the same oid, so cached records
+    # shouldn't outlive the test that cached them.
+    caches['records'].clear()
+    yield
+    caches['records'].clear()
+
+
 @pytest.fixture(scope='session')
 def csv_filename():
     return 'mathesar/tests/data/patents.csv'
@@ -0,0 +1,36 @@
+from django.test import override_settings
+
+from mathesar.database import base
+
+
+def test_get_mathesar_engine_reuses_engine(test_db_model):
+    engine_one = base.get_mathesar_engine(test_db_model.name)
+    engine_two = base.get_mathesar_engine(test_db_model.name)
+    assert engine_one is engine_two
+
+
+def test_get_mathesar_engine_uses_pool_settings(test_db_model):
+    base.dispose_mathesar_engines()
+    with override_settings(MATHESAR_ENGINE_POOL_SIZE=3, MATHESAR_ENGINE_MAX_OVERFLOW=2):
+        engine = base.get_mathesar_engine(test_db_model.name)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+    base.dispose_mathesar_engines()
+
+
+def test_get_mathesar_engine_replaces_engine_on_config_change(test_db_model):
+    engine_one = base.get_mathesar_engine(test_db_model.name)
+    with override_settings(MATHESAR_ENGINE_POOL_SIZE=2):
+        engine_two = base.get_mathesar_engine(test_db_model.name)
+    assert engine_one is not engine_two
+    base.dispose_mathesar_engines()
+
+
+def test_get_engine_pool_stats(test_db_model):
+    engine = base.get_mathesar_engine(test_db_model.name)
+    with engine.connect():
+        stats = base.get_engine_pool_stats()[test_db_model.name]
+        assert stats["checked_out"] == 1
+    stats = base.get_engine_pool_stats()[test_db_model.name]
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] >= 1
@@ -1,15 +1,21 @@
+import codecs
+from io import BytesIO
+from unittest.mock import patch
+
 import pytest
 
 from django.core.files import File
 from sqlalchemy.exc import ProgrammingError
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 
 from mathesar.models import DataFile, Schema
 from mathesar.errors import InvalidTableError
-from mathesar.imports.csv import create_table_from_csv, get_sv_dialect, get_sv_reader
+from mathesar.imports import csv
+from mathesar.imports.csv import create_table_from_csv, get_file_encoding, get_sv_dialect, get_sv_reader
 from db.schemas.operations.create import create_schema
+from db.tables.operations.create import create_string_column_table
 from db.schemas.utils import get_schema_oid_from_name
-from db.constants import COLUMN_NAME_TEMPLATE
+from db.constants import COLUMN_NAME_TEMPLATE, IMPORT_SCHEMA
 
 TEST_SCHEMA = "import_csv_schema"
 
@@ -162,6 +168,208 @@ def test_csv_upload_table_imported_to(data_file, schema):
     assert data_file.table_imported_to == table
 
 
+def test_csv_upload_saves_encoding(data_file, schema):
+    create_table_from_csv(data_file, "NASA Encoding", schema)
+    data_file.refresh_from_db()
+    assert data_file.encoding.lower().replace('_', '-') in ('utf-8', 'ascii')
+
+
+def test_csv_upload_uses_saved_encoding(data_file, schema):
+    data_file.encoding = 'utf-8'
+    data_file.save()
+    with patch.object(csv, 'get_file_encoding') as mock_get_encoding:
+        table = create_table_from_csv(data_file, "NASA Saved Encoding", schema)
+    mock_get_encoding.assert_not_called()
+    assert table.sa_num_records() == 1393
+
+
+def test_file_encoding_samples_large_files(monkeypatch):
+    monkeypatch.setattr(csv, 'ENCODING_SAMPLE_SIZE', 1024)
+    contents = ''.join(f'{i},Café {i},Größe Noël {i * 7}\n' for i in range(10000))
+    file = BytesIO(contents.encode('utf-8'))
+    sample = csv._get_encoding_sample(file)
+    assert len(sample) <= 3 * 1024
+    # Each sample is cut at line breaks, so the samples decode cleanly.
+    assert sample.decode('utf-8')
+    assert get_file_encoding(file).lower().replace('_', '-') == 'utf-8'
+    assert file.tell() == 0
+
+
+def test_file_encoding_with_byte_order_mark(monkeypatch):
+    monkeypatch.setattr(csv, 'ENCODING_SAMPLE_SIZE', 1024)
+    contents = 'name,value\n' + 'Noël,1\n' * 10000
+    file = BytesIO(codecs.BOM_UTF16_LE + contents.encode('utf-16-le'))
+    assert len(csv._get_encoding_sample(file)) == 1024
+    encoding = get_file_encoding(file)
+    assert file.read().decode(encoding).lstrip('\ufeff') == contents
+
+
+class _SVReader:
+    def __init__(self, fieldnames, rows):
+        self.fieldnames = fieldnames
+        self._rows = iter(rows)
+
+    def __iter__(self):
+        return self._rows
+
+
+_get_column_name_layouts_test_list = [
+    ([{"name": "a"}], [["name"]]),
+    ([{"id": "1"}, {"id": " 2 "}], [["id"], ["id_original"]]),
+    ([{"id": "1"}, {"id": "1"}], [["id_original"]]),
+    ([{"id": "1"}, {"id": "a"}], [["id_original"]]),
+    ([{"id": "1"}, {"id": ""}], [["id_original"]]),
+    ([{"id": "1"}, {"id": str(2 ** 31)}], [["id_original"]]),
+]
+
+
+@pytest.mark.parametrize("rows,expected_layouts", _get_column_name_layouts_test_list)
+def test_get_column_name_layouts(rows, expected_layouts):
+    reader = _SVReader(list(rows[0].keys()), rows)
+    assert csv._get_column_name_layouts(reader) == expected_layouts
+
+
+def test_get_column_name_layouts_samples_rows(monkeypatch):
+    monkeypatch.setattr(csv, 'ID_SAMPLE_ROWS', 2)
+    reader = _SVReader(["id"], [{"id": "1"}, {"id": "2"}, {"id": "1"}])
+    assert csv._get_column_name_layouts(reader) == [["id"], ["id_original"]]
+
+
+def _create_data_file_from_contents(tmp_path, contents):
+    csv_path = tmp_path / "ids.csv"
+    csv_path.write_text(contents)
+    with open(csv_path, "rb") as csv_file:
+        return DataFile.objects.create(file=File(csv_file))
+
+
+def test_csv_upload_with_usable_ids(tmp_path, schema):
+    data_file = _create_data_file_from_contents(tmp_path, "id,name\n3,a\n5,b\n")
+    table = create_table_from_csv(data_file, "Usable IDs", schema)
+    assert [record['id'] for record in table.get_records()] == [3, 5]
+    assert "id_original" not in table.sa_column_names
+
+
+@pytest.mark.parametrize("contents", ["id,name\n3,a\n3,b\n", "id,name\nx,a\n3,b\n"])
+def test_csv_upload_with_unusable_ids(tmp_path, schema, contents):
+    data_file = _create_data_file_from_contents(tmp_path, contents)
+    with patch.object(csv, 'insert_records_from_csv', side_effect=csv.insert_records_from_csv) as mock_insert:
+        table = create_table_from_csv(data_file, "Unusable IDs", schema)
+    assert mock_insert.call_count == 1
+    assert [record['id'] for record in table.get_records()] == [1, 2]
+    assert "id_original" in table.sa_column_names
+
+
+def test_csv_upload_with_unusable_ids_after_sample(tmp_path, schema, monkeypatch):
+    monkeypatch.setattr(csv, 'ID_SAMPLE_ROWS', 1)
+    data_file = _create_data_file_from_contents(tmp_path, "id,name\n3,a\n3,b\n")
+    table = create_table_from_csv(data_file, "Unusable IDs After Sample", schema)
+    assert [record['id'] for record in table.get_records()] == [1, 2]
+    assert "id_original" in table.sa_column_names
+
+
+def test_csv_upload_failure_leaves_no_table(data_file, schema, engine):
+    with patch.object(csv, 'insert_records_from_csv', side_effect=ValueError):
+        with pytest.raises(ValueError):
+            create_table_from_csv(data_file, "Failed Import", schema)
+    with engine.begin() as conn:
+        table_count = conn.execute(text(
+            "SELECT count(*) FROM pg_tables WHERE schemaname IN (:schema, :import_schema)"
+        ), {"schema": TEST_SCHEMA, "import_schema": IMPORT_SCHEMA}).scalar()
+    assert table_count == 0
+
+
+def test_csv_upload_infers_types(schema):
+    with open("mathesar/tests/data/type_inference.csv", "rb") as csv_file:
+        data_file = DataFile.objects.create(file=File(csv_file))
+    with patch.object(csv, 'insert_records_from_csv', side_effect=csv.insert_records_from_csv) as mock_insert:
+        table = create_table_from_csv(data_file, "Inferred Types", schema, infer_types=True)
+    assert mock_insert.call_count == 1
+    column_types = {column.name: column.plain_type for column in table.sa_columns}
+    assert column_types == {
+        'id': 'INTEGER',
+        'col_1': 'NUMERIC',
+        'col_2': 'BOOLEAN',
+        'col_3': 'BOOLEAN',
+        'col_4': 'TEXT',
+        'col_5': 'TEXT',
+        'col_6': 'NUMERIC',
+    }
+    assert table.get_records()[0]['col_3'] is True
+
+
+def test_csv_upload_infers_types_falls_back_to_text(tmp_path, schema):
+    # The quoted empty value is an empty string rather than NULL, so it can't
+    # be copied into a numeric column.
+    data_file = _create_data_file_from_contents(tmp_path, 'name,amount\na,1\nb,""\n')
+    with patch.object(csv, 'insert_records_from_csv', side_effect=csv.insert_records_from_csv) as mock_insert:
+        table = create_table_from_csv(data_file, "Inferred Types Fallback", schema, infer_types=True)
+    assert mock_insert.call_count == 2
+    assert table.sa_columns['amount'].plain_type == 'TEXT'
+    assert [record['amount'] for record in table.get_records()] == ['1', '']
+
+
+@pytest.mark.parametrize("contents", ["id,amount\n3,1\n3,2\n", "id,amount\n3,1\nx,2\n"])
+def test_csv_upload_infers_types_with_unusable_ids_after_sample(tmp_path, schema, monkeypatch, contents):
+    monkeypatch.setattr(csv, 'ID_SAMPLE_ROWS', 1)
+    data_file = _create_data_file_from_contents(tmp_path, contents)
+    with patch.object(csv, 'insert_records_from_csv', side_effect=csv.insert_records_from_csv) as mock_insert:
+        table = create_table_from_csv(data_file, "Inferred Types Unusable IDs", schema, infer_types=True)
+    # The unusable ids are retried with generated ids, but still with the inferred types.
+    assert mock_insert.call_count == 2
+    assert table.sa_columns['amount'].plain_type == 'NUMERIC'
+    assert [record['id'] for record in table.get_records()] == [1, 2]
+
+
+def test_csv_upload_infers_types_reports_progress(tmp_path, schema, monkeypatch):
+    monkeypatch.setattr(csv, 'INFERENCE_PROGRESS_ROWS', 1)
+    data_file = _create_data_file_from_contents(tmp_path, "name,amount\na,1\nb,2\n")
+    reported_bytes = []
+    create_table_from_csv(
+        data_file, "Inferred Types Progress", schema, progress_callback=reported_bytes.append, infer_types=True
+    )
+    # The progress of the copy follows that of the inference.
+    file_size = data_file.file.size
+    assert reported_bytes[0] <= file_size
+    assert reported_bytes[-1] == 2 * file_size
+
+
+def test_csv_upload_infers_types_stopped_by_progress_callback(tmp_path, schema):
+    data_file = _create_data_file_from_contents(tmp_path, "name,amount\na,1\nb,2\n")
+
+    def stop(_):
+        raise ValueError
+    with patch.object(csv, 'insert_records_from_csv') as mock_insert:
+        with pytest.raises(ValueError):
+            create_table_from_csv(
+                data_file, "Inferred Types Stopped", schema, progress_callback=stop, infer_types=True
+            )
+    mock_insert.assert_not_called()
+
+
+def test_csv_upload_with_duplicate_table_name_checked_before_copy(data_file, schema):
+    create_table_from_csv(data_file, "NASA Taken Name", schema)
+    with patch.object(csv, 'insert_records_from_csv') as mock_insert:
+        with pytest.raises(ProgrammingError):
+            create_table_from_csv(data_file, "NASA Taken Name", schema)
+    mock_insert.assert_not_called()
+
+
+def test_drop_stale_staging_tables(engine, monkeypatch):
+    monkeypatch.setattr(csv, 'time', lambda: 1000000)
+    stale_name = csv._get_staging_table_name()
+    monkeypatch.setattr(csv, 'time', lambda: 1000000 + csv.STAGING_TABLE_MAX_AGE)
+    recent_name = csv._get_staging_table_name()
+    for staging_name in [stale_name, recent_name]:
+        create_string_column_table(staging_name, IMPORT_SCHEMA, ["name"], engine, unlogged=True)
+    monkeypatch.setattr(csv, 'time', lambda: 1000001 + csv.STAGING_TABLE_MAX_AGE)
+    csv.drop_stale_staging_tables(engine)
+    staging_names = inspect(engine).get_table_names(schema=IMPORT_SCHEMA)
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP SCHEMA "{IMPORT_SCHEMA}" CASCADE;'))
+    assert stale_name not in staging_names
+    assert recent_name in staging_names
+
+
 get_dialect_test_list = [
     (",", '"', "", "mathesar/tests/data/patents.csv"),
     ("\t", '"', "", "mathesar/tests/data/patents.tsv"),
@@ -0,0 +1,43 @@
+import pickle
+
+from mathesar.utils.cache import ByteBudgetLocMemCache
+
+
+def _get_cache(max_bytes):
+    cache = ByteBudgetLocMemCache('test_byte_budget', {'OPTIONS': {'MAX_BYTES': max_bytes}})
+    cache.clear()
+    return cache
+
+
+def _get_size(value):
+    return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def test_byte_budget_cache_evicts_least_recently_used():
+    value = 'x' * 100
+    cache = _get_cache(_get_size(value) * 2)
+    cache.set('first', value)
+    cache.set('second', value)
+    cache.get('first')
+    cache.set('third', value)
+    assert cache.get('first') == value
+    assert cache.get('second') is None
+    assert cache.get('third') == value
+    assert cache.num_bytes == _get_size(value) * 2
+
+
+def test_byte_budget_cache_skips_values_over_budget():
+    cache = _get_cache(_get_size('x' * 100))
+    cache.set('small', 'x' * 10)
+    cache.set('large', 'x' * 1000)
+    assert cache.get('large') is None
+    assert cache.get('small') == 'x' * 10
+
+
+def test_byte_budget_cache_tracks_deletes():
+    cache = _get_cache(1000)
+    cache.set('key', 'x' * 100)
+    cache.set('key', 'x' * 10)
+    assert cache.num_bytes == _get_size('x' * 10)
+    cache.delete('key')
+    assert cache.num_bytes == 0
@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import patch
 from django.core.cache import cache
+from django.core.management import call_command
+from sqlalchemy import text
 
+from db.records.operations.group import GroupBy, GroupMode
 from mathesar import models
 from mathesar import reflection
 
@@ -62,3 +65,204 @@ def test_model_current_queryset_does_not_reflects_db_objects(model):
     with patch.object(reflection, 'reflect_db_objects') as mock_reflect:
         model.current_objects.all()
     mock_reflect.assert_not_called()
+
+
+@pytest.mark.parametrize("model", [models.Database, models.Schema, models.Table])
+def test_model_queryset_background_reflection_does_not_reflect(model, settings):
+    settings.MATHESAR_BACKGROUND_REFLECTION = True
+    with patch.object(reflection, 'reflect_db_objects') as mock_reflect:
+        model.objects.all()
+    mock_reflect.assert_not_called()
+
+
+def test_reflect_db_objects_skips_when_locked():
+    cache.clear()
+    cache.set(reflection.DB_REFLECTION_LOCK_KEY, True)
+    with patch.object(reflection, 'reflect_databases') as mock_reflect:
+        reflection.reflect_db_objects()
+    mock_reflect.assert_not_called()
+    assert cache.get(reflection.DB_REFLECTION_LOCK_KEY)
+    cache.clear()
+
+
+def test_reflect_db_objects_releases_lock():
+    cache.clear()
+    reflection.reflect_db_objects()
+    assert cache.get(reflection.DB_REFLECTION_KEY)
+    assert not cache.get(reflection.DB_REFLECTION_LOCK_KEY)
+
+
+def test_reflect_db_objects_command_forces_reflection():
+    cache.set(reflection.DB_REFLECTION_KEY, True)
+    with patch.object(reflection, 'reflect_databases') as mock_reflect:
+        call_command('reflect_db_objects')
+    mock_reflect.assert_called()
+
+
+def test_reflect_db_objects_skips_unchanged_catalog():
+    cache.clear()
+    reflection.reflect_db_objects()
+    cache.delete(reflection.DB_REFLECTION_KEY)
+    with patch.object(
+        reflection, 'get_mathesar_schema_objects', side_effect=reflection.get_mathesar_schema_objects
+    ) as mock_get_objects:
+        reflection.reflect_db_objects()
+    mock_get_objects.assert_not_called()
+
+
+def test_reflect_db_objects_reflects_changed_catalog(engine, create_schema):
+    schema = create_schema('Fingerprint Schema')
+    cache.clear()
+    reflection.reflect_db_objects()
+    cache.delete(reflection.DB_REFLECTION_KEY)
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE TABLE "{schema.name}".fingerprint_table (id INTEGER);'))
+    reflection.reflect_db_objects()
+    assert models.Table.current_objects.filter(schema=schema).exists()
+
+
+def test_table_column_names_load_once(create_table):
+    table = create_table('Column Names Table')
+    table = models.Table.objects.get(id=table.id)
+    with patch.object(
+        models, 'get_column_names_by_attnum', side_effect=models.get_column_names_by_attnum
+    ) as mock_get_names, patch.object(models, 'get_column_name_from_attnum') as mock_get_name:
+        columns_map = table.get_column_name_id_bidirectional_map()
+    assert 'Center' in columns_map
+    assert mock_get_names.call_count == 1
+    mock_get_name.assert_not_called()
+
+
+def test_table_num_records_uses_cache(create_table):
+    cache.clear()
+    table = create_table('Count Cache Table')
+    with patch.object(models, 'get_count', side_effect=models.get_count) as mock_count:
+        count_one = table.sa_num_records()
+        count_two = table.sa_num_records()
+    assert count_one == count_two == 1393
+    assert mock_count.call_count == 1
+
+
+def test_table_num_records_cache_cleared_on_record_changes(create_table):
+    cache.clear()
+    table = create_table('Count Cache Invalidation Table')
+    filter = {"equal": [{"column_name": ["Center"]}, {"literal": ["New Center"]}]}
+    assert table.sa_num_records(filter=filter) == 0
+    record = table.create_record_or_records({'Center': 'New Center'})
+    assert table.sa_num_records(filter=filter) == 1
+    assert table.sa_num_records() == 1394
+    table.delete_record(record.id)
+    assert table.sa_num_records() == 1393
+
+
+def test_table_records_cache_key_changes_with_columns(create_table):
+    table = create_table('Records Schema Version Table')
+    records_cache_key = table._get_records_cache_key('records', None)
+    with table.schema._sa_engine.begin() as conn:
+        conn.execute(text(
+            f'ALTER TABLE "{table.schema.name}"."{table.name}" RENAME COLUMN "Center" TO "Centre";'
+        ))
+    reloaded_table = models.Table.current_objects.get(id=table.id)
+    assert reloaded_table._get_records_cache_key('records', None) != records_cache_key
+
+
+def test_table_clear_records_cache_seen_by_other_instances(create_table):
+    table = create_table('Records Version Table')
+    other_table = models.Table.current_objects.get(id=table.id)
+    records_cache_key = other_table._get_records_cache_key('count', None)
+    table.clear_records_cache()
+    # Another process loads the table afresh, and its records cache may not
+    # be shared with the process clearing it.
+    reloaded_table = models.Table.current_objects.get(id=table.id)
+    assert reloaded_table.records_version == table.records_version
+    assert reloaded_table._get_records_cache_key('count', None) != records_cache_key
+
+
+def test_table_num_records_estimate(create_table, monkeypatch):
+    cache.clear()
+    table = create_table('Count Estimate Table')
+    monkeypatch.setattr(models, 'get_estimated_row_count', lambda *_: 2000000)
+    assert table.sa_num_records(estimate=True) == 2000000
+    filter = {"empty": [{"column_name": ["Center"]}]}
+    assert table.sa_num_records(filter=filter, estimate=True) == 0
+    assert table.sa_num_records() == 1393
+
+
+def test_table_num_records_estimate_below_threshold(create_table, monkeypatch):
+    cache.clear()
+    table = create_table('Count Estimate Threshold Table')
+    monkeypatch.setattr(models, 'get_estimated_row_count', lambda *_: 1000)
+    assert table.sa_num_records(estimate=True) == 1393
+
+
+def test_table_percentile_group_boundaries_use_cache(create_table):
+    cache.clear()
+    table = create_table('Group Boundaries Table')
+    group_by = GroupBy(['id'], mode=GroupMode.PERCENTILE.value, num_groups=10)
+    with patch.object(
+        models, 'get_group_boundaries', side_effect=models.get_group_boundaries
+    ) as mock_get_boundaries:
+        first_page = table.get_records(limit=5, offset=0, group_by=group_by)
+        second_page = table.get_records(limit=5, offset=5, group_by=group_by)
+    assert mock_get_boundaries.call_count == 1
+    assert [record['__mathesar_group_id'] for record in first_page + second_page] == [1] * 10
+
+
+def test_table_magnitude_group_boundaries_use_cache(create_table):
+    cache.clear()
+    table = create_table('Magnitude Boundaries Table')
+    group_by = GroupBy(['id'], mode=GroupMode.MAGNITUDE.value)
+    with patch.object(
+        models, 'get_group_boundaries', side_effect=models.get_group_boundaries
+    ) as mock_get_boundaries:
+        records = table.get_records(limit=5, offset=0, group_by=group_by)
+        group_ids = [record['__mathesar_group_id'] for record in records]
+        summaries = table.get_group_summaries(group_by, group_ids)
+    assert mock_get_boundaries.call_count == 1
+    # The ids range from 1 to 1393, so the groups are 100 wide, starting from 0.
+    assert summaries[0]['count'] == 99
+
+
+def test_table_duplicate_keys_use_cache(create_table):
+    cache.clear()
+    table = create_table('Duplicate Keys Table')
+    duplicate_only = ['Center']
+    with patch.object(
+        models, 'get_duplicate_groups', side_effect=models.get_duplicate_groups
+    ) as mock_get_groups:
+        first_page = table.get_records(limit=5, offset=0, duplicate_only=duplicate_only)
+        second_page = table.get_records(limit=5, offset=5, duplicate_only=duplicate_only)
+    assert mock_get_groups.call_count == 1
+    assert len(first_page) == len(second_page) == 5
+
+
+def test_table_duplicate_keys_cache_cleared_on_record_changes(create_table):
+    cache.clear()
+    table = create_table('Duplicate Keys Invalidation Table')
+    duplicate_only = ['Center']
+    filter = {"equal": [{"column_name": ["Center"]}, {"literal": ["New Center"]}]}
+    table.create_record_or_records({'Center': 'New Center'})
+    assert table.get_records(filter=filter, duplicate_only=duplicate_only) == []
+    table.create_record_or_records({'Center': 'New Center'})
+    assert len(table.get_records(filter=filter, duplicate_only=duplicate_only)) == 2
+
+
+def test_table_get_records_uses_cache(create_table):
+    table = create_table('Records Cache Table')
+    filter = {"equal": [{"column_name": ["Center"]}, {"literal": ["NASA Ames Research Center"]}]}
+    with patch.object(models, 'db_get_records', side_effect=models.db_get_records) as mock_get:
+        records_one = table.get_records(limit=10, offset=0, filter=filter)
+        records_two = table.get_records(limit=10, offset=0, filter=filter)
+        table.get_records(limit=10, offset=10, filter=filter)
+    assert records_one == records_two
+    assert mock_get.call_count == 2
+
+
+def test_table_get_records_cache_cleared_on_record_changes(create_table):
+    table = create_table('Records Cache Invalidation Table')
+    filter = {"equal": [{"column_name": ["Center"]}, {"literal": ["New Center"]}]}
+    assert table.get_records(filter=filter) == []
+    record = table.create_record_or_records({'Center': 'New Center'})
+    assert len(table.get_records(filter=filter)) == 1
+    table.update_record(record.id, {'Center': 'Newer Center'})
+    assert table.get_records(filter=filter) == []
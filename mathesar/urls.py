@@ -10,11 +10,14 @@ db_router.register(r'tables', db_viewsets.TableViewSet, basename='table')
 db_router.register(r'schemas', db_viewsets.SchemaViewSet, basename='schema')
 db_router.register(r'databases', db_viewsets.DatabaseViewSet, basename='database')
 db_router.register(r'data_files', db_viewsets.DataFileViewSet, basename='data-file')
+db_router.register(r'import_jobs', db_viewsets.ImportJobViewSet, basename='import-job')
 
 db_table_router = routers.NestedSimpleRouter(db_router, r'tables', lookup='table')
 db_table_router.register(r'records', db_viewsets.RecordViewSet, basename='table-record')
 db_table_router.register(r'columns', db_viewsets.ColumnViewSet, basename='table-column')
 db_table_router.register(r'constraints', db_viewsets.ConstraintViewSet, basename='table-constraint')
+db_table_router.register(r'summaries', db_viewsets.SummaryViewSet, basename='table-summary')
+db_table_router.register(r'duplicates', db_viewsets.DuplicateViewSet, basename='table-duplicate')
 
 ui_router = routers.DefaultRouter()
 ui_router.register(r'databases', ui_viewsets.DatabaseViewSet, basename='database')
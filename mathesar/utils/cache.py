@@ -0,0 +1,57 @@
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+# Sizes of the values of each named cache, and their total, keyed by name
+# like the entries of LocMemCache.
+_sizes = {}
+_totals = {}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ByteBudgetLocMemCache(LocMemCache):
+    """
+    A local memory cache which limits the total size of its pickled values,
+    given by the MAX_BYTES option, rather than the number of entries.  The
+    least recently used entries are evicted first.  Results of records
+    queries vary widely in size, so counting entries would either waste
+    memory or evict too much.
+    """
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get('OPTIONS', {})
+        self._max_bytes = options.get('MAX_BYTES', DEFAULT_MAX_BYTES)
+        self._sizes = _sizes.setdefault(name, {})
+        self._total = _totals.setdefault(name, [0])
+
+    @property
+    def num_bytes(self):
+        return self._total[0]
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._delete(key)
+        size = len(value)
+        if size > self._max_bytes:
+            return
+        while self._cache and self._total[0] + size > self._max_bytes:
+            # Entries are moved to the start when used, so the least recently
+            # used entry is at the end.
+            evicted_key, _ = self._cache.popitem()
+            self._expire_info.pop(evicted_key, None)
+            self._total[0] -= self._sizes.pop(evicted_key, 0)
+        self._cache[key] = value
+        self._cache.move_to_end(key, last=False)
+        self._expire_info[key] = self.get_backend_timeout(timeout)
+        self._sizes[key] = size
+        self._total[0] += size
+
+    def _delete(self, key):
+        self._total[0] -= self._sizes.pop(key, 0)
+        return super()._delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._sizes.clear()
+            self._total[0] = 0
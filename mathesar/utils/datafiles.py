@@ -63,6 +63,7 @@ def create_datafile(data):
         delimiter=dialect.delimiter,
         escapechar=dialect.escapechar,
         quotechar=dialect.quotechar,
+        encoding=encoding,
     )
     datafile.save()
     raw_file.close()
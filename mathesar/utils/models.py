@@ -26,6 +26,7 @@ def update_sa_table(table, validated_data):
         raise base_api_exceptions.GenericAPIException(errors, status_code=status.HTTP_400_BAD_REQUEST)
     try:
         alter_table(table.name, table.oid, table.schema.name, table.schema._sa_engine, validated_data)
+        table.clear_records_cache()
         reflect_columns_from_table(table)
     # TODO: Catch more specific exceptions
     except Exception as e:
@@ -1,9 +1,10 @@
 from sqlalchemy import MetaData
 
+from db.tables.data_versions import get_table_data_versions
 from db.tables.operations.create import create_mathesar_table
 from db.tables.operations.select import get_oid_from_table
 from db.tables.operations.infer_types import infer_table_column_types
-from mathesar.database.base import create_mathesar_engine
+from mathesar.database.base import get_mathesar_engine
 from mathesar.imports.csv import create_table_from_csv
 from mathesar.models import Table
 from mathesar.reflection import reflect_columns_from_table
@@ -26,6 +27,24 @@ def get_table_column_types(table):
     return col_types
 
 
+def get_tables_data_versions(tables):
+    """
+    Returns the data versions of the given tables, keyed by table id, reading
+    them with one query per database.
+    """
+    tables_by_database = {}
+    for table in tables:
+        tables_by_database.setdefault(table.schema.database.name, []).append(table)
+    data_versions = {}
+    for database_name, database_tables in tables_by_database.items():
+        versions_by_oid = get_table_data_versions(
+            [table.oid for table in database_tables], get_mathesar_engine(database_name)
+        )
+        for table in database_tables:
+            data_versions[table.id] = versions_by_oid[table.oid]
+    return data_versions
+
+
 def gen_table_name(schema, data_files=None):
     if data_files:
         data_file = data_files[0]
@@ -56,9 +75,11 @@ def gen_table_name(schema, data_files=None):
     return name
 
 
-def create_table_from_datafile(data_files, name, schema):
+def create_table_from_datafile(data_files, name, schema, progress_callback=None, infer_types=False):
     data_file = data_files[0]
-    table = create_table_from_csv(data_file, name, schema)
+    table = create_table_from_csv(
+        data_file, name, schema, progress_callback=progress_callback, infer_types=infer_types
+    )
     return table
 
 
@@ -70,7 +91,7 @@ def create_empty_table(name, schema):
     :param schema: the parsed and validated schema model
     :return: the newly created blank table
     """
-    engine = create_mathesar_engine(schema.database.name)
+    engine = get_mathesar_engine(schema.database.name)
     db_table = create_mathesar_table(name, schema.name, [], engine)
     db_table_oid = get_oid_from_table(db_table.name, db_table.schema, engine)
     # Using current_objects to create the table instead of objects. objects